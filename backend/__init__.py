@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 
 from .extensions import db
 from .models import register_models  # lädt/registriert alle ORM-Modelle
+from .migrations import check_schema
 
 
 def _build_mysql_dsn() -> str:
@@ -42,22 +43,9 @@ def create_app() -> Flask:
     def health():
         return {"ok": True}
 
-    # DB-Tabellen anlegen & feste Levels seeden (für Prod später Alembic nehmen)
-    with app.app_context():
-        register_models()   # wichtig: Modelle importieren/registrieren
-        db.create_all()
-
-        from .models import Level  # lazy import nach register_models()
-        seed_levels = {
-            "A2.1": "A2.1 – Elementarstufe 1",
-            "A2.2": "A2.2 – Elementarstufe 2",
-            "A2/B1": "A2/B1 – Übergang",
-            "B2/C1": "B2/C1 – Fortgeschritten/Übergang",
-        }
-        for code, label in seed_levels.items():
-            if not Level.query.get(code):
-                db.session.add(Level(code=code, label=label))
-        db.session.commit()
+    # DB: nur Versionscheck; Tabellen & Seeds kommen aus migrations/ (`flask schema upgrade`)
+    register_models()   # wichtig: Modelle importieren/registrieren
+    check_schema(app)
 
     # Optional: Blueprints hier registrieren (wenn vorhanden)
     # from .api import bp as api_bp
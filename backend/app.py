@@ -1,14 +1,17 @@
 # app.py
 import os
-import time  # ✅
 from urllib.parse import quote_plus
 
 from flask import Flask, render_template, jsonify, send_file, url_for  # url_for optional
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-from extensions import db, init_extensions, login_manager
+from extensions import db, init_extensions
 from models import register_models
+from migrations import check_schema, schema_cli
+from services.compression import init_compression
+from services.json_provider import FastJSONProvider
+from services import assets, metrics, query_guard
 
 
 def build_mysql_dsn() -> str:
@@ -32,16 +35,21 @@ def create_app() -> Flask:
 
     CORS(app, supports_credentials=True)
 
+    # orjson (falls installiert) für jsonify() in allen Blueprints
+    app.json = FastJSONProvider(app)
+
     # ---- Basis-Config ----
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY") or os.getenv("SESSION_KEY") or "dev-insecure"
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL", build_mysql_dsn())
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_pre_ping": True, "pool_recycle": 280}
 
-    # ✅ Dev-Quality of life: Templatereload & kein aggressives Static-Caching
+    # ✅ Dev-Quality of life: Templatereload
     app.config["TEMPLATES_AUTO_RELOAD"] = True
-    app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 0
     app.jinja_env.auto_reload = True
+    # ungehashte /static/-URLs kurz cachen (danach Revalidierung per Last-Modified);
+    # gehashte /assets/-URLs sind immutable, siehe services/assets.py
+    app.config["SEND_FILE_MAX_AGE_DEFAULT"] = int(os.getenv("STATIC_MAX_AGE", "300"))
 
     # Session-/Cookie-Härtung
     app.config.setdefault("SESSION_COOKIE_SAMESITE", "Lax")
@@ -52,36 +60,88 @@ def create_app() -> Flask:
     app.config.setdefault("REMEMBER_COOKIE_SECURE", os.getenv("REMEMBER_COOKIE_SECURE", "1") == "1")
 
     # ---- Extensions ----
+    # Metriken zuerst: ergänzt die Engine-Optionen (Pool-Wartezeit), registriert /metrics
+    metrics.init_app(app)
+    query_guard.init_app(app)
     init_extensions(app)
+    init_compression(app)
 
-    # ✅ Build-ID für Cache-Busting in Templates verfügbar machen
-    BUILD_ID = os.getenv("BUILD_ID") or str(int(time.time()))
-    @app.context_processor
-    def inject_build_id():
-        return {"build_id": BUILD_ID}
+    # Asset-Manifest: asset_url() + build_id in Templates, /assets/<gehashter Name>
+    assets.init_app(app)
 
     # ---- Blueprints ----
     from routes.auth import bp as auth_bp
     app.register_blueprint(auth_bp)
+    from routes.events import bp as events_bp
+    app.register_blueprint(events_bp)
+    from routes.booking import bp as booking_bp
+    app.register_blueprint(booking_bp)
+    from routes.levels import bp as levels_bp
+    app.register_blueprint(levels_bp)
+    from routes.stats import bp as stats_bp
+    app.register_blueprint(stats_bp)
+    from routes.wishlist import bp as wishlist_bp
+    app.register_blueprint(wishlist_bp)
+    from routes.calendar import bp as calendar_bp
+    app.register_blueprint(calendar_bp)
+    from routes.bootstrap import bp as bootstrap_bp
+    app.register_blueprint(bootstrap_bp)
+    from routes.reviews import bp as reviews_bp
+    app.register_blueprint(reviews_bp)
+
+    # ---- CLI ----
+    from services.seats import seats_cli
+    app.cli.add_command(seats_cli)
+    app.cli.add_command(schema_cli)
+    from services.level_catalog import levels_cli
+    app.cli.add_command(levels_cli)
+    from services.club_stats import club_stats_cli
+    app.cli.add_command(club_stats_cli)
+    from services.audit import audit_cli, audit_writer
+    app.cli.add_command(audit_cli)
+    from services.fulltext import search_cli
+    app.cli.add_command(search_cli)
+    from services.lifecycle import lifecycle_cli, lifecycle_scheduler
+    app.cli.add_command(lifecycle_cli)
+    from services.ratings import ratings_cli
+    app.cli.add_command(ratings_cli)
+    from services.recommendations import recommendations_cli
+    app.cli.add_command(recommendations_cli)
+    from services.datagen import datagen_cli
+    app.cli.add_command(datagen_cli)
+    app.cli.add_command(assets.assets_cli)
+    audit_writer.init_app(app)
+    lifecycle_scheduler.init_app(app)
 
     # ---- Helper: PDFs ausliefern ----
     def serve_legal(file_name: str, download_name: str):
-        pdf_path = os.path.join(app.static_folder, "legal", file_name)
-        if not os.path.exists(pdf_path):
+        # aus dem Asset-Build (Content-Hash als ETag) oder direkt aus LEGAL_DIR
+        found = assets.legal_file(file_name)
+        if found is None:
             return jsonify({"error": f"{file_name} nicht gefunden"}), 404
+        pdf_path, etag = found
         return send_file(
             pdf_path,
             mimetype="application/pdf",
             as_attachment=False,
             download_name=download_name,
             conditional=True,
+            etag=etag,
             max_age=3600,
         )
 
     # ---- Routes ----
     @app.get("/health")
     def health():
-        return {"ok": True}
+        # öffentlich nur "ok"; interne Zähler nur mit METRICS_TOKEN (wie /metrics)
+        if not metrics.authorized():
+            return {"ok": True}
+        from services.user_cache import user_cache
+        from services.audit import audit_writer
+        from services.calendar_feed import feed_cache
+        from services.lifecycle import lifecycle_scheduler
+        return {"ok": True, "user_cache": user_cache.stats(), "audit": audit_writer.stats(),
+                "calendar_cache": feed_cache.stats(), "lifecycle": lifecycle_scheduler.stats()}
 
     @app.get("/")
     def index():
@@ -133,30 +193,15 @@ def create_app() -> Flask:
     def _forbidden(_e):
         return jsonify({"error": "Forbidden"}), 403
 
-    # ---- DB init + Seeds ----
-    with app.app_context():
-        register_models()
-        db.create_all()
-
-        from models import User, Level
-
-        @login_manager.user_loader
-        def load_user(user_id: str):
-            try:
-                return User.query.get(int(user_id))
-            except Exception:
-                return None
-
-        seed_levels = {
-            "A2.1": "A2.1 – Elementarstufe 1",
-            "A2.2": "A2.2 – Elementarstufe 2",
-            "A2/B1": "A2/B1 – Übergang",
-            "B2/C1": "B2/C1 – Fortgeschritten/Übergang",
-        }
-        for code, label in seed_levels.items():
-            if not Level.query.get(code):
-                db.session.add(Level(code=code, label=label))
-        db.session.commit()
+    # ---- DB: nur Versionscheck, Migrationen via `flask schema upgrade` ----
+    register_models()
+    schema_ok = check_schema(app)
+
+    # ---- Prozessweite Kataloge vorladen ----
+    from services.level_catalog import level_catalog
+    if schema_ok:
+        with app.app_context():
+            level_catalog.preload()
 
     # ---- Shell Context ----
     @app.shell_context_processor
@@ -0,0 +1,8 @@
+"""
+migrations-Paket:
+- runner.py: Runner + CLI (`flask schema upgrade|status`) + check_schema() für den App-Start.
+- versions/: geordnete Migrationen (NNNN_name.sql | NNNN_name.py mit upgrade(conn)).
+"""
+from .runner import check_schema, upgrade, schema_cli, SchemaOutdated
+
+__all__ = ("check_schema", "upgrade", "schema_cli", "SchemaOutdated")
@@ -0,0 +1,213 @@
+# migrations/runner.py
+"""
+Versionierte Schema-Migrationen (ersetzt db.create_all() + Seeds beim Boot).
+
+- Migrationen liegen in migrations/versions/ als NNNN_name.sql oder NNNN_name.py
+  (Python: Funktion upgrade(conn)) und werden aufsteigend genau einmal angewendet.
+- Angewendete Versionen stehen in schema_version.
+- App-Start macht nur check_schema(): eine einzige MAX(version)-Abfrage.
+- `flask schema upgrade` / `flask schema status` für Deployments.
+
+Migrationen sollen idempotent sein (has_table/has_column nutzen): MySQL committet
+DDL implizit, eine abgebrochene Migration lässt sich so einfach erneut starten.
+
+Jede Migration läuft in einer eigenen Transaktion. Python-Migrationen mit
+TRANSACTIONAL = False bekommen stattdessen eine Connection ohne äußere Transaktion
+und committen selbst (z. B. pro Backfill-Batch); die Version wird erst danach
+eingetragen, ein Abbruch wiederholt die ganze Migration.
+"""
+from __future__ import annotations
+import importlib.util
+import logging
+import os
+import re
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, Optional
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, insert, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from extensions import db
+
+log = logging.getLogger(__name__)
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions")
+_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+
+class SchemaOutdated(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: str
+
+    @property
+    def kind(self) -> str:
+        return self.path.rsplit(".", 1)[-1]
+
+
+def discover() -> list[Migration]:
+    found: dict[int, Migration] = {}
+    for fname in sorted(os.listdir(VERSIONS_DIR)):
+        m = _FILE_RE.match(fname)
+        if not m:
+            continue
+        version = int(m.group(1))
+        if version in found:
+            raise RuntimeError(f"Migration {version:04d} ist doppelt vorhanden.")
+        found[version] = Migration(version, m.group(2), os.path.join(VERSIONS_DIR, fname))
+    return [found[v] for v in sorted(found)]
+
+
+def latest_version() -> int:
+    migrations = discover()
+    return migrations[-1].version if migrations else 0
+
+
+# ---------- Helfer für Migrationen ----------
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn: Connection, table: str, index: str) -> bool:
+    return any(i["name"] == index for i in inspect(conn).get_indexes(table))
+
+
+def create_tables(conn: Connection, *tables) -> None:
+    for table in tables:
+        table.create(bind=conn, checkfirst=True)
+
+
+def _split_sql(script: str) -> list[str]:
+    # Einfacher Splitter: Statements enden mit ';' am Zeilenende (keine DELIMITER-Blöcke)
+    lines = [ln for ln in script.splitlines() if not ln.strip().startswith("--")]
+    return [stmt.strip() for stmt in re.split(r";\s*$", "\n".join(lines), flags=re.M) if stmt.strip()]
+
+
+def _load_python(migration: Migration) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(f"migrations.versions.m{migration.version:04d}", migration.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------- Runner ----------
+
+def _version_table():
+    from models import SchemaVersion
+    return SchemaVersion.__table__
+
+
+def current_version(conn: Optional[Connection] = None) -> Optional[int]:
+    """MAX(version) oder None, wenn schema_version noch nicht existiert."""
+    stmt = select(func.max(_version_table().c.version))
+    try:
+        if conn is not None:
+            return conn.execute(stmt).scalar() or 0
+        return db.session.execute(stmt).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        if conn is None:
+            db.session.rollback()
+        return None
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    conn.execute(insert(_version_table()).values(version=migration.version, name=migration.name))
+
+
+def upgrade(target: Optional[int] = None, *, echo: Callable[[str], None] = log.info) -> list[int]:
+    engine = db.engine
+    applied: list[int] = []
+    with engine.connect() as lock_conn:
+        is_mysql = engine.dialect.name == "mysql"
+        if is_mysql and not lock_conn.execute(text("SELECT GET_LOCK('sprachclub_schema', 60)")).scalar():
+            raise RuntimeError("Migrations-Lock nicht erhalten (läuft parallel ein Upgrade?).")
+        try:
+            with engine.begin() as conn:
+                _version_table().create(bind=conn, checkfirst=True)
+            with engine.connect() as conn:
+                done = current_version(conn) or 0
+            for migration in discover():
+                if migration.version <= done or (target is not None and migration.version > target):
+                    continue
+                echo(f"→ {migration.version:04d} {migration.name}")
+                module = _load_python(migration) if migration.kind == "py" else None
+                if module is not None and not getattr(module, "TRANSACTIONAL", True):
+                    with engine.connect() as conn:
+                        module.upgrade(conn)
+                        conn.commit()
+                    with engine.begin() as conn:
+                        _record(conn, migration)
+                else:
+                    with engine.begin() as conn:
+                        if module is None:
+                            with open(migration.path, encoding="utf-8") as fh:
+                                for stmt in _split_sql(fh.read()):
+                                    conn.exec_driver_sql(stmt)
+                        else:
+                            module.upgrade(conn)
+                        _record(conn, migration)
+                applied.append(migration.version)
+        finally:
+            if is_mysql:
+                lock_conn.execute(text("SELECT RELEASE_LOCK('sprachclub_schema')"))
+    return applied
+
+
+def check_schema(app) -> bool:
+    """
+    Einzige DB-Arbeit beim App-Start: MAX(version) gegen die neueste Migration.
+    - AUTO_MIGRATE=1: fehlende Migrationen direkt anwenden (lokale Entwicklung).
+    - Aufruf über die Flask-CLI (z. B. `flask schema upgrade`): nur warnen.
+    - sonst: SchemaOutdated, damit kein Worker auf einem alten Schema startet.
+    Rückgabe: True, wenn das Schema aktuell ist.
+    """
+    with app.app_context():
+        have, want = current_version(), latest_version()
+        if have is not None and have >= want:
+            return True
+        if os.getenv("AUTO_MIGRATE", "0") == "1":
+            upgrade()
+            return True
+        msg = (f"DB-Schema ist auf Version {have or 0}, erwartet {want}. "
+               "Bitte `flask schema upgrade` ausführen (oder AUTO_MIGRATE=1 setzen).")
+        if click.get_current_context(silent=True) is not None:
+            log.warning(msg)
+            return False
+        raise SchemaOutdated(msg)
+
+
+# ---------- CLI ----------
+
+schema_cli = AppGroup("schema", help="Versionierte Schema-Migrationen.")
+
+
+@schema_cli.command("upgrade")
+@click.option("--to", "target", type=int, default=None, help="Nur bis zu dieser Version migrieren.")
+def upgrade_command(target: Optional[int]):
+    applied = upgrade(target, echo=click.echo)
+    click.echo(f"{len(applied)} Migration(en) angewendet, Stand: {current_version()}.")
+
+
+@schema_cli.command("status")
+def status_command():
+    have = current_version()
+    click.echo(f"DB: {have if have is not None else '(keine schema_version-Tabelle)'}")
+    for migration in discover():
+        mark = "x" if have and migration.version <= have else " "
+        click.echo(f"[{mark}] {migration.version:04d} {migration.name} ({migration.kind})")
+    click.echo(f"Datenbank: {current_app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}")
@@ -0,0 +1,146 @@
+# migrations/versions/0001_baseline.py
+"""
+Basisschema (Stand db/create.sql) + feste Levels. Idempotent für Bestands-DBs.
+
+Die Tabellen sind hier eingefroren und bewusst NICHT aus den ORM-Modellen
+abgeleitet: spätere Migrationen (seats_taken, queued_at, club_starts_at, ...)
+bauen auf genau diesem Stand auf und laufen so auch auf frischen DBs.
+Nur DDL-relevante Angaben; Python-Defaults & Relationships stehen in models/.
+"""
+from sqlalchemy import (
+    Column, Date, DateTime, ForeignKey, Index, MetaData, String, Table, Text,
+    UniqueConstraint, func, insert, select,
+)
+
+from migrations.runner import create_tables
+from models.column_types import BIGINT, CHAR, ENUM, INTEGER, SMALLINT, TINYINT, VARBINARY
+
+SEED_LEVELS = {
+    "A2.1": "A2.1 – Elementarstufe 1",
+    "A2.2": "A2.2 – Elementarstufe 2",
+    "A2/B1": "A2/B1 – Übergang",
+    "B2/C1": "B2/C1 – Fortgeschritten/Übergang",
+}
+
+metadata = MetaData()
+
+
+def _id():
+    return Column("id", BIGINT(unsigned=True), primary_key=True, autoincrement=True)
+
+
+def _created_at(name="created_at"):
+    return Column(name, DateTime, server_default=func.current_timestamp(), nullable=False)
+
+
+def _fk(target, ondelete="CASCADE"):
+    return ForeignKey(target, ondelete=ondelete, onupdate="CASCADE")
+
+
+# ---------- Tabellen (Stand 0001) ----------
+
+users = Table(
+    "users", metadata,
+    _id(),
+    Column("username", String(32), unique=True, nullable=False),
+    Column("email", String(254), unique=True, nullable=False),
+    Column("first_name", String(80), nullable=False),
+    Column("last_name", String(80), nullable=False),
+    Column("birth_date", Date, nullable=True),
+    Column("password_hash", VARBINARY(60), nullable=False),
+    Column("is_host", TINYINT(unsigned=True), nullable=False),
+    _created_at(),
+    _created_at("updated_at"),
+)
+
+hosts = Table(
+    "hosts", metadata,
+    Column("user_id", BIGINT(unsigned=True), _fk("users.id"), primary_key=True),
+    Column("bio", Text),
+)
+
+levels = Table(
+    "levels", metadata,
+    Column("code", String(10), primary_key=True),
+    Column("label", String(32), nullable=False),
+)
+
+clubs = Table(
+    "clubs", metadata,
+    _id(),
+    Column("title", String(120), nullable=False),
+    Column("description", Text),
+    Column("level_code", String(10), _fk("levels.code", ondelete="RESTRICT"), nullable=False),
+    Column("host_id", BIGINT(unsigned=True), _fk("users.id", ondelete="RESTRICT"), nullable=False),
+    Column("starts_at", DateTime, nullable=False),
+    Column("duration_min", SMALLINT(unsigned=True), nullable=False),
+    Column("capacity", SMALLINT(unsigned=True), nullable=False),
+    Column("meeting_url", String(255)),
+    Column("price_cents", INTEGER(unsigned=True), nullable=False),
+    Column("currency", CHAR(3), nullable=False),
+    Column("status", ENUM("SCHEDULED", "CANCELED", "COMPLETED", name="club_status"), nullable=False),
+    _created_at(),
+    _created_at("updated_at"),
+    Index("idx_clubs_starts_at", "starts_at"),
+    Index("idx_clubs_level", "level_code"),
+    Index("idx_clubs_search", "status", "level_code", "starts_at"),
+)
+
+enrollments = Table(
+    "enrollments", metadata,
+    _id(),
+    Column("user_id", BIGINT(unsigned=True), _fk("users.id"), nullable=False),
+    Column("club_id", BIGINT(unsigned=True), _fk("clubs.id"), nullable=False),
+    Column(
+        "status",
+        ENUM("PENDING", "CONFIRMED", "CANCELLED", "ATTENDED", "NO_SHOW", name="enroll_status"),
+        nullable=False,
+    ),
+    _created_at(),
+    _created_at("updated_at"),
+    UniqueConstraint("user_id", "club_id", name="uq_enrollments_user_club"),
+    Index("idx_enrollments_club", "club_id"),
+    Index("idx_enrollments_club_status", "club_id", "status"),
+)
+
+# FKs + einfacher PK: Partitionierung/FK-Abbau macht 0005 (nur MySQL)
+enrollment_audit = Table(
+    "enrollment_audit", metadata,
+    _id(),
+    Column("enrollment_id", BIGINT(unsigned=True), _fk("enrollments.id"), nullable=False),
+    Column("action", ENUM("INSERT", "UPDATE", "DELETE", name="audit_action"), nullable=False),
+    Column("old_status", String(16)),
+    Column("new_status", String(16)),
+    Column("changed_by", BIGINT(unsigned=True), _fk("users.id", ondelete="SET NULL"), nullable=True),
+    _created_at("changed_at"),
+    Index("idx_audit_enrollment", "enrollment_id"),
+)
+
+reviews = Table(
+    "reviews", metadata,
+    _id(),
+    Column("enrollment_id", BIGINT(unsigned=True), _fk("enrollments.id"), nullable=False),
+    Column("rating", TINYINT(unsigned=True), nullable=False),
+    Column("comment", Text),
+    _created_at(),
+    UniqueConstraint("enrollment_id", name="uq_reviews_enrollment"),
+)
+
+wishlists = Table(
+    "wishlists", metadata,
+    Column("user_id", BIGINT(unsigned=True), _fk("users.id"), primary_key=True),
+    Column("club_id", BIGINT(unsigned=True), _fk("clubs.id"), primary_key=True),
+    _created_at(),
+)
+
+
+def upgrade(conn):
+    create_tables(
+        conn,
+        users, hosts, levels, clubs, enrollments, enrollment_audit, reviews, wishlists,
+    )
+
+    existing = set(conn.execute(select(levels.c.code)).scalars())
+    missing = [{"code": c, "label": l} for c, l in SEED_LEVELS.items() if c not in existing]
+    if missing:
+        conn.execute(insert(levels), missing)
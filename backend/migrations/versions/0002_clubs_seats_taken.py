@@ -0,0 +1,34 @@
+# migrations/versions/0002_clubs_seats_taken.py
+"""clubs.seats_taken einführen/backfillen, COUNT(*)-Kapazitätstrigger entfernen."""
+from sqlalchemy import text
+
+from migrations.runner import has_column
+
+SEAT_STATUSES = "'PENDING','CONFIRMED','ATTENDED'"
+
+
+def upgrade(conn):
+    mysql = conn.dialect.name == "mysql"
+
+    if mysql:
+        conn.exec_driver_sql("DROP TRIGGER IF EXISTS trg_enrollment_capacity_check_ins")
+        conn.exec_driver_sql("DROP TRIGGER IF EXISTS trg_enrollment_capacity_check_upd")
+
+    if has_column(conn, "clubs", "seats_taken"):
+        return
+
+    coltype = "SMALLINT UNSIGNED" if mysql else "INTEGER"
+    conn.exec_driver_sql(
+        f"ALTER TABLE clubs ADD COLUMN seats_taken {coltype} NOT NULL DEFAULT 0"
+    )
+    conn.execute(text(f"""
+        UPDATE clubs SET seats_taken = (
+          SELECT CASE WHEN COUNT(*) > clubs.capacity THEN clubs.capacity ELSE COUNT(*) END
+          FROM enrollments e
+          WHERE e.club_id = clubs.id AND e.status IN ({SEAT_STATUSES})
+        )
+    """))
+    if mysql:
+        conn.exec_driver_sql(
+            "ALTER TABLE clubs ADD CONSTRAINT chk_clubs_seats CHECK (seats_taken <= capacity)"
+        )
@@ -0,0 +1,11 @@
+# migrations/versions/0003_cache_versions.py
+"""cache_versions (Versionszähler für prozesslokale Caches) inkl. Startwert für levels."""
+from migrations.runner import create_tables
+from services.sql_util import insert_ignore
+
+
+def upgrade(conn):
+    from models import CacheVersion
+
+    create_tables(conn, CacheVersion.__table__)
+    insert_ignore(conn, CacheVersion.__table__, [{"name": "levels", "version": 1}])
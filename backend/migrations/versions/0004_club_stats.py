@@ -0,0 +1,16 @@
+# migrations/versions/0004_club_stats.py
+"""club_stats (materialisierte Enrollment-Zähler) anlegen, backfillen; v_club_fillrate entfernen."""
+from migrations.runner import create_tables, has_table
+
+
+def upgrade(conn):
+    from models import ClubStats
+    from services.club_stats import rebuild_stats
+
+    if conn.dialect.name == "mysql":
+        conn.exec_driver_sql("DROP VIEW IF EXISTS v_club_fillrate")
+
+    fresh = not has_table(conn, ClubStats.__tablename__)
+    create_tables(conn, ClubStats.__table__)
+    if fresh:
+        rebuild_stats(conn)
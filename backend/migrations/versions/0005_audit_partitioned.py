@@ -0,0 +1,43 @@
+# migrations/versions/0005_audit_partitioned.py
+"""
+Audit-Trigger entfernen (Audit schreibt jetzt services/audit.py) und
+enrollment_audit auf MySQL nach Monat partitionieren:
+FKs weg, changed_at DATETIME, PRIMARY KEY (id, changed_at),
+PARTITION BY RANGE (TO_DAYS(changed_at)) + pmax.
+"""
+import datetime as dt
+
+from sqlalchemy import inspect, text
+
+from services.audit import add_months, list_partitions, month_range, partition_def
+
+MONTHS_AHEAD = 3
+
+
+def upgrade(conn):
+    if conn.dialect.name != "mysql":
+        return
+
+    for trigger in ("insert", "update", "delete"):
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS trg_enrollment_{trigger}_audit")
+
+    for fk in inspect(conn).get_foreign_keys("enrollment_audit"):
+        conn.exec_driver_sql(f"ALTER TABLE enrollment_audit DROP FOREIGN KEY `{fk['name']}`")
+
+    if list_partitions(conn):
+        return
+
+    conn.exec_driver_sql(
+        "ALTER TABLE enrollment_audit "
+        "MODIFY changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (id, changed_at)"
+    )
+
+    today = dt.datetime.utcnow().date()
+    oldest = conn.execute(text("SELECT MIN(changed_at) FROM enrollment_audit")).scalar()
+    first = oldest.date() if oldest else today
+    months = month_range(first, add_months(today, MONTHS_AHEAD))
+    parts = ",\n  ".join([partition_def(m) for m in months] + ["PARTITION pmax VALUES LESS THAN MAXVALUE"])
+    conn.exec_driver_sql(
+        f"ALTER TABLE enrollment_audit PARTITION BY RANGE (TO_DAYS(changed_at)) (\n  {parts}\n)"
+    )
@@ -0,0 +1,8 @@
+# migrations/versions/0006_clubs_updated_at_index.py
+"""Index auf clubs.updated_at: MAX(updated_at) für ETags ohne Tabellenscan."""
+from migrations.runner import has_index
+
+
+def upgrade(conn):
+    if not has_index(conn, "clubs", "idx_clubs_updated_at"):
+        conn.exec_driver_sql("CREATE INDEX idx_clubs_updated_at ON clubs (updated_at)")
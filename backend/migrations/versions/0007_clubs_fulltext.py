@@ -0,0 +1,13 @@
+# migrations/versions/0007_clubs_fulltext.py
+"""clubs.search_terms (gestemmte Begriffe) + FULLTEXT-Index ft_clubs_search (MySQL), Backfill."""
+from migrations.runner import has_column, has_index
+
+
+def upgrade(conn):
+    from services.fulltext import reindex
+
+    if not has_column(conn, "clubs", "search_terms"):
+        conn.exec_driver_sql("ALTER TABLE clubs ADD COLUMN search_terms TEXT NULL")
+    reindex(conn)
+    if conn.dialect.name == "mysql" and not has_index(conn, "clubs", "ft_clubs_search"):
+        conn.exec_driver_sql("ALTER TABLE clubs ADD FULLTEXT INDEX ft_clubs_search (search_terms)")
@@ -0,0 +1,40 @@
+# migrations/versions/0008_enrollments_waitlist.py
+"""
+Warteliste: enrollments.queued_at + idx_enrollments_club_status_queue
+(ersetzt idx_enrollments_club_status). PENDING belegt ab jetzt keinen Platz mehr;
+bisherige PENDING-Buchungen hatten einen Platz und werden zu CONFIRMED,
+danach werden clubs.seats_taken und club_stats abgeglichen.
+"""
+from sqlalchemy import text
+
+from migrations.runner import has_column, has_index, has_table
+
+SEAT_STATUSES = "'CONFIRMED','ATTENDED'"
+
+
+def upgrade(conn):
+    if not has_column(conn, "enrollments", "queued_at"):
+        conn.exec_driver_sql("ALTER TABLE enrollments ADD COLUMN queued_at DATETIME NULL")
+    if not has_index(conn, "enrollments", "idx_enrollments_club_status_queue"):
+        conn.exec_driver_sql(
+            "CREATE INDEX idx_enrollments_club_status_queue ON enrollments (club_id, status, queued_at)"
+        )
+    if has_index(conn, "enrollments", "idx_enrollments_club_status"):
+        if conn.dialect.name == "mysql":
+            conn.exec_driver_sql("DROP INDEX idx_enrollments_club_status ON enrollments")
+        else:
+            conn.exec_driver_sql("DROP INDEX idx_enrollments_club_status")
+
+    if has_table(conn, "club_stats"):
+        conn.execute(text("""
+            UPDATE club_stats SET confirmed_count = confirmed_count + pending_count, pending_count = 0
+            WHERE pending_count > 0
+        """))
+    conn.execute(text("UPDATE enrollments SET status = 'CONFIRMED' WHERE status = 'PENDING'"))
+    conn.execute(text(f"""
+        UPDATE clubs SET seats_taken = (
+          SELECT CASE WHEN COUNT(*) > clubs.capacity THEN clubs.capacity ELSE COUNT(*) END
+          FROM enrollments e
+          WHERE e.club_id = clubs.id AND e.status IN ({SEAT_STATUSES})
+        ), updated_at = updated_at
+    """))
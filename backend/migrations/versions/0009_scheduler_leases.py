@@ -0,0 +1,9 @@
+# migrations/versions/0009_scheduler_leases.py
+"""scheduler_leases (Leader-Lease + Watermark für Hintergrundjobs, services/lifecycle.py)."""
+from migrations.runner import create_tables
+
+
+def upgrade(conn):
+    from models import SchedulerLease
+
+    create_tables(conn, SchedulerLease.__table__)
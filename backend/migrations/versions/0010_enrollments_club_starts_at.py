@@ -0,0 +1,33 @@
+# migrations/versions/0010_enrollments_club_starts_at.py
+"""
+enrollments.club_starts_at (Kopie von clubs.starts_at) + idx_enrollments_user_status_start
+für "Meine Buchungen" (services/my_bookings.py). Backfill in PK-Bereichen mit
+COMMIT pro Batch (TRANSACTIONAL = False), damit große Tabellen nicht in einer
+einzigen Transaktion gesperrt werden; ein Abbruch setzt bei club_starts_at IS NULL fort.
+"""
+from sqlalchemy import text
+
+from migrations.runner import has_column, has_index
+
+BATCH = 10_000
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    if not has_column(conn, "enrollments", "club_starts_at"):
+        conn.exec_driver_sql("ALTER TABLE enrollments ADD COLUMN club_starts_at DATETIME NULL")
+
+    max_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM enrollments")).scalar()
+    for low in range(0, max_id, BATCH):
+        conn.execute(text("""
+            UPDATE enrollments SET club_starts_at = (
+              SELECT c.starts_at FROM clubs c WHERE c.id = enrollments.club_id
+            ), updated_at = updated_at
+            WHERE id > :low AND id <= :high AND club_starts_at IS NULL
+        """), {"low": low, "high": low + BATCH})
+        conn.commit()
+
+    if not has_index(conn, "enrollments", "idx_enrollments_user_status_start"):
+        conn.exec_driver_sql(
+            "CREATE INDEX idx_enrollments_user_status_start ON enrollments (user_id, status, club_starts_at)"
+        )
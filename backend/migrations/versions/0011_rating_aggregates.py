@@ -0,0 +1,13 @@
+# migrations/versions/0011_rating_aggregates.py
+"""club_ratings + host_ratings (laufende Bewertungs-Aggregate, services/ratings.py) anlegen, backfillen."""
+from migrations.runner import create_tables, has_table
+
+
+def upgrade(conn):
+    from models import ClubRating, HostRating
+    from services.ratings import rebuild_ratings
+
+    fresh = not has_table(conn, ClubRating.__tablename__) or not has_table(conn, HostRating.__tablename__)
+    create_tables(conn, ClubRating.__table__, HostRating.__table__)
+    if fresh:
+        rebuild_ratings(conn)
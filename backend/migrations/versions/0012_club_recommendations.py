@@ -0,0 +1,12 @@
+# migrations/versions/0012_club_recommendations.py
+"""club_recommendations (Top-k ähnliche Clubs, services/recommendations.py) anlegen.
+
+Befüllt wird die Tabelle von `flask recommendations build` (braucht NumPy).
+"""
+from migrations.runner import create_tables
+
+
+def upgrade(conn):
+    from models import ClubRecommendation
+
+    create_tables(conn, ClubRecommendation.__table__)
@@ -0,0 +1,33 @@
+# migrations/versions/0013_audit_club_id.py
+"""
+enrollment_audit.club_id + idx_audit_club (club_id, id): die Host-Statistik
+(services/host_analytics.py) filtert ohne JOIN auf enrollments, damit auch
+Audit-Zeilen gelöschter Enrollments zählen. Backfill aus enrollments in
+PK-Bereichen mit COMMIT pro Batch (wie 0010); Zeilen bereits gelöschter
+Enrollments bleiben NULL.
+"""
+from sqlalchemy import text
+
+from migrations.runner import has_column, has_index
+
+BATCH = 10_000
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    if not has_column(conn, "enrollment_audit", "club_id"):
+        coltype = "BIGINT UNSIGNED" if conn.dialect.name == "mysql" else "INTEGER"
+        conn.exec_driver_sql(f"ALTER TABLE enrollment_audit ADD COLUMN club_id {coltype} NULL")
+
+    max_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM enrollment_audit")).scalar()
+    for low in range(0, max_id, BATCH):
+        conn.execute(text("""
+            UPDATE enrollment_audit SET club_id = (
+              SELECT e.club_id FROM enrollments e WHERE e.id = enrollment_audit.enrollment_id
+            )
+            WHERE id > :low AND id <= :high AND club_id IS NULL
+        """), {"low": low, "high": low + BATCH})
+        conn.commit()
+
+    if not has_index(conn, "enrollment_audit", "idx_audit_club"):
+        conn.exec_driver_sql("CREATE INDEX idx_audit_club ON enrollment_audit (club_id, id)")
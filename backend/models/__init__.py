@@ -12,11 +12,12 @@ from extensions import login_manager  # <--- hinzugefügt
 
 __all__ = (
     # user_models
-    "User", "Host",
+    "User", "Host", "HostRating",
     # core
-    "Level",
+    "Level", "SchemaVersion", "CacheVersion", "SchedulerLease",
     # club
-    "Club", "Enrollment", "EnrollmentAudit", "Review", "Wishlist",
+    "Club", "ClubStats", "ClubRating", "ClubRecommendation", "Enrollment", "EnrollmentAudit",
+    "Review", "Wishlist",
     # helper
     "register_models",
 )
@@ -27,19 +28,26 @@ def register_models() -> None:
     Wichtig: in app.py vor db.create_all() / Alembic aufrufen.
     """
     # Importe sind absichtlich innerhalb der Funktion, um zirkulare Importe zu vermeiden.
-    from .user_models import user_model, host_model  # noqa: F401
-    from .core import level_model                    # noqa: F401
+    from .user_models import user_model, host_model, host_rating_model  # noqa: F401
+    from .core import level_model, schema_version_model, cache_version_model, scheduler_lease_model  # noqa: F401
     from .club import (
-        club_model, enrollment_model, enrollment_audit_model,
-        review_model, wishlist_model
+        club_model, club_stats_model, club_rating_model, club_recommendation_model, enrollment_model,
+        enrollment_audit_model, review_model, wishlist_model
     )  # noqa: F401
 
 # ---- Lazy Re-Exports für bequeme Imports ----
 if TYPE_CHECKING:
     from .user_models.user_model import User  # type: ignore
     from .user_models.host_model import Host  # type: ignore
+    from .user_models.host_rating_model import HostRating  # type: ignore
     from .core.level_model import Level       # type: ignore
+    from .core.schema_version_model import SchemaVersion  # type: ignore
+    from .core.cache_version_model import CacheVersion  # type: ignore
+    from .core.scheduler_lease_model import SchedulerLease  # type: ignore
     from .club.club_model import Club         # type: ignore
+    from .club.club_stats_model import ClubStats  # type: ignore
+    from .club.club_rating_model import ClubRating  # type: ignore
+    from .club.club_recommendation_model import ClubRecommendation  # type: ignore
     from .club.enrollment_model import Enrollment  # type: ignore
     from .club.enrollment_audit_model import EnrollmentAudit  # type: ignore
     from .club.review_model import Review     # type: ignore
@@ -52,12 +60,33 @@ def __getattr__(name: str):
     if name == "Host":
         from .user_models.host_model import Host
         return Host
+    if name == "HostRating":
+        from .user_models.host_rating_model import HostRating
+        return HostRating
     if name == "Level":
         from .core.level_model import Level
         return Level
+    if name == "SchemaVersion":
+        from .core.schema_version_model import SchemaVersion
+        return SchemaVersion
+    if name == "CacheVersion":
+        from .core.cache_version_model import CacheVersion
+        return CacheVersion
+    if name == "SchedulerLease":
+        from .core.scheduler_lease_model import SchedulerLease
+        return SchedulerLease
     if name == "Club":
         from .club.club_model import Club
         return Club
+    if name == "ClubStats":
+        from .club.club_stats_model import ClubStats
+        return ClubStats
+    if name == "ClubRating":
+        from .club.club_rating_model import ClubRating
+        return ClubRating
+    if name == "ClubRecommendation":
+        from .club.club_recommendation_model import ClubRecommendation
+        return ClubRecommendation
     if name == "Enrollment":
         from .club.enrollment_model import Enrollment
         return Enrollment
@@ -75,9 +104,10 @@ def __getattr__(name: str):
 # ---- Flask-Login user_loader ----
 @login_manager.user_loader
 def load_user(user_id: str):
-    from .user_models.user_model import User  # Import hier, um Zirkularität zu vermeiden
+    # Read-only Snapshot aus dem prozesslokalen Cache (services/user_cache.py)
+    from services.user_cache import user_cache  # Import hier, um Zirkularität zu vermeiden
     try:
-        return User.query.get(int(user_id))
+        return user_cache.load(int(user_id))
     except Exception:
         return None
 
@@ -1,13 +1,19 @@
 """
 club-Paket:
-- Stellt Club, Enrollment, EnrollmentAudit, Review, Wishlist bereit.
+- Stellt Club, ClubStats, ClubRating, ClubRecommendation, Enrollment, EnrollmentAudit,
+  Review, Wishlist bereit.
 """
 from typing import TYPE_CHECKING
 
-__all__ = ("Club", "Enrollment", "EnrollmentAudit", "Review", "Wishlist")
+__all__ = (
+    "Club", "ClubStats", "ClubRating", "ClubRecommendation", "Enrollment", "EnrollmentAudit", "Review", "Wishlist",
+)
 
 if TYPE_CHECKING:
     from .club_model import Club  # type: ignore
+    from .club_stats_model import ClubStats  # type: ignore
+    from .club_rating_model import ClubRating  # type: ignore
+    from .club_recommendation_model import ClubRecommendation  # type: ignore
     from .enrollment_model import Enrollment  # type: ignore
     from .enrollment_audit_model import EnrollmentAudit  # type: ignore
     from .review_model import Review  # type: ignore
@@ -17,6 +23,15 @@ def __getattr__(name: str):
     if name == "Club":
         from .club_model import Club
         return Club
+    if name == "ClubStats":
+        from .club_stats_model import ClubStats
+        return ClubStats
+    if name == "ClubRating":
+        from .club_rating_model import ClubRating
+        return ClubRating
+    if name == "ClubRecommendation":
+        from .club_recommendation_model import ClubRecommendation
+        return ClubRecommendation
     if name == "Enrollment":
         from .enrollment_model import Enrollment
         return Enrollment
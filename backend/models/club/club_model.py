@@ -2,8 +2,8 @@ from __future__ import annotations
 import datetime as dt
 from typing import Optional, List
 
-from sqlalchemy import String, Text, DateTime, ForeignKey, Index
-from sqlalchemy.dialects.mysql import BIGINT, SMALLINT, INTEGER, CHAR, ENUM as MySQLEnum
+from sqlalchemy import String, Text, DateTime, ForeignKey, Index, CheckConstraint
+from models.column_types import BIGINT, SMALLINT, INTEGER, CHAR, ENUM as MySQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from extensions import db
 
@@ -15,11 +15,16 @@ class Club(db.Model):
         Index("idx_clubs_starts_at", "starts_at"),
         Index("idx_clubs_level", "level_code"),
         Index("idx_clubs_search", "status", "level_code", "starts_at"),
+        Index("idx_clubs_updated_at", "updated_at"),
+        Index("ft_clubs_search", "search_terms", mysql_prefix="FULLTEXT"),
+        CheckConstraint("seats_taken <= capacity", name="chk_clubs_seats"),
     )
 
     id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(120), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
+    # Gestemmte Begriffe aus title/description für die Volltextsuche (services/fulltext.py)
+    search_terms: Mapped[Optional[str]] = mapped_column(Text, deferred=True)
 
     # Typ zuerst, dann ForeignKey:
     level_code: Mapped[str] = mapped_column(
@@ -36,6 +41,10 @@ class Club(db.Model):
     starts_at: Mapped[dt.datetime] = mapped_column(DateTime, nullable=False)
     duration_min: Mapped[int] = mapped_column(SMALLINT(unsigned=True), nullable=False)
     capacity: Mapped[int] = mapped_column(SMALLINT(unsigned=True), nullable=False, default=12)
+    # Denormalisierter Zähler belegter Plätze (siehe services/seats.py), nie direkt setzen
+    seats_taken: Mapped[int] = mapped_column(
+        SMALLINT(unsigned=True), nullable=False, default=0, server_default="0"
+    )
     meeting_url: Mapped[Optional[str]] = mapped_column(String(255))
     price_cents: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False, default=0)
     currency: Mapped[str] = mapped_column(CHAR(3), nullable=False, default="EUR")
@@ -55,11 +64,15 @@ class Club(db.Model):
         nullable=False,
     )
 
-    host: Mapped["User"] = relationship("User", back_populates="clubs_hosted", foreign_keys=[host_id])
-    level: Mapped["Level"] = relationship("Level")
+    # Ladestrategien: lazy="raise_on_sql" → Nachladen pro Zeile wirft (services/query_guard.py);
+    # Listen laden Hosts/Enrollments explizit per selectinload, Level-Labels kommen aus level_catalog
+    host: Mapped["User"] = relationship(
+        "User", back_populates="clubs_hosted", foreign_keys=[host_id], lazy="raise_on_sql"
+    )
+    level: Mapped["Level"] = relationship("Level", lazy="raise_on_sql")
     enrollments: Mapped[List["Enrollment"]] = relationship(
-        "Enrollment", back_populates="club", cascade="all, delete-orphan"
+        "Enrollment", back_populates="club", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
     wishlist_entries: Mapped[List["Wishlist"]] = relationship(
-        "Wishlist", back_populates="club", cascade="all, delete-orphan"
+        "Wishlist", back_populates="club", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
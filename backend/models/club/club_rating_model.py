@@ -0,0 +1,41 @@
+from __future__ import annotations
+import datetime as dt
+
+from sqlalchemy import Integer, DateTime, ForeignKey
+from models.column_types import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+
+# rating (1..5) → Histogramm-Spalte
+RATING_COLUMNS = {r: f"rating_{r}" for r in range(1, 6)}
+
+
+class RatingCountsMixin:
+    """
+    Laufende Bewertungs-Aggregate (Anzahl, Summe, Histogramm 1..5), gepflegt von
+    services/ratings.py im Flush, der ein Review anlegt/ändert/löscht.
+    Fehlende Zeile = noch keine Bewertung. Signed wie club_stats, damit Drift nie
+    einen Flush abbricht (`flask ratings rebuild` korrigiert).
+    """
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    last_change_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, server_default=db.func.current_timestamp(), nullable=False
+    )
+
+
+class ClubRating(RatingCountsMixin, db.Model):
+    __tablename__ = "club_ratings"
+
+    # Typ zuerst, dann ForeignKey:
+    club_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("clubs.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
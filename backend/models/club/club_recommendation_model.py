@@ -0,0 +1,39 @@
+from __future__ import annotations
+import datetime as dt
+
+from sqlalchemy import Float, DateTime, ForeignKey, Index, SmallInteger
+from models.column_types import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+
+
+class ClubRecommendation(db.Model):
+    """
+    "Wer das gebucht hat, buchte auch …": Top-k ähnliche Clubs pro Club, offline
+    berechnet von services/recommendations.py (`flask recommendations build`).
+    PK (club_id, rank) → die Detailseite liest ihre Empfehlungen als PK-Bereich.
+    """
+    __tablename__ = "club_recommendations"
+
+    # Typ zuerst, dann ForeignKey:
+    club_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("clubs.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+    rank: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    neighbour_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("clubs.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+
+    computed_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, server_default=db.func.current_timestamp(), nullable=False
+    )
+
+    __table_args__ = (
+        # für ON DELETE CASCADE über neighbour_id
+        Index("idx_club_recommendations_neighbour", "neighbour_id"),
+    )
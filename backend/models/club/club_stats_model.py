@@ -0,0 +1,33 @@
+from __future__ import annotations
+import datetime as dt
+
+from sqlalchemy import Integer, DateTime, ForeignKey
+from models.column_types import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+
+class ClubStats(db.Model):
+    """
+    Inkrementell gepflegte Enrollment-Zähler pro Club (ersetzt v_club_fillrate).
+    Pflege: services/club_stats.py; fehlende Zeile = alle Zähler 0.
+    Zähler sind bewusst signed, damit Drift nie einen Buchungs-Flush abbricht
+    (`flask club-stats rebuild` korrigiert).
+    """
+    __tablename__ = "club_stats"
+
+    # Typ zuerst, dann ForeignKey:
+    club_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("clubs.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+
+    pending_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    confirmed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cancelled_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attended_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    no_show_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    last_change_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, server_default=db.func.current_timestamp(), nullable=False
+    )
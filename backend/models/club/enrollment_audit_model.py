@@ -3,40 +3,58 @@ from __future__ import annotations
 import datetime as dt
 from typing import Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Index
-from sqlalchemy.dialects.mysql import BIGINT, ENUM as MySQLEnum
+from sqlalchemy import String, DateTime, Index
+from models.column_types import BIGINT, ENUM as MySQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from extensions import db
 
+AUDIT_ACTIONS = ("INSERT", "UPDATE", "DELETE")
+
 class EnrollmentAudit(db.Model):
+    """
+    Append-only Log der Enrollment-Statuswechsel, geschrieben von services/audit.py.
+    Keine Foreign Keys: auf MySQL ist die Tabelle nach Monat partitioniert
+    (PRIMARY KEY (id, changed_at), PARTITION BY RANGE TO_DAYS(changed_at)),
+    partitionierte InnoDB-Tabellen erlauben keine FKs. Einträge überleben so
+    auch gelöschte Enrollments/User; club_id ist deshalb mitgeschrieben
+    (Host-Statistik, services/host_analytics.py) statt über enrollments gejoint.
+    """
     __tablename__ = "enrollment_audit"
-    __table_args__ = (Index("idx_audit_enrollment", "enrollment_id"),)
+    __table_args__ = (
+        Index("idx_audit_enrollment", "enrollment_id"),
+        Index("idx_audit_club", "club_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
 
-    # Typ zuerst, dann ForeignKey:
-    enrollment_id: Mapped[int] = mapped_column(
-        BIGINT(unsigned=True),
-        ForeignKey("enrollments.id", ondelete="CASCADE", onupdate="CASCADE"),
-        nullable=False,
-    )
+    enrollment_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    # NULL nur bei Altzeilen, deren Enrollment vor Migration 0013 gelöscht wurde
+    club_id: Mapped[Optional[int]] = mapped_column(BIGINT(unsigned=True), nullable=True)
 
     action: Mapped[str] = mapped_column(
-        MySQLEnum("INSERT", "UPDATE", "DELETE", name="audit_action"),
+        MySQLEnum(*AUDIT_ACTIONS, name="audit_action"),
         nullable=False,
     )
     old_status: Mapped[Optional[str]] = mapped_column(String(16))
     new_status: Mapped[Optional[str]] = mapped_column(String(16))
 
-    changed_by: Mapped[Optional[int]] = mapped_column(
-        BIGINT(unsigned=True),
-        ForeignKey("users.id", ondelete="SET NULL", onupdate="CASCADE"),
-        nullable=True,
-    )
+    changed_by: Mapped[Optional[int]] = mapped_column(BIGINT(unsigned=True), nullable=True)
 
+    # Zeitpunkt des Statuswechsels (von der App gesetzt, nicht der Schreibzeitpunkt)
     changed_at: Mapped[dt.datetime] = mapped_column(
         DateTime, server_default=db.func.current_timestamp(), nullable=False
     )
 
-    enrollment: Mapped["Enrollment"] = relationship("Enrollment", back_populates="audit_entries")
-    changed_by_user: Mapped[Optional["User"]] = relationship("User")
+    enrollment: Mapped[Optional["Enrollment"]] = relationship(
+        "Enrollment",
+        primaryjoin="foreign(EnrollmentAudit.enrollment_id) == Enrollment.id",
+        back_populates="audit_entries",
+        viewonly=True,
+        lazy="raise_on_sql",
+    )
+    changed_by_user: Mapped[Optional["User"]] = relationship(
+        "User",
+        primaryjoin="foreign(EnrollmentAudit.changed_by) == User.id",
+        viewonly=True,
+        lazy="raise_on_sql",
+    )
@@ -3,18 +3,26 @@ import datetime as dt
 from typing import List, Optional
 
 from sqlalchemy import DateTime, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.dialects.mysql import BIGINT, ENUM as MySQLEnum
+from models.column_types import BIGINT, ENUM as MySQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from extensions import db
 
 ENROLL_STATUS = ("PENDING", "CONFIRMED", "CANCELLED", "ATTENDED", "NO_SHOW")
+# Status, die einen Platz im Club belegen (zählen in clubs.seats_taken)
+SEAT_STATUSES = ("CONFIRMED", "ATTENDED")
+# Warteliste: belegt keinen Platz, Reihenfolge nach queued_at (services/waitlist.py)
+WAITLIST_STATUS = "PENDING"
 
 class Enrollment(db.Model):
     __tablename__ = "enrollments"
     __table_args__ = (
         UniqueConstraint("user_id", "club_id", name="uq_enrollments_user_club"),
         Index("idx_enrollments_club", "club_id"),
-        Index("idx_enrollments_club_status", "club_id", "status"),
+        # Präfix (club_id, status) für Zählungen; mit queued_at ist der Kopf der
+        # Warteliste ein einzelner Index-Lookup
+        Index("idx_enrollments_club_status_queue", "club_id", "status", "queued_at"),
+        # "Meine Buchungen": pro Status ein Range-Scan in Startreihenfolge (services/my_bookings.py)
+        Index("idx_enrollments_user_status_start", "user_id", "status", "club_starts_at"),
     )
 
     id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
@@ -36,6 +44,10 @@ class Enrollment(db.Model):
         nullable=False,
         default="CONFIRMED",
     )
+    # Zeitpunkt des Eintrags in die Warteliste (nur bei PENDING gesetzt)
+    queued_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
+    # Kopie von clubs.starts_at, beim INSERT und bei Terminänderung gepflegt (services/my_bookings.py)
+    club_starts_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime, server_default=db.func.current_timestamp(), nullable=False
     )
@@ -46,11 +58,21 @@ class Enrollment(db.Model):
         nullable=False,
     )
 
-    user: Mapped["User"] = relationship("User", back_populates="enrollments")
-    club: Mapped["Club"] = relationship("Club", back_populates="enrollments")
+    user: Mapped["User"] = relationship("User", back_populates="enrollments", lazy="raise_on_sql")
+    # eine Buchung ohne ihren Club wird praktisch nie angezeigt: gleich mit joinen
+    club: Mapped["Club"] = relationship(
+        "Club", back_populates="enrollments", lazy="joined", innerjoin=True
+    )
     review: Mapped[Optional["Review"]] = relationship(
-        "Review", back_populates="enrollment", uselist=False, cascade="all, delete-orphan"
+        "Review", back_populates="enrollment", uselist=False, cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
+    # nur lesend: enrollment_audit hat keine FKs (Partitionierung) und überlebt das Enrollment
     audit_entries: Mapped[List["EnrollmentAudit"]] = relationship(
-        "EnrollmentAudit", back_populates="enrollment", cascade="all, delete-orphan"
+        "EnrollmentAudit",
+        primaryjoin="Enrollment.id == foreign(EnrollmentAudit.enrollment_id)",
+        back_populates="enrollment",
+        viewonly=True,
+        order_by="EnrollmentAudit.id",
+        lazy="raise_on_sql",
     )
@@ -3,7 +3,7 @@ import datetime as dt
 from typing import Optional
 
 from sqlalchemy import Text, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.dialects.mysql import BIGINT, TINYINT
+from models.column_types import BIGINT, TINYINT
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from extensions import db
@@ -29,5 +29,8 @@ class Review(db.Model):
         DateTime, server_default=db.func.current_timestamp(), nullable=False
     )
 
-    enrollment: Mapped["Enrollment"] = relationship("Enrollment", back_populates="review")
+    # Review → Enrollment → Club in einer Abfrage (Enrollment.club ist ebenfalls joined)
+    enrollment: Mapped["Enrollment"] = relationship(
+        "Enrollment", back_populates="review", lazy="joined", innerjoin=True
+    )
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 import datetime as dt
 
 from sqlalchemy import DateTime, ForeignKey
-from sqlalchemy.dialects.mysql import BIGINT
+from models.column_types import BIGINT
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from extensions import db
@@ -26,6 +26,9 @@ class Wishlist(db.Model):
         DateTime, server_default=db.func.current_timestamp(), nullable=False
     )
 
-    user: Mapped["User"] = relationship("User", back_populates="wishlist_items")
-    club: Mapped["Club"] = relationship("Club", back_populates="wishlist_entries")
+    user: Mapped["User"] = relationship("User", back_populates="wishlist_items", lazy="raise_on_sql")
+    # ein Merkzettel-Eintrag ist immer ein Club
+    club: Mapped["Club"] = relationship(
+        "Club", back_populates="wishlist_entries", lazy="joined", innerjoin=True
+    )
 
@@ -0,0 +1,51 @@
+# models/column_types.py
+"""
+MySQL-Spaltentypen mit SQLite-Variante.
+
+Die Modelle sind für MySQL geschrieben (unsigned Integer, ENUM, VARBINARY, ...);
+SQLite (Benchmark, lokale Läufe mit DATABASE_URL=sqlite:///...) kann diese
+Typen nicht rendern. Die Fabriken hier liefern den MySQL-Typ unverändert und
+hängen per with_variant() das SQLite-Äquivalent an:
+
+- Integer-Typen → INTEGER (nur so wird ein PK in SQLite zur Rowid/Autoincrement)
+- ENUM → VARCHAR über sqlalchemy.Enum(native_enum=False), Werte prüft weiter die App
+- VARBINARY → BLOB, CHAR → CHAR
+
+Aufruf wie die MySQL-Typen: BIGINT(unsigned=True), ENUM(*werte, name="..."), ...
+"""
+from __future__ import annotations
+
+from sqlalchemy import CHAR as _CHAR, Enum, Integer, LargeBinary
+from sqlalchemy.dialects import mysql
+
+__all__ = ("BIGINT", "INTEGER", "SMALLINT", "TINYINT", "CHAR", "VARBINARY", "ENUM")
+
+
+def BIGINT(**kw):
+    return mysql.BIGINT(**kw).with_variant(Integer(), "sqlite")
+
+
+def INTEGER(**kw):
+    return mysql.INTEGER(**kw).with_variant(Integer(), "sqlite")
+
+
+def SMALLINT(**kw):
+    return mysql.SMALLINT(**kw).with_variant(Integer(), "sqlite")
+
+
+def TINYINT(**kw):
+    return mysql.TINYINT(**kw).with_variant(Integer(), "sqlite")
+
+
+def CHAR(length: int, **kw):
+    return mysql.CHAR(length, **kw).with_variant(_CHAR(length), "sqlite")
+
+
+def VARBINARY(length: int):
+    return mysql.VARBINARY(length).with_variant(LargeBinary(length), "sqlite")
+
+
+def ENUM(*values: str, name: str):
+    return mysql.ENUM(*values, name=name).with_variant(
+        Enum(*values, name=name, native_enum=False, length=max(map(len, values))), "sqlite"
+    )
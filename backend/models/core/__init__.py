@@ -1,16 +1,30 @@
 """
 core-Paket:
-- Stellt Level (Sprachniveau) bereit.
+- Stellt Level (Sprachniveau), SchemaVersion (Migrationsstand),
+  CacheVersion (Versionszähler für Caches) und SchedulerLease
+  (Leader-Lease für Hintergrundjobs) bereit.
 """
 from typing import TYPE_CHECKING
 
-__all__ = ("Level",)
+__all__ = ("Level", "SchemaVersion", "CacheVersion", "SchedulerLease")
 
 if TYPE_CHECKING:
     from .level_model import Level  # type: ignore
+    from .schema_version_model import SchemaVersion  # type: ignore
+    from .cache_version_model import CacheVersion  # type: ignore
+    from .scheduler_lease_model import SchedulerLease  # type: ignore
 
 def __getattr__(name: str):
     if name == "Level":
         from .level_model import Level
         return Level
+    if name == "SchemaVersion":
+        from .schema_version_model import SchemaVersion
+        return SchemaVersion
+    if name == "CacheVersion":
+        from .cache_version_model import CacheVersion
+        return CacheVersion
+    if name == "SchedulerLease":
+        from .scheduler_lease_model import SchedulerLease
+        return SchedulerLease
     raise AttributeError(f"module 'models.core' has no attribute {name!r}")
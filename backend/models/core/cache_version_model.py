@@ -0,0 +1,23 @@
+import datetime as dt
+
+from sqlalchemy import String, DateTime
+from models.column_types import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+
+class CacheVersion(db.Model):
+    """
+    Versionszähler für prozesslokale Caches (z. B. "levels").
+    Schreibende Pfade erhöhen die Version (services/versions.py), Leser vergleichen
+    nur diese eine PK-Zeile statt die eigentlichen Daten neu zu laden.
+    """
+    __tablename__ = "cache_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False, default=1)
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        DateTime,
+        server_default=db.func.current_timestamp(),
+        onupdate=db.func.current_timestamp(),
+        nullable=False,
+    )
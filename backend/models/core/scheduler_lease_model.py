@@ -0,0 +1,21 @@
+import datetime as dt
+from typing import Optional
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+
+class SchedulerLease(db.Model):
+    """
+    Leader-Lease für periodische Hintergrundjobs (eine Zeile pro Job).
+    Nur der Worker mit gültigem Lease (owner, expires_at) führt den Job aus;
+    watermark merkt sich, bis wohin der Job sicher abgearbeitet ist
+    (services/lifecycle.py).
+    """
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    expires_at: Mapped[dt.datetime] = mapped_column(DateTime, nullable=False)
+    watermark: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
+    last_run_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,15 @@
+import datetime as dt
+
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+
+class SchemaVersion(db.Model):
+    """Eine Zeile pro angewendeter Migration (siehe migrations/runner.py)."""
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    applied_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, server_default=db.func.current_timestamp(), nullable=False
+    )
@@ -1,15 +1,16 @@
 """
 user_models-Paket:
-- Stellt User und Host bereit.
+- Stellt User, Host und HostRating bereit.
 - Lazy Re-Exports, damit from models.user_models import User, Host funktioniert.
 """
 from typing import TYPE_CHECKING
 
-__all__ = ("User", "Host")
+__all__ = ("User", "Host", "HostRating")
 
 if TYPE_CHECKING:
     from .user_model import User  # type: ignore
     from .host_model import Host  # type: ignore
+    from .host_rating_model import HostRating  # type: ignore
 
 def __getattr__(name: str):
     if name == "User":
@@ -18,4 +19,7 @@ def __getattr__(name: str):
     if name == "Host":
         from .host_model import Host
         return Host
+    if name == "HostRating":
+        from .host_rating_model import HostRating
+        return HostRating
     raise AttributeError(f"module 'models.user_models' has no attribute {name!r}")
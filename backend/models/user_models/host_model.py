@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import Optional
 
 from sqlalchemy import Text, ForeignKey
-from sqlalchemy.dialects.mysql import BIGINT
+from models.column_types import BIGINT
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from extensions import db  # passt für dein Start-Setup (src/app)
@@ -17,7 +17,7 @@ class Host(db.Model):
     )
     bio: Mapped[Optional[str]] = mapped_column(Text)
 
-    user: Mapped["User"] = relationship("User", back_populates="host_profile")
+    user: Mapped["User"] = relationship("User", back_populates="host_profile", lazy="joined", innerjoin=True)
 
     def __repr__(self) -> str:
         return f"<Host user_id={self.user_id}>"
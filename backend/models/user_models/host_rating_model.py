@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sqlalchemy import ForeignKey, Index
+from models.column_types import BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+from extensions import db
+from models.club.club_rating_model import RatingCountsMixin
+
+
+class HostRating(RatingCountsMixin, db.Model):
+    """Bewertungs-Aggregate über alle Clubs eines Hosts (Top-Hosts lesen nur diese Tabelle)."""
+    __tablename__ = "host_ratings"
+    __table_args__ = (
+        # Mindestanzahl an Bewertungen als Range über den Index
+        Index("idx_host_ratings_count", "review_count"),
+    )
+
+    # Typ zuerst, dann ForeignKey:
+    host_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("users.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
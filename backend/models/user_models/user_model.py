@@ -5,7 +5,7 @@ from typing import Optional, List
 
 from flask_login import UserMixin
 from sqlalchemy import String, Date, DateTime
-from sqlalchemy.dialects.mysql import BIGINT, VARBINARY, TINYINT
+from models.column_types import BIGINT, VARBINARY, TINYINT
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from extensions import db  # passt, wenn du aus src/app startest
@@ -38,15 +38,19 @@ class User(db.Model, UserMixin):
     )
 
     # Beziehungen
-    host_profile: Mapped["Host"] = relationship("Host", back_populates="user", uselist=False)
+    # Sammlungen nie implizit nachladen (services/query_guard.py), sondern per selectinload
+    host_profile: Mapped["Host"] = relationship(
+        "Host", back_populates="user", uselist=False, lazy="raise_on_sql"
+    )
     clubs_hosted: Mapped[List["Club"]] = relationship(
-        "Club", back_populates="host", cascade="all, delete-orphan", foreign_keys="Club.host_id"
+        "Club", back_populates="host", cascade="all, delete-orphan", foreign_keys="Club.host_id",
+        lazy="raise_on_sql",
     )
     enrollments: Mapped[List["Enrollment"]] = relationship(
-        "Enrollment", back_populates="user", cascade="all, delete-orphan"
+        "Enrollment", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
     wishlist_items: Mapped[List["Wishlist"]] = relationship(
-        "Wishlist", back_populates="user", cascade="all, delete-orphan"
+        "Wishlist", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
     # --- Rollen-Helfer ---
@@ -9,15 +9,25 @@ from sqlalchemy.exc import IntegrityError
 
 from extensions import db
 from models import User, Host
+from services.passwords import PasswordPoolBusy
+from services.user_cache import user_cache
+from services.query_guard import query_budget
 from .auth_util import (
     bad_request, created_user_payload, user_payload,
     s, email_ok, validate_birth_date,
-    hash_password, verify_password, unique_conflict,
+    hash_password, verify_password, needs_rehash, unique_conflict,
     requires_roles,
 )
 
 bp = Blueprint("auth", __name__)
 
+# ---------- Überlast: bcrypt-Pool voll ----------
+@bp.app_errorhandler(PasswordPoolBusy)
+def _password_pool_busy(_e):
+    resp, code = bad_request("Server ausgelastet, bitte gleich erneut versuchen.", None, 503)
+    resp.headers["Retry-After"] = "1"
+    return resp, code
+
 # ---------- REGISTER ----------
 @bp.post("/api/auth/register")
 def register():
@@ -88,12 +98,21 @@ def login():
     if not user or not verify_password(password, user.password_hash):
         return bad_request("Ungültige Zugangsdaten.", None, 401)
 
+    # Transparentes Rehash, wenn BCRYPT_ROUNDS geändert wurde (best effort)
+    if needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        except PasswordPoolBusy:
+            db.session.rollback()
+
     remember = bool(data.get("remember", False))
     login_user(user, remember=remember)
     return jsonify({"user": user_payload(user)}), 200
 
 # ---------- ME (Session-Status) ----------
 @bp.get("/api/auth/me")
+@query_budget(1)
 @login_required
 def me():
     return jsonify({"user": user_payload(current_user)}), 200
@@ -107,6 +126,7 @@ def logout():
 
 # ---------- Host-spezifische Endpunkte ----------
 @bp.get("/api/host/profile")
+@query_budget(2)
 @requires_roles("host")
 def get_host_profile():
     # Host-Profil anzeigen (bio darf None sein)
@@ -137,20 +157,24 @@ def update_host_profile():
 @login_required
 def promote_to_host():
     # In echter App: Nur Admins sollten das dürfen (separates Admin-Rollenmodell).
-    current_user.is_host = 1
-    if not Host.query.get(current_user.id):
-        db.session.add(Host(user_id=current_user.id, bio=None))
+    user = db.session.get(User, current_user.id)
+    user.is_host = 1
+    if not Host.query.get(user.id):
+        db.session.add(Host(user_id=user.id, bio=None))
     db.session.commit()
-    return jsonify({"user": user_payload(current_user)}), 200
+    user_cache.invalidate(user.id)
+    return jsonify({"user": user_payload(user)}), 200
 
 @bp.post("/api/host/demote")
 @login_required
 def demote_from_host():
     # Achtung: Falls Clubs existieren, vorher Business-Logik definieren!
-    current_user.is_host = 0
-    Host.query.filter_by(user_id=current_user.id).delete()
+    user = db.session.get(User, current_user.id)
+    user.is_host = 0
+    Host.query.filter_by(user_id=user.id).delete()
     db.session.commit()
-    return jsonify({"user": user_payload(current_user)}), 200
+    user_cache.invalidate(user.id)
+    return jsonify({"user": user_payload(user)}), 200
 
 
 # ---------- SELF-SERVICE: Profil aktualisieren (nur erlaubte Felder) ----------
@@ -163,6 +187,8 @@ def update_me():
     Nicht erlaubt: username, roles, is_host, id, password_hash.
     """
     data: dict[str, Any] = request.get_json(silent=True) or {}
+    # current_user ist ein read-only Snapshot → zu ändernden User frisch laden
+    user = db.session.get(User, current_user.id)
 
     # Eingaben lesen (alle optional)
     first_name = s(data, "first_name", default="", maxlen=80) or None
@@ -178,29 +204,30 @@ def update_me():
     if email_new is not None:
         if not email_ok(email_new):
             return bad_request("Ungültige E-Mail.", "email")
-        if email_new != current_user.email:
+        if email_new != user.email:
             # Für E-Mail-Änderung Passwort verlangen
             current_pw = s(data, "current_password", required=True)
-            if not verify_password(current_pw, current_user.password_hash):
+            if not verify_password(current_pw, user.password_hash):
                 return bad_request("Passwort falsch.", "current_password", 401)
             # Eindeutigkeit prüfen
             existing = User.query.filter(User.email == email_new).first()
-            if existing and existing.id != current_user.id:
+            if existing and existing.id != user.id:
                 return bad_request("E-Mail bereits registriert.", "email", 409)
 
     # Mutationen anwenden
     if first_name is not None:
-        current_user.first_name = first_name
+        user.first_name = first_name
     if last_name is not None:
-        current_user.last_name = last_name
+        user.last_name = last_name
     if bd_raw:
         # bd_raw leer -> keine Änderung; gesetzt + valid -> setzen / None akzeptieren wir nicht hier
-        current_user.birth_date = birth_date
-    if email_new is not None and email_new != current_user.email:
-        current_user.email = email_new
+        user.birth_date = birth_date
+    if email_new is not None and email_new != user.email:
+        user.email = email_new
 
     db.session.commit()
-    return jsonify({"user": user_payload(current_user)}), 200
+    user_cache.invalidate(user.id)
+    return jsonify({"user": user_payload(user)}), 200
 
 
 # ---------- SELF-SERVICE: Passwort ändern ----------
@@ -218,13 +245,15 @@ def change_password():
         field, msg = ve.args[0]
         return bad_request(f"{field}: {msg}.", field)
 
-    if not verify_password(current_pw, current_user.password_hash):
+    user = db.session.get(User, current_user.id)
+    if not verify_password(current_pw, user.password_hash):
         return bad_request("Passwort falsch.", "current_password", 401)
     if len(new_pw) < 8:
         return bad_request("Passwort zu kurz (min. 8).", "new_password")
 
-    current_user.password_hash = hash_password(new_pw)
+    user.password_hash = hash_password(new_pw)
     db.session.commit()
+    user_cache.invalidate(user.id)
     return jsonify({"ok": True}), 200
 
 
@@ -243,19 +272,18 @@ def delete_account():
         field, msg = ve.args[0]
         return bad_request(f"{field}: {msg}.", field)
 
-    if not verify_password(current_pw, current_user.password_hash):
-        return bad_request("Passwort falsch.", "current_password", 401)
-
     user_id = current_user.id
+    user = db.session.get(User, user_id)
+    if not user or not verify_password(current_pw, user.password_hash):
+        return bad_request("Passwort falsch.", "current_password", 401)
 
     # Zugehöriges Host-Profil entfernen (falls existiert)
     Host.query.filter_by(user_id=user_id).delete()
 
     # Nutzer löschen
-    user = User.query.get(user_id)
-    if user:
-        db.session.delete(user)
-        db.session.commit()
+    db.session.delete(user)
+    db.session.commit()
+    user_cache.invalidate(user_id)
 
     # Session beenden
     try:
@@ -1,13 +1,14 @@
 # routes/auth_util.py
 from __future__ import annotations
-import os
 import datetime as dt
 from typing import Any, Optional, Tuple, Callable, Iterable
 
-import bcrypt
 from flask import jsonify, abort
 from flask_login import login_required, current_user
 
+from services import passwords
+from services.serializers import user_serializer
+
 # ---------- Response Helper ----------
 
 def bad_request(msg: str, field: str | None = None, code: int = 400):
@@ -16,17 +17,8 @@ def bad_request(msg: str, field: str | None = None, code: int = 400):
         payload["field"] = field
     return jsonify(payload), code
 
-def user_payload(user) -> dict:
-    return {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "birth_date": user.birth_date.isoformat() if user.birth_date else None,
-        "is_host": bool(user.is_host),
-        "roles": user.roles,  # ["user"] oder ["user","host"]
-    }
+# vorkompiliert (attrgetter über alle Felder), siehe services/serializers.py
+user_payload = user_serializer
 
 def created_user_payload(user) -> tuple:
     return jsonify(user_payload(user)), 201
@@ -73,15 +65,17 @@ def validate_birth_date(raw: str | None, *, min_age: int = 13) -> Tuple[Optional
 
 # ---------- Security ----------
 
+# bcrypt läuft im begrenzten Pool (services/passwords.py);
+# bei Überlast fliegt PasswordPoolBusy → 503 (siehe routes/auth.py).
+
 def hash_password(pw: str) -> bytes:
-    rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
-    return bcrypt.hashpw(pw.encode("utf-8"), bcrypt.gensalt(rounds=rounds))
+    return passwords.hash_password(pw)
 
 def verify_password(pw: str, hashed: bytes) -> bool:
-    try:
-        return bcrypt.checkpw(pw.encode("utf-8"), hashed)
-    except Exception:
-        return False
+    return passwords.verify_password(pw, hashed)
+
+def needs_rehash(hashed: bytes) -> bool:
+    return passwords.needs_rehash(hashed)
 
 # ---------- DB Helpers ----------
 
@@ -0,0 +1,106 @@
+# routes/booking.py
+from __future__ import annotations
+from typing import Any
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+from services.booking import BookingError, book, cancel
+from services.my_bookings import DEFAULT_LIMIT, SECTIONS, list_bookings
+from services.query_guard import query_budget
+from services.waitlist import position
+from services.serializers import enrollment_serializer
+from .auth_util import bad_request
+from .events_util import club_payload, parse_int_param
+
+bp = Blueprint("booking", __name__)
+
+
+def _int_field(data: dict, *keys: str):
+    for key in keys:
+        val = data.get(key)
+        if val is not None and val != "":
+            try:
+                return int(val)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+# ---------- MEINE BUCHUNGEN ----------
+@bp.get("/booking")
+@bp.get("/booking/")
+@query_budget(2)
+@login_required
+def list_my_bookings():
+    """
+    Query-Parameter (alle optional):
+      scope    upcoming | past | all (Default: beide Bereiche)
+      limit    1..100 pro Bereich (Default 20)
+      cursor   next_cursor[scope] der vorherigen Seite (nur mit scope=upcoming|past)
+    Antwort: {"upcoming": [...], "past": [...], "next_cursor": {"upcoming": ..., "past": ...}}
+    """
+    args = request.args
+    scope = (args.get("scope") or "all").lower()
+    if scope != "all" and scope not in SECTIONS:
+        return bad_request("scope muss upcoming, past oder all sein.", "scope")
+    scopes = tuple(SECTIONS) if scope == "all" else (scope,)
+
+    cursor = args.get("cursor")
+    if cursor and scope == "all":
+        return bad_request("cursor nur zusammen mit scope=upcoming oder scope=past.", "cursor")
+    try:
+        limit = parse_int_param(args.get("limit"), minimum=1) or DEFAULT_LIMIT
+    except ValueError:
+        return bad_request("limit muss >= 1 sein.", "limit")
+
+    try:
+        pages = list_bookings(current_user.id, scopes, limit=limit,
+                              cursors={scope: cursor} if cursor else None)
+    except ValueError:
+        return bad_request("Ungültiger Cursor.", "cursor")
+
+    payload = {
+        name: [{**enrollment_serializer(enr), "club": club_payload(enr.club)} for enr in items]
+        for name, (items, _) in pages.items()
+    }
+    payload["next_cursor"] = {name: next_cursor for name, (_, next_cursor) in pages.items()}
+    return jsonify(payload), 200
+
+# ---------- BUCHEN ----------
+@bp.post("/booking")
+@bp.post("/booking/")
+@login_required
+def create_booking():
+    data: dict[str, Any] = request.get_json(silent=True) or {}
+    club_id = _int_field(data, "eventId", "club_id")
+    if club_id is None:
+        return bad_request("eventId fehlt oder ist ungültig.", "eventId")
+
+    # "waitlist": false → bei vollem Club ablehnen statt einreihen
+    waitlist_ok = data.get("waitlist")
+    if waitlist_ok is not None and not isinstance(waitlist_ok, bool):
+        return bad_request("waitlist muss true oder false sein.", "waitlist")
+
+    try:
+        enr = book(current_user.id, club_id, waitlist_ok=waitlist_ok)
+    except BookingError as be:
+        return bad_request(be.msg, "eventId", be.code)
+
+    return jsonify({**enrollment_serializer(enr), "waitlist_position": position(enr)}), 201
+
+# ---------- STORNIEREN ----------
+@bp.delete("/booking")
+@bp.delete("/booking/")
+@login_required
+def cancel_booking():
+    data: dict[str, Any] = request.get_json(silent=True) or {}
+    enrollment_id = _int_field(data, "id")
+    if enrollment_id is None:
+        return bad_request("id fehlt oder ist ungültig.", "id")
+
+    try:
+        enr = cancel(current_user.id, enrollment_id)
+    except BookingError as be:
+        return bad_request(be.msg, "id", be.code)
+
+    return jsonify({"ok": True, **enrollment_serializer(enr)}), 200
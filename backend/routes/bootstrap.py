@@ -0,0 +1,32 @@
+# routes/bootstrap.py
+from __future__ import annotations
+
+from flask import Blueprint, jsonify
+from flask_login import current_user
+
+from services.bootstrap import bootstrap_payload, session_state
+from services.http_cache import conditional
+from services.query_guard import query_budget
+
+bp = Blueprint("bootstrap", __name__)
+
+
+def _current_user():
+    return current_user if current_user.is_authenticated else None
+
+# ---------- SEITENAUFBAU (User, Merkzettel, Buchungen, Levels in einer Antwort) ----------
+
+def _bootstrap_state():
+    return session_state(_current_user()), None
+
+
+@bp.get("/api/bootstrap")
+@query_budget(4)
+@conditional(_bootstrap_state, personalized=True, include_query=False)
+def bootstrap():
+    """
+    Auch ohne Login erreichbar (user = null, leere Listen), damit die Seite
+    nicht zuerst /api/auth/me auf 401 prüfen muss.
+    bookings / waitlist: {"<club_id>": <enrollment_id>}
+    """
+    return jsonify(bootstrap_payload(_current_user())), 200
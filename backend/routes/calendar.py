@@ -0,0 +1,65 @@
+# routes/calendar.py
+from __future__ import annotations
+
+from flask import Blueprint, Response, current_app, jsonify, make_response, request, \
+    stream_with_context, url_for
+from flask_login import login_required, current_user
+
+from services import calendar_feed as feed
+from services.query_guard import query_budget
+from .auth_util import bad_request
+
+bp = Blueprint("calendar", __name__)
+
+ICS_MIMETYPE = "text/calendar"
+# Kalender-Apps pollen ohnehin stündlich; private, da die URL das Token enthält
+CACHE_CONTROL = "private, max-age=900"
+
+
+def _feed_url(user_id: int) -> str:
+    token = feed.make_token(current_app.config["SECRET_KEY"], user_id)
+    return url_for("calendar.ics_feed", token=token, _external=True)
+
+# ---------- FEED (Token statt Login, für Kalender-Abos) ----------
+@bp.get("/calendar/<token>.ics")
+@query_budget(3)
+def ics_feed(token: str):
+    parsed = feed.read_token(current_app.config["SECRET_KEY"], token)
+    if parsed is None:
+        return bad_request("Kalender-Link ungültig.", None, 404)
+    user_id, token_version = parsed
+
+    current_token, enroll_version, clubs_version = feed.feed_versions(user_id)
+    if token_version != current_token:
+        return bad_request("Kalender-Link ungültig.", None, 404)
+
+    entry = feed.cached_feed(user_id, enroll_version, clubs_version)
+    if entry is not None:
+        if request.if_none_match.contains_weak(entry.etag):
+            resp = make_response("", 304)
+        else:
+            resp = Response(entry.body, mimetype=ICS_MIMETYPE)
+        resp.set_etag(entry.etag, weak=True)
+    else:
+        resp = Response(
+            stream_with_context(feed.stream_feed(user_id, enroll_version, clubs_version)),
+            mimetype=ICS_MIMETYPE,
+        )
+    resp.mimetype_params["charset"] = "utf-8"
+    resp.headers["Cache-Control"] = CACHE_CONTROL
+    resp.headers["Content-Disposition"] = 'inline; filename="sprachclub.ics"'
+    return resp
+
+# ---------- LINK ABRUFEN / ZURÜCKSETZEN ----------
+@bp.get("/api/calendar/link")
+@query_budget(2)
+@login_required
+def calendar_link():
+    return jsonify({"url": _feed_url(current_user.id)}), 200
+
+
+@bp.post("/api/calendar/link/reset")
+@login_required
+def reset_calendar_link():
+    feed.rotate_token(current_user.id)
+    return jsonify({"url": _feed_url(current_user.id)}), 200
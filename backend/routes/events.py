@@ -0,0 +1,138 @@
+# routes/events.py
+from __future__ import annotations
+
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select
+
+from extensions import db
+from models import Club
+from models.club.club_model import CLUB_STATUS
+from services.club_search import ClubFilter, search_clubs, DEFAULT_LIMIT
+from services.fulltext import search_text
+from services.http_cache import conditional, clubs_state
+from services.level_catalog import level_catalog
+from services.query_guard import query_budget
+from services.recommendations import DEFAULT_TOP_K, recommendations_for
+from .auth_util import bad_request
+from .events_util import club_payload, parse_dt_param, parse_int_param, parse_list_param
+
+bp = Blueprint("events", __name__)
+
+
+# ---------- Validatoren (bedingte GETs, siehe services/http_cache.py) ----------
+
+def _listing_state():
+    last_modified, version = clubs_state()
+    return (last_modified, version, level_catalog.current_version()), last_modified
+
+
+def _club_state(club_id: int):
+    updated_at = db.session.execute(
+        select(Club.updated_at).where(Club.id == club_id)
+    ).scalar()
+    if updated_at is None:
+        return None
+    return (club_id, updated_at, level_catalog.current_version()), updated_at
+
+# ---------- SUCHE / LISTING ----------
+@bp.get("/eventdata")
+@query_budget(4)
+@conditional(_listing_state)
+def list_events():
+    """
+    Query-Parameter (alle optional):
+      level | category   Level-Code(s), kommagetrennt (category = Alias fürs Frontend)
+      status             SCHEDULED (Default) | CANCELED | COMPLETED
+      from | startDate   Beginn ab (YYYY-MM-DD oder ISO-Datetime, inklusiv)
+      to                 Beginn bis (YYYY-MM-DD inklusiv bzw. ISO-Datetime exklusiv)
+      min_price_cents, max_price_cents
+      limit              1..100 (Default 20)
+      cursor             next_cursor der vorherigen Seite
+      q | keyword        Volltextsuche in Titel/Beschreibung; Ergebnis nach Relevanz
+                         (Feld "score"), nur die Top-`limit` Treffer, kein Cursor
+    """
+    args = request.args
+
+    levels = parse_list_param(args.get("level") or args.get("category"))
+    if levels:
+        unknown = {code for code in levels if not level_catalog.is_valid(code)}
+        if unknown:
+            return bad_request(f"Unbekanntes Level: {', '.join(sorted(unknown))}.", "level")
+
+    status = (args.get("status") or "SCHEDULED").upper()
+    if status not in CLUB_STATUS:
+        return bad_request("Ungültiger Status.", "status")
+
+    try:
+        starts_from = parse_dt_param(args.get("from") or args.get("startDate"))
+    except ValueError:
+        return bad_request("from muss YYYY-MM-DD oder ISO-Datetime sein.", "from")
+    try:
+        starts_until = parse_dt_param(args.get("to"), end_of_day=True)
+    except ValueError:
+        return bad_request("to muss YYYY-MM-DD oder ISO-Datetime sein.", "to")
+
+    try:
+        min_price = parse_int_param(args.get("min_price_cents"))
+        max_price = parse_int_param(args.get("max_price_cents"))
+    except ValueError:
+        return bad_request("Preisfilter müssen ganze Cent-Beträge >= 0 sein.", "price")
+
+    try:
+        limit = parse_int_param(args.get("limit"), minimum=1) or DEFAULT_LIMIT
+    except ValueError:
+        return bad_request("limit muss >= 1 sein.", "limit")
+
+    q = (args.get("q") or args.get("keyword") or "").strip()
+    if len(q) > 200:
+        return bad_request("Suchbegriff ist zu lang (max. 200 Zeichen).", "q")
+
+    f = ClubFilter(
+        status=status,
+        levels=levels,
+        starts_from=starts_from,
+        starts_until=starts_until,
+        min_price_cents=min_price,
+        max_price_cents=max_price,
+    )
+    if q:
+        hits = search_text(q, f, limit=limit)
+        return jsonify({
+            "events": [{**club_payload(c), "score": score} for c, score in hits],
+            "next_cursor": None,
+        }), 200
+
+    try:
+        clubs, next_cursor = search_clubs(f, limit=limit, cursor=args.get("cursor"))
+    except ValueError:
+        return bad_request("Ungültiger Cursor.", "cursor")
+
+    return jsonify({
+        "events": [club_payload(c) for c in clubs],
+        "next_cursor": next_cursor,
+    }), 200
+
+# ---------- DETAIL ----------
+@bp.get("/eventdata/<int:club_id>")
+@query_budget(2)
+@conditional(_club_state, include_query=False)
+def get_event(club_id: int):
+    club = db.session.get(Club, club_id)
+    if club is None:
+        return bad_request("Club nicht gefunden.", None, 404)
+    return jsonify(club_payload(club)), 200
+
+# ---------- EMPFEHLUNGEN ("Wer das gebucht hat, buchte auch …") ----------
+@bp.get("/eventdata/<int:club_id>/recommendations")
+@query_budget(1)
+def get_recommendations(club_id: int):
+    """?limit=10 (max. 20); offline berechnet, siehe services/recommendations.py"""
+    try:
+        limit = parse_int_param(request.args.get("limit"), minimum=1) or DEFAULT_TOP_K
+    except ValueError:
+        return bad_request("limit muss >= 1 sein.", "limit")
+    hits = recommendations_for(club_id, limit)
+    return jsonify({
+        "club_id": club_id,
+        "events": [{**club_payload(c), "score": round(score, 4)} for c, score in hits],
+    }), 200
@@ -0,0 +1,43 @@
+# routes/events_util.py
+from __future__ import annotations
+import datetime as dt
+from typing import Optional
+
+from services.serializers import club_serializer
+
+# ---------- Response Helper ----------
+
+# vorkompiliert (attrgetter über alle Felder), siehe services/serializers.py
+club_payload = club_serializer
+
+# ---------- Query-Parameter ----------
+
+def parse_dt_param(raw: str | None, *, end_of_day: bool = False) -> Optional[dt.datetime]:
+    """
+    Akzeptiert YYYY-MM-DD oder ISO-Datetime.
+    end_of_day=True: reines Datum wird zum exklusiven Tagesende (Folgetag 00:00).
+    Wirft ValueError bei ungültigem Format.
+    """
+    if not raw:
+        return None
+    raw = raw.strip()
+    if len(raw) == 10:
+        d = dt.date.fromisoformat(raw)
+        if end_of_day:
+            d += dt.timedelta(days=1)
+        return dt.datetime.combine(d, dt.time.min)
+    return dt.datetime.fromisoformat(raw)
+
+def parse_int_param(raw: str | None, *, minimum: int = 0) -> Optional[int]:
+    """Wirft ValueError bei ungültigen oder zu kleinen Werten."""
+    if raw is None or raw == "":
+        return None
+    val = int(raw)
+    if val < minimum:
+        raise ValueError(val)
+    return val
+
+def parse_list_param(raw: str | None) -> list[str]:
+    if not raw:
+        return []
+    return [p.strip() for p in raw.split(",") if p.strip()]
@@ -0,0 +1,21 @@
+# routes/levels.py
+from __future__ import annotations
+
+from flask import Blueprint, jsonify
+
+from services.http_cache import conditional
+from services.level_catalog import level_catalog
+from services.query_guard import query_budget
+
+bp = Blueprint("levels", __name__)
+
+# ---------- LEVEL-KATALOG (aus dem Speicher, kein DB-Zugriff im Normalfall) ----------
+def _levels_state():
+    return (level_catalog.current_version(),), None
+
+
+@bp.get("/api/levels")
+@query_budget(1)
+@conditional(_levels_state, max_age=60, include_query=False)
+def list_levels():
+    return jsonify({"levels": level_catalog.as_list(), "version": level_catalog.version}), 200
@@ -0,0 +1,133 @@
+# routes/reviews.py
+from __future__ import annotations
+from typing import Any
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+from extensions import db
+from models import Club
+from services import ratings
+from services.query_guard import query_budget
+from .auth_util import bad_request
+from .events_util import parse_int_param
+
+bp = Blueprint("reviews", __name__)
+
+
+def review_payload(review) -> dict:
+    return {
+        "id": review.id,
+        "enrollment_id": review.enrollment_id,
+        "club_id": review.enrollment.club_id,
+        "rating": review.rating,
+        "comment": review.comment,
+        "created_at": review.created_at.isoformat() if review.created_at else None,
+    }
+
+
+def _rating_field(data: dict, *, required: bool):
+    """(rating, Fehlerantwort) – rating als ganze Zahl 1..5."""
+    raw = data.get("rating")
+    if raw is None:
+        return None, (bad_request("rating fehlt.", "rating") if required else None)
+    if isinstance(raw, bool) or not isinstance(raw, int) or raw not in ratings.RATINGS:
+        return None, bad_request("rating muss eine ganze Zahl von 1 bis 5 sein.", "rating")
+    return raw, None
+
+
+def _comment_field(data: dict):
+    raw = data.get("comment")
+    if raw is None:
+        return None, None
+    if not isinstance(raw, str):
+        return None, bad_request("comment muss Text sein.", "comment")
+    comment = raw.strip()
+    if len(comment) > ratings.MAX_COMMENT:
+        return None, bad_request(f"comment ist zu lang (max. {ratings.MAX_COMMENT} Zeichen).", "comment")
+    return comment or None, None
+
+# ---------- AGGREGATE (nur club_ratings / host_ratings) ----------
+@bp.get("/api/clubs/<int:club_id>/rating")
+@query_budget(1)
+def club_rating(club_id: int):
+    rating = ratings.get_club_ratings([club_id]).get(club_id)
+    if rating is None:
+        return bad_request("Club nicht gefunden.", None, 404)
+    return jsonify({"club_id": club_id, **rating}), 200
+
+
+@bp.get("/api/hosts/<int:host_id>/rating")
+@query_budget(1)
+def host_rating(host_id: int):
+    return jsonify({"host_id": host_id, **ratings.get_host_rating(host_id)}), 200
+
+
+@bp.get("/api/hosts/top")
+@query_budget(1)
+def top_hosts():
+    """?limit=10 (max. 100) & min_reviews=5"""
+    try:
+        limit = parse_int_param(request.args.get("limit"), minimum=1) or 10
+        min_reviews = parse_int_param(request.args.get("min_reviews"), minimum=1) or ratings.DEFAULT_MIN_REVIEWS
+    except ValueError:
+        return bad_request("limit und min_reviews müssen >= 1 sein.", "limit")
+    return jsonify({"hosts": ratings.top_hosts(limit, min_reviews)}), 200
+
+# ---------- REVIEWS EINES CLUBS ----------
+@bp.get("/api/clubs/<int:club_id>/reviews")
+@query_budget(3)
+def list_club_reviews(club_id: int):
+    rating = ratings.get_club_ratings([club_id]).get(club_id)
+    if rating is None:
+        return bad_request("Club nicht gefunden.", None, 404)
+    return jsonify({"rating": rating, "reviews": ratings.club_reviews(club_id)}), 200
+
+
+@bp.post("/api/clubs/<int:club_id>/reviews")
+@login_required
+def create_review(club_id: int):
+    data: dict[str, Any] = request.get_json(silent=True) or {}
+    rating, err = _rating_field(data, required=True)
+    if err:
+        return err
+    comment, err = _comment_field(data)
+    if err:
+        return err
+    if db.session.get(Club, club_id) is None:
+        return bad_request("Club nicht gefunden.", None, 404)
+
+    try:
+        review = ratings.create_review(current_user.id, club_id, rating, comment)
+    except ratings.ReviewError as re:
+        return bad_request(re.msg, "rating", re.code)
+    return jsonify(review_payload(review)), 201
+
+# ---------- EIGENE REVIEW ÄNDERN / LÖSCHEN ----------
+@bp.patch("/api/reviews/<int:review_id>")
+@login_required
+def update_review(review_id: int):
+    data: dict[str, Any] = request.get_json(silent=True) or {}
+    rating, err = _rating_field(data, required=False)
+    if err:
+        return err
+    comment, err = _comment_field(data)
+    if err:
+        return err
+
+    try:
+        review = ratings.update_review(current_user.id, review_id, rating=rating, comment=comment,
+                                       clear_comment="comment" in data)
+    except ratings.ReviewError as re:
+        return bad_request(re.msg, None, re.code)
+    return jsonify(review_payload(review)), 200
+
+
+@bp.delete("/api/reviews/<int:review_id>")
+@login_required
+def delete_review(review_id: int):
+    try:
+        ratings.delete_review(current_user.id, review_id)
+    except ratings.ReviewError as re:
+        return bad_request(re.msg, None, re.code)
+    return jsonify({"ok": True}), 200
@@ -0,0 +1,53 @@
+# routes/stats.py
+from __future__ import annotations
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+from extensions import db
+from models import Club
+from services.club_stats import get_stats
+from services.host_analytics import club_statistics
+from services.query_guard import query_budget
+from .auth_util import bad_request
+from .events_util import parse_list_param
+
+bp = Blueprint("stats", __name__)
+
+MAX_BATCH = 200
+
+# ---------- CLUB-STATISTIK (club_stats, eine indexierte Abfrage) ----------
+@bp.get("/api/clubs/<int:club_id>/stats")
+@query_budget(2)
+def club_stats(club_id: int):
+    stats = get_stats([club_id]).get(club_id)
+    if stats is None:
+        return bad_request("Club nicht gefunden.", None, 404)
+    return jsonify(stats), 200
+
+@bp.get("/api/clubs/stats")
+@query_budget(2)
+def club_stats_batch():
+    """?ids=1,2,3 (max. 200) → {"stats": {"1": {...}, ...}}"""
+    try:
+        ids = [int(x) for x in parse_list_param(request.args.get("ids"))]
+    except ValueError:
+        return bad_request("ids muss eine kommagetrennte Liste von Zahlen sein.", "ids")
+    if not ids:
+        return bad_request("ids fehlt.", "ids")
+    if len(ids) > MAX_BATCH:
+        return bad_request(f"Höchstens {MAX_BATCH} ids pro Anfrage.", "ids")
+    return jsonify({"stats": {str(k): v for k, v in get_stats(ids).items()}}), 200
+
+# ---------- HOST-ANALYSE (nur Host des Clubs) ----------
+@bp.get("/statistic/<int:club_id>")
+@query_budget(4)
+@login_required
+def host_statistic(club_id: int):
+    """Buchungskurve, Stornoquote, Vorlaufzeiten und Anwesenheit aus enrollment_audit."""
+    club = db.session.get(Club, club_id)
+    if club is None:
+        return bad_request("Club nicht gefunden.", None, 404)
+    if club.host_id != current_user.id:
+        return bad_request("Nur der Host dieses Clubs darf die Statistik sehen.", None, 403)
+    return jsonify(club_statistics(club)), 200
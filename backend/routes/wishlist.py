@@ -0,0 +1,91 @@
+# routes/wishlist.py
+from __future__ import annotations
+from typing import Any
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+from services import wishlist as wl
+from services.http_cache import conditional, clubs_state
+from services.query_guard import query_budget
+from .auth_util import bad_request
+from .events_util import club_payload, parse_list_param
+
+bp = Blueprint("wishlist", __name__)
+
+
+def _club_ids(data: dict) -> list[int] | None:
+    """eventId | club_id (einzeln) oder eventIds (Liste bzw. kommagetrennt); None = ungültig."""
+    raw = data.get("eventIds")
+    if raw is None:
+        single = data.get("eventId", data.get("club_id"))
+        raw = [] if single in (None, "") else [single]
+    elif isinstance(raw, str):
+        raw = parse_list_param(raw)
+    if not isinstance(raw, list):
+        return None
+    try:
+        return [int(x) for x in raw]
+    except (TypeError, ValueError):
+        return None
+
+
+def _request_ids():
+    data: dict[str, Any] = request.get_json(silent=True) or {}
+    if not data:
+        # DELETE-Bodies werden von manchen Clients verworfen → Query-String erlauben
+        data = request.args.to_dict()
+    ids = _club_ids(data)
+    if not ids:
+        return None, bad_request("eventId oder eventIds fehlt oder ist ungültig.", "eventId")
+    if len(ids) > wl.MAX_BULK:
+        return None, bad_request(f"Höchstens {wl.MAX_BULK} Events pro Anfrage.", "eventIds")
+    return ids, None
+
+# ---------- LESEN (ETag aus Versionszählern, 304 ohne Zugriff auf wishlists) ----------
+
+def _wishlist_state():
+    parts = (current_user.id, wl.wishlist_version(current_user.id))
+    if request.args.get("fields") == "ids":
+        return parts, None
+    # volle Events enthalten Club-Daten → deren Stand gehört mit in den ETag
+    return parts + clubs_state(), None
+
+
+@bp.get("/eventdata/wishlist")
+@query_budget(4)
+@login_required
+@conditional(_wishlist_state, personalized=True)
+def get_wishlist():
+    """
+    ?fields=ids → {"ids": [...], "version": n} (kompakt, für Set-Aufbau im Frontend)
+    sonst       → {"events": [...], "version": n}
+    """
+    if request.args.get("fields") == "ids":
+        payload = {"ids": wl.wishlist_ids(current_user.id)}
+    else:
+        payload = {"events": [club_payload(c) for c in wl.wishlist_clubs(current_user.id)]}
+    payload["version"] = wl.wishlist_version(current_user.id)
+    return jsonify(payload), 200
+
+# ---------- MERKEN / ENTFERNEN (einzeln oder als Menge) ----------
+@bp.post("/wishlist")
+@bp.post("/wishlist/")
+@login_required
+def add_to_wishlist():
+    ids, err = _request_ids()
+    if err:
+        return err
+    added = wl.add(current_user.id, ids)
+    return jsonify({"ok": True, "added": added, "version": wl.wishlist_version(current_user.id)}), 200
+
+
+@bp.delete("/wishlist")
+@bp.delete("/wishlist/")
+@login_required
+def remove_from_wishlist():
+    ids, err = _request_ids()
+    if err:
+        return err
+    removed = wl.remove(current_user.id, ids)
+    return jsonify({"ok": True, "removed": removed, "version": wl.wishlist_version(current_user.id)}), 200
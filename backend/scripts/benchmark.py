@@ -0,0 +1,315 @@
+# scripts/benchmark.py
+"""
+Wiederholbarer Benchmark der Kernpfade gegen die konfigurierte Datenbank.
+
+Fälle: Login, Listing (erste Seite, Level-Filter, Folgeseite, Volltext), Detail,
+Buchen/Stornieren, eigene Buchungen, Merkzettel (lesen, merken/entfernen), Statistik (Batch,
+Host-Analyse). Jeder Fall läuft über den Flask-Test-Client, also inklusive
+Routing, Serialisierung und aller Queries; gemessen werden Wall-Time-Perzentile
+und die Query-Anzahl pro Aufruf (services/query_guard.py).
+
+Voraussetzung sind Daten aus `flask datagen run` (User <prefix>_<id> mit
+services.datagen.DATAGEN_PASSWORD). Buchungen werden sofort wieder storniert,
+Merkzettel-Einträge wieder entfernt – der Datenbestand bleibt vergleichbar.
+
+Der JSON-Report (--output) enthält Commit, Dialekt/Server-Version und die
+Tabellengrößen; mit --compare wird gegen einen früheren Report verglichen,
+Exit-Code 1 bei einer p50-Verschlechterung über --threshold.
+
+Aufruf (aus backend/, DB per .env bzw. DATABASE_URL; SQLite und MySQL je ein Lauf).
+Für SQLite legt AUTO_MIGRATE=1 das Schema an (Typ-Varianten: models/column_types.py):
+    python scripts/benchmark.py --iterations 200 --output bench-mysql.json
+    export DATABASE_URL=sqlite:///bench.db AUTO_MIGRATE=1
+    flask datagen run && python scripts/benchmark.py --output bench-sqlite.json
+    python scripts/benchmark.py --compare bench-mysql.json
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import Club, Enrollment, Review, User, Wishlist  # noqa: E402
+from services.datagen import DATAGEN_PASSWORD, DEFAULT_PREFIX  # noqa: E402
+from services.query_guard import assert_max_queries  # noqa: E402
+
+# bcrypt dominiert den Login – weniger Wiederholungen reichen
+LOGIN_ITERATIONS = 20
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[], object]        # ein Aufruf; Rückgabe = Response
+    expect: tuple[int, ...] = (200,)
+    iterations: Optional[int] = None
+    setup: Optional[Callable[[], object]] = None      # ungemessen vor jedem Aufruf
+    teardown: Optional[Callable[[], object]] = None   # ungemessen danach (Bestand wiederherstellen)
+
+
+def percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(p / 100 * len(sorted_vals))) - 1))
+    return sorted_vals[idx]
+
+
+def git_revision() -> tuple[Optional[str], Optional[bool]]:
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    try:
+        rev = git("rev-parse", "HEAD")
+        dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+        return rev, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def dataset_info(prefix: str) -> dict:
+    counts = {
+        model.__tablename__: db.session.execute(select(func.count()).select_from(model)).scalar()
+        for model in (User, Club, Enrollment, Wishlist, Review)
+    }
+    engine = db.engine
+    with engine.connect() as conn:
+        server = ".".join(str(v) for v in (conn.dialect.server_version_info or ()))
+    return {
+        "dialect": engine.dialect.name,
+        "server_version": server or None,
+        "database": engine.url.database,
+        "prefix": prefix,
+        "rows": counts,
+    }
+
+
+def pick_fixtures(prefix: str, rng: random.Random) -> dict:
+    """Zufällige, aber per --seed feste Datagen-User/-Clubs für die Fälle."""
+    pattern = f"{prefix}\\_%"
+    members = list(db.session.execute(
+        select(User.username).where(User.username.like(pattern, escape="\\"), User.is_host == 0)
+        .order_by(User.id).limit(1000)
+    ).scalars())
+    host = db.session.execute(
+        select(User.id, User.username).join(Club, Club.host_id == User.id)
+        .where(User.username.like(pattern, escape="\\")).order_by(User.id).limit(1)
+    ).first()
+    if not members or host is None:
+        raise SystemExit(f"Keine Datagen-Daten mit Prefix {prefix!r} – zuerst `flask datagen run`.")
+
+    member = rng.choice(members)
+    member_id = db.session.execute(select(User.id).where(User.username == member)).scalar()
+    enrolled = select(Enrollment.club_id).where(Enrollment.user_id == member_id)
+    bookable = list(db.session.execute(
+        select(Club.id).where(Club.status == "SCHEDULED", Club.seats_taken < Club.capacity,
+                              Club.host_id != member_id, Club.id.not_in(enrolled))
+        .order_by(Club.starts_at).limit(200)
+    ).scalars())
+    if not bookable:
+        raise SystemExit("Kein buchbarer Club gefunden.")
+    wished = set(db.session.execute(select(Wishlist.club_id).where(Wishlist.user_id == member_id)).scalars())
+    all_ids = list(db.session.execute(select(Club.id).order_by(Club.id).limit(5000)).scalars())
+    host_club = db.session.execute(select(Club.id).where(Club.host_id == host.id).limit(1)).scalar()
+    return {
+        "members": members, "member": member, "bookable": bookable,
+        "wishable": [cid for cid in bookable if cid not in wished] or bookable,
+        "club_ids": all_ids, "host": host.username, "host_club": host_club,
+    }
+
+
+def build_cases(app, fx: dict, rng: random.Random) -> list[Case]:
+    anon = app.test_client()
+    member = app.test_client()
+    host = app.test_client()
+    for client, username in ((member, fx["member"]), (host, fx["host"])):
+        r = client.post("/api/auth/login", json={"identifier": username, "password": DATAGEN_PASSWORD})
+        if r.status_code != 200:
+            raise SystemExit(f"Login für {username} fehlgeschlagen ({r.status_code}).")
+
+    first_page = anon.get("/eventdata?limit=20").get_json() or {}
+    cursor = first_page.get("next_cursor")
+    level = (first_page.get("events") or [{}])[0].get("level_code")
+
+    def login():
+        return app.test_client().post(
+            "/api/auth/login", json={"identifier": rng.choice(fx["members"]), "password": DATAGEN_PASSWORD})
+
+    booking_state: dict = {}
+
+    def book():
+        club_id = rng.choice(fx["bookable"])
+        r = member.post("/booking", json={"eventId": club_id, "waitlist": False})
+        if r.status_code == 201:
+            booking_state["id"] = r.get_json()["id"]
+        return r
+
+    def cancel():
+        enrollment_id = booking_state.pop("id", None)
+        if enrollment_id is None:  # Club war voll, nichts zu stornieren
+            return member.delete("/booking", json={"id": 0})
+        return member.delete("/booking", json={"id": enrollment_id})
+
+    wish_state: dict = {}
+
+    def wishlist_add():
+        wish_state["id"] = rng.choice(fx["wishable"])
+        return member.post("/wishlist", json={"eventIds": [wish_state["id"]]})
+
+    def wishlist_remove():
+        return member.delete("/wishlist", json={"eventIds": [wish_state.pop("id", fx["wishable"][0])]})
+
+    def stats_batch():
+        ids = ",".join(str(i) for i in rng.sample(fx["club_ids"], min(50, len(fx["club_ids"]))))
+        return anon.get(f"/api/clubs/stats?ids={ids}")
+
+    cases = [
+        Case("login", login, iterations=LOGIN_ITERATIONS),
+        Case("listing.first_page", lambda: anon.get("/eventdata?limit=20")),
+        Case("listing.level", lambda: anon.get(f"/eventdata?level={level}&limit=20")),
+        Case("listing.search", lambda: anon.get("/eventdata?q=Reisen&limit=20")),
+        Case("detail", lambda: anon.get(f"/eventdata/{rng.choice(fx['club_ids'])}")),
+        Case("detail.recommendations",
+             lambda: anon.get(f"/eventdata/{rng.choice(fx['club_ids'])}/recommendations")),
+        Case("booking.book", book, expect=(201, 409), teardown=cancel),
+        Case("booking.cancel", cancel, expect=(200, 404), setup=book),
+        Case("booking.list", lambda: member.get("/booking")),
+        Case("wishlist.read", lambda: member.get("/eventdata/wishlist")),
+        Case("wishlist.add", wishlist_add, teardown=wishlist_remove),
+        Case("wishlist.remove", wishlist_remove, setup=wishlist_add),
+        Case("stats.batch", stats_batch),
+        Case("stats.host", lambda: host.get(f"/statistic/{fx['host_club']}")),
+    ]
+    if cursor:
+        cases.insert(3, Case("listing.next_page", lambda: anon.get(f"/eventdata?limit=20&cursor={cursor}")))
+    return cases
+
+
+def run_case(case: Case, iterations: int, warmup: int) -> dict:
+    n = case.iterations or iterations
+    times: list[float] = []
+    queries: list[int] = []
+    errors = 0
+    for i in range(warmup + n):
+        if case.setup:
+            case.setup()
+        with assert_max_queries(sys.maxsize, capture_sites=False) as query_log:
+            t0 = time.perf_counter()
+            resp = case.run()
+            resp.get_data()
+            elapsed = time.perf_counter() - t0
+        if case.teardown:
+            case.teardown()
+        if resp.status_code not in case.expect:
+            errors += 1
+        if i >= warmup:
+            times.append(elapsed * 1000)
+            queries.append(len(query_log))
+    times.sort()
+    return {
+        "n": n,
+        "errors": errors,
+        "mean_ms": round(sum(times) / len(times), 3),
+        "p50_ms": round(percentile(times, 50), 3),
+        "p95_ms": round(percentile(times, 95), 3),
+        "p99_ms": round(percentile(times, 99), 3),
+        "min_ms": round(times[0], 3),
+        "max_ms": round(times[-1], 3),
+        "queries": round(sum(queries) / len(queries), 2),
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> int:
+    """Druckt die Deltas; Rückgabe = Anzahl Regressionen (p50 > threshold schlechter)."""
+    regressions = 0
+    print(f"\nVergleich mit {baseline['meta'].get('git_commit') or '?'} "
+          f"({baseline['meta'].get('dialect')}, {baseline['meta'].get('timestamp')}):")
+    for name, now in report["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before["p50_ms"]:
+            print(f"  {name:<22} neu")
+            continue
+        delta = now["p50_ms"] / before["p50_ms"] - 1
+        worse = delta > threshold
+        regressions += worse
+        print(f"  {name:<22} p50 {before['p50_ms']:>9.2f} → {now['p50_ms']:>9.2f} ms  "
+              f"({delta:+.0%})  Queries {before['queries']} → {now['queries']}"
+              + ("  ← REGRESSION" if worse else ""))
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--iterations", type=int, default=100)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--prefix", default=DEFAULT_PREFIX)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--only", help="Kommagetrennte Fallnamen bzw. Präfixe (z. B. listing,login)")
+    ap.add_argument("--output", help="JSON-Report schreiben")
+    ap.add_argument("--compare", help="Früherer JSON-Report als Vergleichsbasis")
+    ap.add_argument("--threshold", type=float, default=0.2,
+                    help="Erlaubte p50-Verschlechterung (0.2 = 20 %%)")
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    app = create_app()
+    with app.app_context():
+        meta = dataset_info(args.prefix)
+        fixtures = pick_fixtures(args.prefix, rng)
+        db.session.remove()
+    cases = build_cases(app, fixtures, rng)
+    if args.only:
+        wanted = tuple(x.strip() for x in args.only.split(",") if x.strip())
+        cases = [c for c in cases if c.name.startswith(wanted)]
+
+    rev, dirty = git_revision()
+    report = {
+        "meta": {
+            **meta,
+            "git_commit": rev,
+            "git_dirty": dirty,
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+
+    print(f"{meta['dialect']} {meta['server_version'] or ''}  rows={meta['rows']}")
+    print(f"{'Fall':<22}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Queries':>9}{'Fehler':>8}")
+    for case in cases:
+        res = run_case(case, args.iterations, args.warmup)
+        report["results"][case.name] = res
+        print(f"{case.name:<22}{res['n']:>6}{res['p50_ms']:>10.2f}{res['p95_ms']:>10.2f}"
+              f"{res['p99_ms']:>10.2f}{res['queries']:>9}{res['errors']:>8}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+        print(f"Report: {args.output}")
+
+    failed = sum(r["errors"] for r in report["results"].values())
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            failed += compare(report, json.load(fh), args.threshold)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# scripts/booking_loadtest.py
+"""
+Last-Test für das Buchen eines einzelnen Clubs unter Konkurrenz.
+
+Legt einen Club mit --capacity Plätzen und --users Test-Usern an und lässt
+--threads Worker gleichzeitig (Barrier) über services.booking.book() buchen.
+Ausgabe: Durchsatz, Latenz-Perzentile und der finale Platzstand im Vergleich
+zur Kapazität. Exit-Code 1, falls überbucht wurde oder Zähler und tatsächliche
+Buchungen auseinanderlaufen.
+
+Aufruf (aus backend/, DB per .env bzw. DATABASE_URL):
+    python scripts/booking_loadtest.py --users 500 --capacity 50 --threads 64
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select, func, delete  # noqa: E402
+
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import User, Club, Enrollment  # noqa: E402
+from models.club.enrollment_model import SEAT_STATUSES  # noqa: E402
+from services.booking import BookingError, book  # noqa: E402
+
+
+def percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(p / 100 * len(sorted_vals))) - 1))
+    return sorted_vals[idx]
+
+
+def setup(n_users: int, capacity: int) -> tuple[int, list[int]]:
+    run = uuid.uuid4().hex[:8]
+    host = User(username=f"lt_{run}_host", email=f"lt_{run}_host@example.invalid",
+                first_name="Load", last_name="Test", password_hash=b"-", is_host=1)
+    db.session.add(host)
+    db.session.flush()
+    club = Club(title=f"Loadtest {run}", level_code="A2.1", host_id=host.id,
+                starts_at=dt.datetime.utcnow() + dt.timedelta(days=7),
+                duration_min=60, capacity=capacity)
+    db.session.add(club)
+    db.session.execute(insert(User.__table__), [
+        {"username": f"lt_{run}_{i}", "email": f"lt_{run}_{i}@example.invalid",
+         "first_name": "Load", "last_name": "Test", "password_hash": b"-", "is_host": 0}
+        for i in range(n_users)
+    ])
+    db.session.commit()
+    user_ids = list(db.session.execute(
+        select(User.id).where(User.username.like(f"lt_{run}_%"), User.id != host.id)
+    ).scalars())
+    return club.id, user_ids
+
+
+def cleanup(club_id: int) -> None:
+    run = db.session.get(Club, club_id).title.split()[-1]
+    db.session.execute(delete(Enrollment.__table__).where(Enrollment.club_id == club_id))
+    db.session.execute(delete(Club.__table__).where(Club.id == club_id))
+    db.session.execute(delete(User.__table__).where(User.username.like(f"lt_{run}_%")))
+    db.session.commit()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=300)
+    ap.add_argument("--capacity", type=int, default=50)
+    ap.add_argument("--threads", type=int, default=64)
+    ap.add_argument("--keep", action="store_true", help="Testdaten nicht löschen")
+    args = ap.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        club_id, user_ids = setup(args.users, args.capacity)
+
+    barrier = threading.Barrier(min(args.threads, len(user_ids)))
+    started = threading.local()
+
+    def worker(user_id: int) -> tuple[str, float]:
+        with app.app_context():
+            if not getattr(started, "done", False):
+                started.done = True
+                try:
+                    barrier.wait(timeout=30)
+                except threading.BrokenBarrierError:
+                    pass
+            t0 = time.perf_counter()
+            try:
+                book(user_id, club_id, waitlist_ok=False)
+                outcome = "ok"
+            except BookingError as be:
+                outcome = "full" if be.code == 409 else f"error:{be.msg}"
+            except Exception as exc:  # Lock-Konflikt nach allen Versuchen o. ä.
+                outcome = f"error:{type(exc).__name__}"
+            finally:
+                db.session.remove()
+            return outcome, time.perf_counter() - t0
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(worker, user_ids))
+    elapsed = time.perf_counter() - t_start
+
+    lat_ms = sorted(r[1] * 1000 for r in results)
+    outcomes: dict[str, int] = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    with app.app_context():
+        club = db.session.get(Club, club_id)
+        actual = db.session.execute(
+            select(func.count()).select_from(Enrollment)
+            .where(Enrollment.club_id == club_id, Enrollment.status.in_(SEAT_STATUSES))
+        ).scalar()
+        seats_taken, capacity = club.seats_taken, club.capacity
+        if not args.keep:
+            cleanup(club_id)
+
+    print(f"Anfragen:     {len(results)} mit {args.threads} Threads in {elapsed:.2f}s")
+    print(f"Durchsatz:    {len(results) / elapsed:.1f} Buchungen/s")
+    print(f"Latenz (ms):  p50={percentile(lat_ms, 50):.1f}  p95={percentile(lat_ms, 95):.1f}  "
+          f"p99={percentile(lat_ms, 99):.1f}  max={lat_ms[-1]:.1f}")
+    print(f"Ergebnisse:   {outcomes}")
+    print(f"Plätze:       seats_taken={seats_taken}  tatsächlich={actual}  capacity={capacity}")
+
+    ok = actual <= capacity and seats_taken == actual and outcomes.get("ok", 0) == actual
+    print("OK – keine Überbuchung." if ok else "FEHLER – Überbuchung oder Zählerdrift!")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# scripts/json_benchmark.py
+"""
+Benchmark: Serialisierung + Kompression einer Club-Liste (Default: 1.000 Clubs).
+
+Vergleicht den früheren Weg (Dict-Literal pro Club + stdlib json über
+flask.jsonify) mit services.serializers.club_serializer + FastJSONProvider
+und misst Bytes bzw. CPU-Zeit für gzip/Brotli (services/compression.py).
+Die Clubs werden nur im Speicher erzeugt, die DB wird nur für den
+Level-Katalog gebraucht.
+
+Aufruf (aus backend/, DB per .env bzw. DATABASE_URL):
+    python scripts/json_benchmark.py --clubs 1000 --rounds 50
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import create_app  # noqa: E402
+from models import Club  # noqa: E402
+from services.compression import available_encodings, compress  # noqa: E402
+from services.json_provider import FastJSONProvider  # noqa: E402
+from services.level_catalog import level_catalog  # noqa: E402
+from services.serializers import club_serializer  # noqa: E402
+
+
+def legacy_payload(club) -> dict:
+    """Stand vor services/serializers.py (routes/events_util.club_payload)."""
+    return {
+        "id": club.id,
+        "title": club.title,
+        "description": club.description,
+        "level_code": club.level_code,
+        "level_label": level_catalog.label(club.level_code),
+        "host_id": club.host_id,
+        "starts_at": club.starts_at.isoformat() if club.starts_at else None,
+        "duration_min": club.duration_min,
+        "capacity": club.capacity,
+        "price_cents": club.price_cents,
+        "currency": club.currency,
+        "status": club.status,
+        "categoryName": club.level_code,
+        "eventDate": club.starts_at.isoformat() if club.starts_at else None,
+        "price": club.price_cents / 100,
+    }
+
+
+def make_clubs(n: int) -> list[Club]:
+    levels = level_catalog.codes() or ["A2.1"]
+    start = dt.datetime(2030, 1, 1, 18, 0)
+    return [
+        Club(id=i + 1, title=f"Sprachclub Nr. {i + 1} – Alltag & Grammatik",
+             description="Wir üben Gespräche über Alltag, Reisen und Beruf. " * 3,
+             level_code=levels[i % len(levels)], host_id=1 + i % 50,
+             starts_at=start + dt.timedelta(hours=i), duration_min=60,
+             capacity=12, price_cents=1500 + i % 7 * 100, currency="EUR", status="SCHEDULED")
+        for i in range(n)
+    ]
+
+
+def cpu_ms(fn, rounds: int) -> tuple[float, object]:
+    result = None
+    t0 = time.process_time()
+    for _ in range(rounds):
+        result = fn()
+    return (time.process_time() - t0) * 1000 / rounds, result
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--clubs", type=int, default=1000)
+    ap.add_argument("--rounds", type=int, default=50)
+    args = ap.parse_args()
+
+    app = create_app()
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    with app.app_context():
+        clubs = make_clubs(args.clubs)
+        doc = lambda payloads: {"events": payloads, "next_cursor": None}  # noqa: E731
+
+        old_ms, old_body = cpu_ms(lambda: stdlib.dumps(doc([legacy_payload(c) for c in clubs])), args.rounds)
+        new_ms, new_body = cpu_ms(lambda: fast.dumps(doc(club_serializer.many(clubs))), args.rounds)
+        ser_old_ms, _ = cpu_ms(lambda: [legacy_payload(c) for c in clubs], args.rounds)
+        ser_new_ms, _ = cpu_ms(lambda: club_serializer.many(clubs), args.rounds)
+
+    old_bytes, new_bytes = old_body.encode("utf-8"), new_body.encode("utf-8")
+    print(f"{args.clubs} Clubs, {args.rounds} Runden, JSON-Backend: {fast.backend}")
+    print(f"{'Schritt':<36}{'CPU ms':>10}{'Bytes':>12}")
+    print(f"{'Dicts bauen (alt)':<36}{ser_old_ms:>10.2f}{'':>12}")
+    print(f"{'Dicts bauen (club_serializer)':<36}{ser_new_ms:>10.2f}{'':>12}")
+    print(f"{'Dicts + JSON (alt, stdlib)':<36}{old_ms:>10.2f}{len(old_bytes):>12,}")
+    print(f"{'Dicts + JSON (neu)':<36}{new_ms:>10.2f}{len(new_bytes):>12,}")
+    for encoding in available_encodings():
+        enc_ms, packed = cpu_ms(lambda: compress(new_bytes, encoding), args.rounds)
+        saved = 100 * (1 - len(packed) / len(new_bytes))
+        print(f"{'+ ' + encoding:<36}{enc_ms:>10.2f}{len(packed):>12,}   (-{saved:.0f} % Bytes)")
+    print(f"Serialisierung: {old_ms / new_ms:.1f}x schneller" if new_ms else "")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# scripts/query_budget_check.py
+"""
+Prüft die Query-Budgets (@query_budget) aller parameterlosen bzw. mit --club-id
+auflösbaren GET-Routen gegen die konfigurierte Datenbank.
+
+Jeder Aufruf läuft in services.query_guard.assert_max_queries(); bei einer
+Überschreitung werden alle Statements samt Aufrufstelle ausgegeben. Mit
+--identifier/--password werden zusätzlich die login-pflichtigen Routen geprüft.
+Exit-Code 1, falls ein Budget überschritten wurde.
+
+Aufruf (aus backend/, DB per .env bzw. DATABASE_URL):
+    python scripts/query_budget_check.py --club-id 1 --identifier host --password ...
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from services.query_guard import TooManyQueries, assert_max_queries, budget_for  # noqa: E402
+
+# Pflicht-Parameter einzelner Routen
+QUERY_ARGS = {"stats.club_stats_batch": "?ids={club_id}"}
+
+
+def budgeted_urls(app, club_id: int) -> list[tuple[str, str]]:
+    """[(endpoint, url)] für alle GET-Routen mit Budget, deren Parameter wir füllen können."""
+    urls = []
+    for rule in app.url_map.iter_rules():
+        if "GET" not in rule.methods or budget_for(rule.endpoint) is None:
+            continue
+        if rule.arguments - {"club_id"}:
+            continue  # z. B. Kalender-Token: nicht generisch befüllbar
+        url = rule.rule.replace("<int:club_id>", str(club_id))
+        urls.append((rule.endpoint, url + QUERY_ARGS.get(rule.endpoint, "").format(club_id=club_id)))
+    return sorted(urls, key=lambda x: x[1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--club-id", type=int, default=1)
+    ap.add_argument("--identifier", help="Login (Username oder E-Mail) für geschützte Routen")
+    ap.add_argument("--password")
+    ap.add_argument("--runs", type=int, default=2,
+                    help="Aufrufe pro Route (der erste füllt Caches, gezählt wird jeder)")
+    args = ap.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    if args.identifier:
+        r = client.post("/api/auth/login", json={"identifier": args.identifier, "password": args.password})
+        if r.status_code != 200:
+            print(f"Login fehlgeschlagen ({r.status_code}).")
+            return 1
+
+    failures = 0
+    with app.app_context():
+        urls = budgeted_urls(app, args.club_id)
+    for endpoint, url in urls:
+        for run in range(args.runs):
+            with app.app_context():
+                budget = budget_for(endpoint)
+                try:
+                    with assert_max_queries(budget, label=f"GET {url}") as query_log:
+                        resp = client.get(url)
+                        resp.get_data()  # gestreamte Antworten vollständig konsumieren
+                except TooManyQueries as exc:
+                    failures += 1
+                    print(f"FEHLER  {exc}")
+                    break
+            if run == args.runs - 1:
+                print(f"ok      GET {url:<40} {resp.status_code}  {query_log.counted()}/{budget} Queries")
+
+    print("OK – alle Budgets eingehalten." if not failures else f"FEHLER – {failures} Budget(s) überschritten!")
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
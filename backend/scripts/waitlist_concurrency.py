@@ -0,0 +1,118 @@
+# scripts/waitlist_concurrency.py
+"""
+Nebenläufigkeitstest für das Nachrücken von der Warteliste (services/waitlist.py).
+
+Legt einen Club mit --capacity Plätzen an, füllt ihn und reiht --waiting
+weitere User in die Warteliste ein. Danach stornieren --cancel Teilnehmer
+gleichzeitig (Barrier, --threads Worker) über services.booking.cancel().
+Geprüft wird:
+  - jeder freie Platz wurde genau einmal vergeben (kein doppeltes Nachrücken,
+    kein verlorener Platz): CONFIRMED == capacity, seats_taken == tatsächlich
+  - nachgerückt sind genau die ersten --cancel Einträge der Warteliste
+  - der Rest steht unverändert und in Reihenfolge auf der Warteliste
+Exit-Code 1 bei einer Verletzung.
+
+Aufruf (aus backend/, DB per .env bzw. DATABASE_URL; aussagekräftig nur mit MySQL):
+    python scripts/waitlist_concurrency.py --capacity 20 --waiting 40 --cancel 15 --threads 16
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import Club, Enrollment  # noqa: E402
+from services.booking import book, cancel  # noqa: E402
+from booking_loadtest import cleanup, setup  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--capacity", type=int, default=20)
+    ap.add_argument("--waiting", type=int, default=40)
+    ap.add_argument("--cancel", type=int, default=15)
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--keep", action="store_true", help="Testdaten nicht löschen")
+    args = ap.parse_args()
+    if args.cancel > args.capacity:
+        ap.error("--cancel darf nicht größer als --capacity sein")
+
+    app = create_app()
+    with app.app_context():
+        club_id, user_ids = setup(args.capacity + args.waiting, args.capacity)
+        seated = [book(uid, club_id, waitlist_ok=False) for uid in user_ids[:args.capacity]]
+        queued = [book(uid, club_id, waitlist_ok=True) for uid in user_ids[args.capacity:]]
+        to_cancel = [(e.user_id, e.id) for e in seated[:args.cancel]]
+        queue_order = [e.id for e in queued]
+        db.session.remove()
+
+    barrier = threading.Barrier(min(args.threads, len(to_cancel)))
+    started = threading.local()
+    errors: list[str] = []
+
+    def worker(item: tuple[int, int]) -> float:
+        user_id, enrollment_id = item
+        with app.app_context():
+            if not getattr(started, "done", False):
+                started.done = True
+                try:
+                    barrier.wait(timeout=30)
+                except threading.BrokenBarrierError:
+                    pass
+            t0 = time.perf_counter()
+            try:
+                cancel(user_id, enrollment_id)
+            except Exception as exc:  # Lock-Konflikt nach allen Versuchen o. ä.
+                errors.append(type(exc).__name__)
+            finally:
+                db.session.remove()
+            return time.perf_counter() - t0
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        lat = sorted(pool.map(worker, to_cancel))
+    elapsed = time.perf_counter() - t_start
+
+    with app.app_context():
+        rows = db.session.execute(
+            select(Enrollment.id, Enrollment.status)
+            .where(Enrollment.club_id == club_id)
+            .order_by(Enrollment.queued_at, Enrollment.id)
+        ).all()
+        club = db.session.get(Club, club_id)
+        seats_taken, capacity = club.seats_taken, club.capacity
+        if not args.keep:
+            cleanup(club_id)
+
+    status = {eid: st for eid, st in rows}
+    confirmed = sum(1 for st in status.values() if st == "CONFIRMED")
+    promoted = [eid for eid in queue_order if status.get(eid) == "CONFIRMED"]
+    still_waiting = [eid for eid, st in rows if st == "PENDING"]
+    expected_promoted = queue_order[:len(to_cancel)]
+
+    print(f"Stornos:      {len(to_cancel)} mit {args.threads} Threads in {elapsed:.2f}s "
+          f"(max {lat[-1] * 1000:.1f} ms), Fehler: {len(errors)} {sorted(set(errors))}")
+    print(f"Plätze:       seats_taken={seats_taken}  CONFIRMED={confirmed}  capacity={capacity}")
+    print(f"Warteliste:   nachgerückt={len(promoted)}  wartend={len(still_waiting)}")
+
+    ok = (
+        not errors
+        and confirmed == capacity == seats_taken
+        and promoted == expected_promoted
+        and still_waiting == queue_order[len(to_cancel):]
+    )
+    print("OK – jeder freie Platz genau einmal vergeben, Reihenfolge eingehalten."
+          if ok else "FEHLER – doppeltes/verlorenes Nachrücken oder falsche Reihenfolge!")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
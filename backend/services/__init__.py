@@ -0,0 +1,6 @@
+"""
+services-Paket:
+- Fachlogik, die von mehreren Blueprints genutzt wird (Suche, Buchung, Caches, ...).
+- Module werden direkt importiert (from services.club_search import ...),
+  es gibt bewusst keine Re-Exports, damit keine Zirkularität mit models entsteht.
+"""
@@ -0,0 +1,331 @@
+# services/assets.py
+"""
+Statische Assets mit Content-Hash (Build-Schritt + Auslieferung).
+
+- `flask assets build` kopiert alle Dateien aus static/ und die Rechtstexte aus
+  LEGAL_DIR (frontend/public/legal, im Manifest als legal/<datei>) als
+  <name>.<hash>.<ext> nach ASSET_BUILD_DIR, legt für komprimierbare Typen
+  vorkomprimierte .br-/.gz-Varianten daneben (nur wenn kleiner) und schreibt
+  manifest.json: logischer Pfad → gehashter Name, Varianten, build_id.
+- GET /assets/<gehashter Name>: Cache-Control "immutable" für ein Jahr; die
+  passende Variante laut Accept-Encoding wird direkt von der Platte gesendet
+  (keine Kompression pro Request, services/compression.py lässt sie in Ruhe).
+- asset_url("style.css") in Templates liefert die gehashte URL; ohne Manifest
+  (Entwicklung ohne Build) /static/style.css?v=<build_id>.
+- legal_file(): Pfad + ETag für /datenschutz, /impressum, /agb (app.py),
+  aus dem Build oder direkt aus LEGAL_DIR.
+- build_id = Hash über alle Asset-Hashes: ändert sich nur, wenn sich ein Asset
+  ändert, nicht bei jedem Neustart.
+"""
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import click
+from flask import abort, current_app, request, send_file, url_for
+from flask.cli import AppGroup
+
+from .compression import brotli
+
+MANIFEST_NAME = "manifest.json"
+HASH_LEN = 12
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# Varianten in Präferenzreihenfolge: Encoding → Dateiendung
+VARIANTS = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE_SUFFIXES = {".js", ".mjs", ".css", ".svg", ".html", ".json", ".txt", ".map", ".ics"}
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGAL_PREFIX = "legal/"
+
+
+def default_build_dir() -> str:
+    return os.getenv("ASSET_BUILD_DIR") or os.path.join(BACKEND_DIR, "build", "assets")
+
+
+def default_legal_dir() -> str:
+    # die PDFs liegen beim Frontend (Astro liefert public/ 1:1 aus)
+    return os.getenv("LEGAL_DIR") or os.path.join(os.path.dirname(BACKEND_DIR), "frontend", "public", "legal")
+
+
+@dataclass(frozen=True)
+class Asset:
+    path: str                     # gehashter Dateiname relativ zu ASSET_BUILD_DIR
+    hash: str
+    size: int
+    encodings: tuple[str, ...]    # vorhandene Varianten, z. B. ("br", "gzip")
+
+
+# ---------- Build ----------
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hashed_name(name: str, digest: str) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest[:HASH_LEN]}{ext}"
+
+
+def _write_variants(target: str, data: bytes) -> tuple[str, ...]:
+    """Legt .br/.gz neben target an, sofern kleiner als das Original; liefert die Encodings."""
+    encodings = []
+    for encoding, suffix in VARIANTS.items():
+        if encoding == "br":
+            if brotli is None:
+                continue
+            packed = brotli.compress(data, quality=11)
+        else:
+            packed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(packed) >= len(data):
+            continue
+        with open(target + suffix, "wb") as f:
+            f.write(packed)
+        encodings.append(encoding)
+    return tuple(encodings)
+
+
+def build_id_for(assets: dict[str, Asset]) -> str:
+    h = hashlib.sha256()
+    for name in sorted(assets):
+        h.update(f"{name}\0{assets[name].hash}\n".encode())
+    return h.hexdigest()[:HASH_LEN]
+
+
+def _walk(source_dir: str):
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for file_name in sorted(files):
+            if not file_name.startswith("."):
+                src = os.path.join(root, file_name)
+                yield src, os.path.relpath(src, source_dir).replace(os.sep, "/")
+
+
+def build_assets(sources: list[tuple[str, str]], build_dir: str) -> tuple[dict[str, Asset], str]:
+    """
+    Fingerprintet alle (Verzeichnis, Namenspräfix)-Quellen nach build_dir; fehlende
+    Verzeichnisse werden übersprungen, unveränderte Dateien nicht neu geschrieben.
+    """
+    assets: dict[str, Asset] = {}
+    os.makedirs(build_dir, exist_ok=True)
+    for source_dir, prefix in sources:
+        for src, rel in _walk(source_dir):
+            name = prefix + rel
+            digest = _file_hash(src)
+            hashed = _hashed_name(name, digest)
+            target = os.path.join(build_dir, hashed)
+
+            encodings: tuple[str, ...] = ()
+            compressible = os.path.splitext(name)[1].lower() in COMPRESSIBLE_SUFFIXES
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(src, target)
+                if compressible:
+                    with open(src, "rb") as f:
+                        encodings = _write_variants(target, f.read())
+            elif compressible:
+                encodings = tuple(enc for enc, suffix in VARIANTS.items() if os.path.exists(target + suffix))
+            assets[name] = Asset(hashed, digest, os.path.getsize(src), encodings)
+
+    build_id = build_id_for(assets)
+    manifest = {
+        "build_id": build_id,
+        "assets": {name: {"path": a.path, "hash": a.hash, "size": a.size, "encodings": list(a.encodings)}
+                   for name, a in assets.items()},
+    }
+    tmp = os.path.join(build_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    # atomar ersetzen: laufende Prozesse lesen nie ein halbes Manifest
+    os.replace(tmp, os.path.join(build_dir, MANIFEST_NAME))
+    return assets, build_id
+
+
+def prune_assets(build_dir: str, keep: dict[str, Asset]) -> int:
+    """Entfernt gehashte Dateien, die nicht im Manifest stehen (alte Builds); liefert die Anzahl."""
+    wanted = {MANIFEST_NAME}
+    for a in keep.values():
+        wanted.add(a.path)
+        wanted.update(a.path + VARIANTS[enc] for enc in a.encodings)
+    removed = 0
+    for root, _dirs, files in os.walk(build_dir):
+        for file_name in files:
+            rel = os.path.relpath(os.path.join(root, file_name), build_dir).replace(os.sep, "/")
+            if rel not in wanted:
+                os.remove(os.path.join(root, file_name))
+                removed += 1
+    return removed
+
+
+# ---------- Manifest zur Laufzeit ----------
+
+class AssetManifest:
+    """
+    Liest manifest.json; im Debug-Modus bei geändertem mtime neu (Build während
+    `flask run`), sonst einmal beim Start.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.build_dir = default_build_dir()
+        self.legal_dir = default_legal_dir()
+        self.auto_reload = False
+        self._assets: dict[str, Asset] = {}
+        self._by_path: dict[str, Asset] = {}
+        self.build_id: Optional[str] = None
+        self._mtime: Optional[float] = None
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.build_dir, MANIFEST_NAME)
+
+    def load(self) -> None:
+        path = self._manifest_path()
+        try:
+            mtime = os.stat(path).st_mtime
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            mtime, raw = None, {}
+        assets = {
+            name: Asset(a["path"], a["hash"], a["size"], tuple(a.get("encodings", ())))
+            for name, a in raw.get("assets", {}).items()
+        }
+        with self._lock:
+            self._assets = assets
+            self._by_path = {a.path: a for a in assets.values()}
+            self.build_id = raw.get("build_id")
+            self._mtime = mtime
+
+    def _maybe_reload(self) -> None:
+        if not self.auto_reload:
+            return
+        try:
+            mtime = os.stat(self._manifest_path()).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.load()
+
+    def get(self, name: str) -> Optional[Asset]:
+        self._maybe_reload()
+        return self._assets.get(name)
+
+    def by_path(self, path: str) -> Optional[Asset]:
+        self._maybe_reload()
+        return self._by_path.get(path)
+
+    def names(self) -> list[str]:
+        self._maybe_reload()
+        return sorted(self._assets)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+
+asset_manifest = AssetManifest()
+
+
+def asset_url(name: str) -> str:
+    """Gehashte URL für static/<name>; ohne Build die normale Static-URL mit ?v=build_id."""
+    asset = asset_manifest.get(name)
+    if asset is not None:
+        return url_for("assets", filename=asset.path)
+    return url_for("static", filename=name, v=current_app.config["BUILD_ID"])
+
+
+def legal_file(file_name: str) -> Optional[tuple[str, object]]:
+    """(Pfad, etag) für einen Rechtstext: gehashte Kopie aus dem Build, sonst LEGAL_DIR."""
+    asset = asset_manifest.get(LEGAL_PREFIX + file_name)
+    if asset is not None:
+        path, etag = os.path.join(asset_manifest.build_dir, asset.path), asset.hash[:HASH_LEN]
+    else:
+        path, etag = os.path.join(asset_manifest.legal_dir, file_name), True
+    return (path, etag) if os.path.isfile(path) else None
+
+
+def send_asset(filename: str):
+    """Response für /assets/<filename> (nur Dateien aus dem Manifest)."""
+    asset = asset_manifest.by_path(filename)
+    if asset is None:
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    path = os.path.join(asset_manifest.build_dir, asset.path)
+
+    encoding = None
+    for candidate in asset.encodings:
+        if request.accept_encodings[candidate] > 0:
+            encoding = candidate
+            break
+    if encoding is not None:
+        path += VARIANTS[encoding]
+
+    # ETag pro Variante, damit Caches die Kodierungen nicht vermischen
+    etag = asset.hash[:HASH_LEN] + (f"-{encoding}" if encoding else "")
+    resp = send_file(path, mimetype=mimetype, conditional=True, etag=etag, max_age=IMMUTABLE_MAX_AGE)
+    if encoding is not None:
+        resp.headers["Content-Encoding"] = encoding
+    if asset.encodings:
+        resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+def init_app(app) -> None:
+    asset_manifest.build_dir = app.config.get("ASSET_BUILD_DIR") or default_build_dir()
+    asset_manifest.legal_dir = app.config.get("LEGAL_DIR") or default_legal_dir()
+    asset_manifest.auto_reload = app.debug
+    asset_manifest.load()
+    # BUILD_ID aus der Umgebung hat Vorrang (z. B. Git-Commit), sonst aus dem Manifest
+    app.config["BUILD_ID"] = os.getenv("BUILD_ID") or asset_manifest.build_id or "dev"
+
+    app.add_url_rule("/assets/<path:filename>", "assets", send_asset)
+    app.add_template_global(asset_url, "asset_url")
+
+    @app.context_processor
+    def _inject_build_id():
+        return {"build_id": app.config["BUILD_ID"]}
+
+
+# ---------- CLI ----------
+
+assets_cli = AppGroup("assets", help="Statische Assets mit Content-Hash (build/assets).")
+
+
+@assets_cli.command("build")
+@click.option("--prune/--no-prune", default=False,
+              help="Dateien älterer Builds entfernen (erst wenn keine alte Seite mehr sie referenziert).")
+def build_command(prune: bool):
+    build_dir = asset_manifest.build_dir
+    sources = [(current_app.static_folder, ""), (asset_manifest.legal_dir, LEGAL_PREFIX)]
+    assets, build_id = build_assets(sources, build_dir)
+    compressed = sum(1 for a in assets.values() if a.encodings)
+    legal = sum(1 for name in assets if name.startswith(LEGAL_PREFIX))
+    click.echo(f"{len(assets)} Asset(s) nach {build_dir} ({compressed} vorkomprimiert, "
+               f"{legal} Rechtstext(e)), build_id={build_id}.")
+    if not legal:
+        click.echo(f"Hinweis: keine Rechtstexte in {asset_manifest.legal_dir} (LEGAL_DIR).")
+    if brotli is None:
+        click.echo("Hinweis: Brotli nicht installiert, nur .gz-Varianten.")
+    if prune:
+        click.echo(f"{prune_assets(build_dir, assets)} alte Datei(en) entfernt.")
+    asset_manifest.load()
+
+
+@assets_cli.command("list")
+def list_command():
+    for name in asset_manifest.names():
+        a = asset_manifest.get(name)
+        click.echo(f"{name:<40} → {a.path:<50} {a.size:>9,} B  {','.join(a.encodings) or '-'}")
+    click.echo(f"build_id: {asset_manifest.build_id or '-'} ({len(asset_manifest)} Asset(s))")
@@ -0,0 +1,345 @@
+# services/audit.py
+"""
+Enrollment-Audit auf App-Ebene (ersetzt die trg_enrollment_*_audit-Trigger).
+
+- Statuswechsel werden pro Flush erfasst (on_transitions), nach dem Flush mit
+  den vergebenen IDs aufgelöst und erst nach COMMIT an den AuditWriter übergeben;
+  ein Rollback verwirft sie. Die Buchungstransaktion schreibt damit nichts mehr
+  in enrollment_audit und hält ihre Sperren kürzer.
+- AuditWriter: Queue + Hintergrund-Thread, schreibt gesammelt per Multi-Row-INSERT
+  (AUDIT_BATCH_SIZE Zeilen bzw. spätestens alle AUDIT_FLUSH_MS). Beim Beenden
+  (atexit) wird die Queue synchron geleert; ist sie voll, schreibt der Aufrufer selbst.
+- AUDIT_ASYNC=0: Audit-Zeilen wie früher synchron in derselben Transaktion.
+- `flask audit partitions|ensure-partitions|drop-partitions`: Monatspartitionen
+  (nur MySQL) – Retention per DROP PARTITION statt DELETE.
+"""
+from __future__ import annotations
+import atexit
+import datetime as dt
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import EnrollmentAudit
+from .enrollment_events import Transition, on_transitions
+
+log = logging.getLogger(__name__)
+
+audit = EnrollmentAudit.__table__
+
+PENDING_KEY = "audit_pending"   # session.info: vor dem Flush erfasst (IDs evtl. noch offen)
+ROWS_KEY = "audit_rows"         # session.info: fertige Zeilen, warten auf COMMIT
+
+
+def _async_enabled() -> bool:
+    return os.getenv("AUDIT_ASYNC", "1") == "1"
+
+
+# ---------- Writer ----------
+
+class AuditWriter:
+    def __init__(self) -> None:
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.batch_size = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+        self.flush_interval_s = int(os.getenv("AUDIT_FLUSH_MS", "200")) / 1000
+        self.max_retries = int(os.getenv("AUDIT_MAX_RETRIES", "5"))
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def init_app(self, app) -> None:
+        with app.app_context():
+            self.engine = db.engine
+
+    def _ensure(self) -> None:
+        # Lazy + pro Prozess: Threads überleben kein fork() (gunicorn --preload)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=int(os.getenv("AUDIT_QUEUE_SIZE", "10000")))
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def enqueue(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        self._ensure()
+        overflow: list[dict] = []
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                overflow.append(row)
+        if overflow:
+            # Backpressure statt Datenverlust: der Aufrufer schreibt selbst
+            self._write(overflow)
+
+    def _drain(self, first: Optional[dict] = None) -> list[dict]:
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def _write(self, rows: list[dict]) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with self.engine.begin() as conn:
+                    write_rows(conn, rows)
+                with self._lock:
+                    self.written += len(rows)
+                    self.batches += 1
+                return
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                if attempt == self.max_retries:
+                    break
+                time.sleep(min(0.05 * 2 ** attempt, 2.0))
+        with self._lock:
+            self.dropped += len(rows)
+        log.exception("Audit-Batch (%d Zeilen) nicht geschrieben: %r", len(rows), rows)
+
+    def flush(self) -> None:
+        """Queue synchron leeren (Shutdown, CLI, Tests)."""
+        if self._pid != os.getpid() or self._queue is None:
+            return
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self) -> None:
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval_s * 2 + 1)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "written": self.written,
+                "batches": self.batches,
+                "failures": self.failures,
+                "dropped": self.dropped,
+            }
+
+
+audit_writer = AuditWriter()
+atexit.register(audit_writer.close)
+
+
+def write_rows(conn: Connection, rows: list[dict]) -> None:
+    # executemany → PyMySQL fasst das zu einem Multi-Row-INSERT zusammen
+    conn.execute(insert(audit), rows)
+
+
+def write_or_defer(conn: Connection, rows: list[dict]) -> list[dict]:
+    """
+    Für Bulk-Pfade ohne ORM-Flush (z. B. services/lifecycle.py): bei AUDIT_ASYNC=0
+    sofort in der Transaktion des Aufrufers schreiben, sonst die Zeilen
+    zurückgeben – der Aufrufer übergibt sie nach COMMIT an audit_writer.enqueue().
+    """
+    if _async_enabled() and audit_writer.engine is not None:
+        return rows
+    if rows:
+        write_rows(conn, rows)
+    return []
+
+
+# ---------- Erfassung (Session-Events) ----------
+
+@on_transitions
+def _capture(session: Session, _conn, transitions: list[Transition]) -> None:
+    # UTC wie clubs.starts_at/queued_at (Vorlaufzeiten in services/host_analytics.py)
+    now = dt.datetime.utcnow().replace(microsecond=0)
+    per_enrollment: dict[int, list[Transition]] = {}
+    for t in transitions:
+        per_enrollment.setdefault(id(t.enrollment), []).append(t)
+
+    pending = session.info.setdefault(PENDING_KEY, [])
+    for ts in per_enrollment.values():
+        enr = ts[0].enrollment
+        old_status, new_status = ts[0].old_status, ts[-1].new_status
+        if enr in session.new:
+            action = "INSERT"
+        elif enr in session.deleted:
+            action = "DELETE"
+        elif old_status != new_status:
+            action = "UPDATE"
+        else:
+            continue  # nur Club gewechselt, Status gleich
+        pending.append((enr, action, old_status, new_status, enr.user_id, enr.club_id, now))
+
+
+@event.listens_for(Session, "after_flush")
+def _resolve(session: Session, _flush_context) -> None:
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    rows = [
+        {"enrollment_id": enr.id, "club_id": club_id, "action": action, "old_status": old,
+         "new_status": new, "changed_by": user_id, "changed_at": changed_at}
+        for enr, action, old, new, user_id, club_id, changed_at in pending
+    ]
+    if _async_enabled() and audit_writer.engine is not None:
+        session.info.setdefault(ROWS_KEY, []).extend(rows)
+    else:
+        write_rows(session.connection(), rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue(session: Session) -> None:
+    rows = session.info.pop(ROWS_KEY, None)
+    if rows:
+        audit_writer.enqueue(rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard(session: Session, transaction) -> None:
+    # Rollback/close der äußeren Transaktion: nicht committete Zeilen verwerfen
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
+        session.info.pop(ROWS_KEY, None)
+
+
+# ---------- Partitionen (MySQL) ----------
+
+def _month_start(d: dt.date) -> dt.date:
+    return d.replace(day=1)
+
+
+def add_months(d: dt.date, n: int) -> dt.date:
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return dt.date(y, m + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_def(month: dt.date) -> str:
+    upper = add_months(month, 1)
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{upper.isoformat()}'))"
+
+
+def month_range(first: dt.date, last: dt.date) -> list[dt.date]:
+    months, m = [], _month_start(first)
+    while m <= last:
+        months.append(m)
+        m = add_months(m, 1)
+    return months
+
+
+def list_partitions(conn: Connection) -> list[str]:
+    return list(conn.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'enrollment_audit' "
+        "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+    )).scalars())
+
+
+def _partition_month(name: str) -> Optional[dt.date]:
+    try:
+        return dt.datetime.strptime(name, "p%Y%m").date()
+    except ValueError:
+        return None   # pmax
+
+
+def ensure_partitions(conn: Connection, *, ahead: int = 3, today: Optional[dt.date] = None) -> list[str]:
+    """Monatspartitionen bis `ahead` Monate in die Zukunft aus pmax abspalten."""
+    today = today or dt.datetime.utcnow().date()
+    names = list_partitions(conn)
+    if not names:
+        raise click.ClickException("enrollment_audit ist nicht partitioniert (Migration 0005 fehlt?).")
+    existing = [m for m in map(_partition_month, names) if m]
+    start = add_months(max(existing), 1) if existing else _month_start(today)
+    months = month_range(start, add_months(today, ahead))
+    if not months:
+        return []
+    parts = ", ".join([partition_def(m) for m in months] + ["PARTITION pmax VALUES LESS THAN MAXVALUE"])
+    conn.exec_driver_sql(f"ALTER TABLE enrollment_audit REORGANIZE PARTITION pmax INTO ({parts})")
+    return [partition_name(m) for m in months]
+
+
+def drop_partitions(conn: Connection, *, keep_months: int, today: Optional[dt.date] = None) -> list[str]:
+    """Partitionen löschen, die vollständig älter als `keep_months` Monate sind."""
+    cutoff = add_months(_month_start(today or dt.datetime.utcnow().date()), -keep_months)
+    old = [name for name in list_partitions(conn)
+           if (m := _partition_month(name)) is not None and m < cutoff]
+    if old:
+        conn.exec_driver_sql(f"ALTER TABLE enrollment_audit DROP PARTITION {', '.join(old)}")
+    return old
+
+
+# ---------- CLI ----------
+
+audit_cli = AppGroup("audit", help="Enrollment-Audit: Writer und Monatspartitionen.")
+
+
+def _mysql_only() -> None:
+    if db.engine.dialect.name != "mysql":
+        raise click.ClickException("Partitionen gibt es nur auf MySQL.")
+
+
+@audit_cli.command("partitions")
+def partitions_command():
+    _mysql_only()
+    with db.engine.connect() as conn:
+        for name in list_partitions(conn):
+            click.echo(name)
+
+
+@audit_cli.command("ensure-partitions")
+@click.option("--ahead", default=3, show_default=True, help="Monate im Voraus anlegen.")
+def ensure_partitions_command(ahead: int):
+    _mysql_only()
+    with db.engine.begin() as conn:
+        added = ensure_partitions(conn, ahead=ahead)
+    click.echo(f"{len(added)} Partition(en) angelegt: {', '.join(added) or '-'}")
+
+
+@audit_cli.command("drop-partitions")
+@click.option("--keep-months", type=int, required=True, help="So viele Monate (plus laufenden) behalten.")
+@click.option("--yes", is_flag=True, help="Ohne Rückfrage löschen.")
+def drop_partitions_command(keep_months: int, yes: bool):
+    _mysql_only()
+    if not yes:
+        click.confirm(f"Audit-Partitionen älter als {keep_months} Monate löschen?", abort=True)
+    with db.engine.begin() as conn:
+        dropped = drop_partitions(conn, keep_months=keep_months)
+    click.echo(f"{len(dropped)} Partition(en) gelöscht: {', '.join(dropped) or '-'}")
@@ -0,0 +1,149 @@
+# services/booking.py
+"""
+Buchungslogik auf Basis von Enrollment.
+
+Sperrreihenfolge ist in jedem Pfad gleich: erst die Club-Zeile (bedingter
+seats_taken-Update im before_flush, siehe services/seats.py), danach die
+Enrollment-Zeile. Dadurch gibt es zwischen Buchen und Stornieren keine
+Lock-Zyklen; verbleibende Lock-Konflikte (Lock-Wait-Timeout, Deadlock,
+SQLite "database is locked") werden mit begrenzter Anzahl Versuchen und
+Jitter-Backoff wiederholt.
+
+Warteliste (BOOKING_WAITLIST=1, pro Anfrage übersteuerbar): ist der Club voll,
+wird die Buchung in einer neuen Transaktion als PENDING eingereiht statt
+abgelehnt; beim Storno rückt der Kopf der Warteliste nach (services/waitlist.py).
+Die Einreihung sperrt zuerst die Club-Zeile und prüft den Platz erneut: ist
+zwischen beiden Versuchen ein Platz frei geworden, wird direkt bestätigt statt
+neben einem leeren Platz zu warten.
+"""
+from __future__ import annotations
+import os
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from extensions import db
+from models import Club, Enrollment
+from models.club.enrollment_model import SEAT_STATUSES, WAITLIST_STATUS
+from . import waitlist
+from .seats import ClubFullError, FULL_MESSAGE, lock_club
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = int(os.getenv("BOOKING_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_S = float(os.getenv("BOOKING_BACKOFF_BASE_MS", "10")) / 1000
+WAITLIST_ENABLED = os.getenv("BOOKING_WAITLIST", "1") == "1"
+
+# MySQL/MariaDB: 1205 = Lock wait timeout, 1213 = Deadlock
+RETRYABLE_MYSQL_CODES = {1205, 1213}
+
+
+class BookingError(Exception):
+    def __init__(self, msg: str, code: int = 409):
+        super().__init__(msg)
+        self.msg = msg
+        self.code = code
+
+
+def _is_retryable(exc: OperationalError) -> bool:
+    orig = getattr(exc, "orig", None)
+    args = getattr(orig, "args", ())
+    if args and args[0] in RETRYABLE_MYSQL_CODES:
+        return True
+    return "database is locked" in str(orig)
+
+
+def run_in_transaction(fn: Callable[[], T], *, attempts: int = MAX_ATTEMPTS) -> T:
+    """Führt fn() aus und committet; wiederholt bei Lock-Konflikten (begrenzt)."""
+    for attempt in range(1, attempts + 1):
+        try:
+            result = fn()
+            db.session.commit()
+            return result
+        except OperationalError as exc:
+            db.session.rollback()
+            if attempt == attempts or not _is_retryable(exc):
+                raise
+            time.sleep(random.uniform(0, BACKOFF_BASE_S * (2 ** attempt)))
+        except Exception:
+            db.session.rollback()
+            raise
+    raise AssertionError("unreachable")
+
+
+# ---------- Buchen ----------
+
+def book(user_id: int, club_id: int, *, waitlist_ok: Optional[bool] = None) -> Enrollment:
+    """Bucht einen Platz; bei vollem Club Eintrag in die Warteliste (falls erlaubt)."""
+    if waitlist_ok is None:
+        waitlist_ok = WAITLIST_ENABLED
+    try:
+        return run_in_transaction(lambda: _book_attempt(user_id, club_id, queue=False))
+    except ClubFullError:
+        if not waitlist_ok:
+            raise BookingError(FULL_MESSAGE, 409)
+    # Platz reicht nicht: neue Transaktion unter Club-Sperre, reiht ein oder bestätigt
+    try:
+        return run_in_transaction(lambda: _book_attempt(user_id, club_id, queue=True))
+    except ClubFullError:
+        raise BookingError(FULL_MESSAGE, 409)
+
+
+def _book_attempt(user_id: int, club_id: int, *, queue: bool) -> Enrollment:
+    if queue:
+        # Sperre vor dem Lesen (gleiche Reihenfolge wie beim Storno: Club, dann Enrollment)
+        seats = lock_club(db.session.connection(), club_id)
+        queue = seats is not None and seats[0] >= seats[1]
+    club_status = db.session.execute(
+        select(Club.status).where(Club.id == club_id)
+    ).scalar()
+    if club_status is None:
+        raise BookingError("Club nicht gefunden.", 404)
+    if club_status != "SCHEDULED":
+        raise BookingError("Dieser Sprachclub ist nicht buchbar.", 409)
+
+    # uq_enrollments_user_club: frühere (stornierte) Buchung wird reaktiviert
+    enr = Enrollment.query.filter_by(user_id=user_id, club_id=club_id).first()
+    if enr is not None and enr.status in SEAT_STATUSES:
+        raise BookingError("Bereits gebucht.", 409)
+    if enr is not None and enr.status == WAITLIST_STATUS:
+        raise BookingError("Bereits auf der Warteliste.", 409)
+    if enr is None:
+        enr = Enrollment(user_id=user_id, club_id=club_id)
+        db.session.add(enr)
+    if queue:
+        waitlist.enqueue(enr)
+    else:
+        enr.status = "CONFIRMED"
+        enr.queued_at = None
+
+    try:
+        # ClubFullError geht an book(): Rollback, ggf. zweiter Versuch als Warteliste
+        db.session.flush()
+    except IntegrityError:
+        # paralleler Doppelklick desselben Users
+        raise BookingError("Bereits gebucht.", 409)
+    return enr
+
+
+# ---------- Stornieren ----------
+
+def cancel(user_id: int, enrollment_id: int) -> Enrollment:
+    def attempt() -> Enrollment:
+        enr = Enrollment.query.filter_by(id=enrollment_id, user_id=user_id).first()
+        if enr is None:
+            raise BookingError("Buchung nicht gefunden.", 404)
+        if enr.status in ("ATTENDED", "NO_SHOW"):
+            raise BookingError("Vergangene Buchungen können nicht storniert werden.", 409)
+        if enr.status != "CANCELLED":
+            # gibt der Storno einen Platz frei, rückt im selben Flush der Kopf
+            # der Warteliste nach (services/waitlist.py)
+            enr.status = "CANCELLED"
+            enr.queued_at = None
+            db.session.flush()
+        return enr
+
+    return run_in_transaction(attempt)
@@ -0,0 +1,89 @@
+# services/bootstrap.py
+"""
+Sitzungsdaten für einen Seitenaufbau in einer Antwort (GET /api/bootstrap).
+
+Ersetzt /api/auth/me + /eventdata/wishlist?fields=ids + Buchungen aus
+localStorage + /api/levels:
+- user: aus dem prozessweiten User-Cache (services/user_cache.py), meist ohne Query
+- wishlist: Club-Ids über den PK (user_id, club_id) der wishlists
+- bookings / waitlist: {club_id: enrollment_id} aktiver Buchungen (CONFIRMED bzw.
+  PENDING in geplanten Clubs) über uq_enrollments_user_club + clubs-PK
+- levels: Level-Katalog aus dem Speicher
+
+Der ETag setzt sich aus Versionszählern zusammen (eine PK-Abfrage auf
+cache_versions); ein wiederholter Seitenaufbau kostet damit eine Query und 304.
+"""
+from __future__ import annotations
+from typing import Optional
+
+from sqlalchemy import select
+
+from extensions import db
+from models import Club, Enrollment
+from models.club.enrollment_model import WAITLIST_STATUS
+from . import versions
+from .calendar_feed import enrollments_key
+from .http_cache import CLUBS_VERSION_KEY, make_etag
+from .level_catalog import level_catalog
+from .serializers import user_serializer
+from .wishlist import version_key as wishlist_key, wishlist_ids
+
+clubs = Club.__table__
+enrollments = Enrollment.__table__
+
+ACTIVE_STATUSES = ("CONFIRMED", WAITLIST_STATUS)
+
+
+def session_state(user) -> tuple:
+    """ETag-Bestandteile; None-User (anonym) braucht keine Query."""
+    if user is None:
+        return ("anon", level_catalog.current_version())
+    found = versions.get_versions([wishlist_key(user.id), enrollments_key(user.id), CLUBS_VERSION_KEY])
+    return (
+        user.id,
+        # Profiländerungen (PATCH /api/auth/me) zählen keine Version hoch
+        make_etag(*user_serializer(user).values()),
+        found[wishlist_key(user.id)],
+        found[enrollments_key(user.id)],
+        found[CLUBS_VERSION_KEY],
+        level_catalog.current_version(),
+    )
+
+
+def active_bookings(user_id: int) -> tuple[dict[int, int], dict[int, int]]:
+    """({club_id: enrollment_id} gebucht, {club_id: enrollment_id} auf der Warteliste)"""
+    rows = db.session.execute(
+        select(enrollments.c.club_id, enrollments.c.id, enrollments.c.status)
+        .join(clubs, clubs.c.id == enrollments.c.club_id)
+        .where(
+            enrollments.c.user_id == user_id,
+            enrollments.c.status.in_(ACTIVE_STATUSES),
+            clubs.c.status == "SCHEDULED",
+        )
+    ).all()
+    booked, waiting = {}, {}
+    for club_id, enrollment_id, status in rows:
+        (waiting if status == WAITLIST_STATUS else booked)[club_id] = enrollment_id
+    return booked, waiting
+
+
+def bootstrap_payload(user: Optional[object]) -> dict:
+    payload = {
+        "user": None,
+        "wishlist": [],
+        "bookings": {},
+        "waitlist": {},
+        "levels": level_catalog.as_list(),
+        "levels_version": level_catalog.version,
+    }
+    if user is None:
+        return payload
+    booked, waiting = active_bookings(user.id)
+    payload.update(
+        user=user_serializer(user),
+        wishlist=wishlist_ids(user.id),
+        # JSON-Objekte haben String-Keys
+        bookings={str(k): v for k, v in booked.items()},
+        waitlist={str(k): v for k, v in waiting.items()},
+    )
+    return payload
@@ -0,0 +1,290 @@
+# services/calendar_feed.py
+"""
+iCalendar-Feed (RFC 5545) der gebuchten Clubs eines Users.
+
+- Zugriff über ein signiertes Token (itsdangerous, kein Login nötig, damit
+  Kalender-Apps abonnieren können); "calendar-token:<user_id>" rotiert es.
+- Der Feed wird als Generator gestreamt (yield_per über Enrollment JOIN Club)
+  und dabei für den nächsten Abruf gepuffert.
+- Prozessweiter Cache pro User. Gültig, solange
+    "enrollments:<user_id>" gleich bleibt (wird bei jedem Statuswechsel eines
+    Enrollments dieses Users in derselben Transaktion erhöht) und
+    die Clubs im Feed unverändert sind (nur wenn sich die globale Version
+    "clubs" geändert hat, werden die Feed-Spalten dieser Clubs per PK gelesen
+    und ihr Digest verglichen; updated_at allein hat nur Sekundenauflösung).
+  Ein Abruf ohne Änderung kostet damit eine Abfrage auf cache_versions.
+"""
+from __future__ import annotations
+import datetime as dt
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Iterator, Optional
+
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club, Enrollment
+from . import versions
+from .enrollment_events import Transition, on_transitions
+from .http_cache import CLUBS_VERSION_KEY
+from .level_catalog import level_catalog
+
+FEED_STATUSES = ("PENDING", "CONFIRMED", "ATTENDED")
+# ältere Termine fallen aus dem Feed (begrenzt die Größe für Langzeit-User)
+PAST_DAYS = int(os.getenv("CALENDAR_PAST_DAYS", "90"))
+TOKEN_SALT = "calendar-feed"
+PRODID = "-//Sprachclub//Kalender//DE"
+
+
+def enrollments_key(user_id: int) -> str:
+    return f"enrollments:{user_id}"
+
+
+def token_key(user_id: int) -> str:
+    return f"calendar-token:{user_id}"
+
+
+# ---------- Invalidierung ----------
+
+@on_transitions
+def _bump_user_versions(_session: Session, conn, transitions: list[Transition]) -> None:
+    # feste Reihenfolge → gleiche Sperrreihenfolge über parallele Transaktionen
+    for user_id in sorted({t.enrollment.user_id for t in transitions}):
+        versions.bump(enrollments_key(user_id), conn)
+
+
+# ---------- Token ----------
+
+def _serializer(secret_key: str) -> URLSafeSerializer:
+    return URLSafeSerializer(secret_key, salt=TOKEN_SALT)
+
+
+def make_token(secret_key: str, user_id: int) -> str:
+    return _serializer(secret_key).dumps([user_id, versions.get_version(token_key(user_id))])
+
+
+def read_token(secret_key: str, token: str) -> Optional[tuple[int, int]]:
+    """(user_id, token_version) oder None bei ungültiger Signatur."""
+    try:
+        user_id, token_version = _serializer(secret_key).loads(token)
+        return int(user_id), int(token_version)
+    except (BadSignature, TypeError, ValueError):
+        return None
+
+
+# ---------- iCalendar ----------
+
+def _escape(text: str) -> str:
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Zeilen > 75 Oktette falten (RFC 5545, 3.1), ohne UTF-8-Zeichen zu zerteilen."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, current, size = [], [], 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > (75 if not parts else 74):
+            parts.append("".join(current))
+            current, size = [], 0
+        current.append(ch)
+        size += n
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc(ts: dt.datetime) -> str:
+    # clubs.starts_at wird als UTC gespeichert (db/create.sql)
+    return ts.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _vevent(row) -> str:
+    end = row.starts_at + dt.timedelta(minutes=row.duration_min)
+    description = level_catalog.label(row.level_code) or row.level_code
+    if row.meeting_url:
+        description += f"\n{row.meeting_url}"
+    if row.club_status == "CANCELED":
+        status = "CANCELLED"
+    elif row.status == "PENDING":
+        status = "TENTATIVE"
+    else:
+        status = "CONFIRMED"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:enrollment-{row.enrollment_id}@sprachclub",
+        f"DTSTAMP:{_utc(row.updated_at)}",
+        f"DTSTART:{_utc(row.starts_at)}",
+        f"DTEND:{_utc(end)}",
+        f"SUMMARY:{_escape(row.title)}",
+        f"DESCRIPTION:{_escape(description)}",
+        f"LOCATION:{_escape(row.meeting_url or 'Online')}",
+        f"STATUS:{status}",
+    ]
+    if row.meeting_url:
+        lines.append(f"URL:{row.meeting_url}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def _header() -> str:
+    return "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH", "X-WR-CALNAME:Sprachclub", "X-PUBLISHED-TTL:PT1H",
+    ))
+
+
+def _rows(user_id: int):
+    since = dt.datetime.utcnow() - dt.timedelta(days=PAST_DAYS)
+    stmt = (
+        select(
+            Enrollment.id.label("enrollment_id"), Enrollment.status,
+            Club.id.label("club_id"), Club.title, Club.starts_at, Club.duration_min,
+            Club.meeting_url, Club.level_code, Club.status.label("club_status"), Club.updated_at,
+        )
+        .join(Club, Club.id == Enrollment.club_id)
+        .where(Enrollment.user_id == user_id, Enrollment.status.in_(FEED_STATUSES),
+               Club.starts_at >= since)
+        .order_by(Club.starts_at, Enrollment.id)
+        .execution_options(yield_per=200)
+    )
+    return db.session.execute(stmt)
+
+
+# ---------- Cache ----------
+
+@dataclass(frozen=True)
+class FeedEntry:
+    enroll_version: int
+    clubs_version: int
+    club_ids: tuple[int, ...]
+    clubs_digest: str
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return hashlib.blake2b(self.body, digest_size=12).hexdigest()
+
+
+class FeedCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict[int, FeedEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[FeedEntry]:
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is not None:
+                self._data.move_to_end(user_id)
+            return entry
+
+    def put(self, user_id: int, entry: FeedEntry) -> None:
+        with self._lock:
+            self._data[user_id] = entry
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def record(self, *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+feed_cache = FeedCache(int(os.getenv("CALENDAR_CACHE_SIZE", "5000")))
+
+
+_CLUB_COLUMNS = (Club.id, Club.title, Club.starts_at, Club.duration_min, Club.meeting_url,
+                 Club.level_code, Club.status, Club.updated_at)
+
+
+def _digest_row(h, row) -> None:
+    h.update("\x1f".join(map(str, row)).encode("utf-8"))
+    h.update(b"\x1e")
+
+
+def _clubs_digest(club_ids: tuple[int, ...]) -> str:
+    """Digest der Feed-Spalten der gegebenen Clubs (PK-Lookup, nach id sortiert)."""
+    h = hashlib.blake2b(digest_size=16)
+    if club_ids:
+        for row in db.session.execute(
+            select(*_CLUB_COLUMNS).where(Club.id.in_(club_ids)).order_by(Club.id)
+        ):
+            _digest_row(h, row)
+    return h.hexdigest()
+
+
+def cached_feed(user_id: int, enroll_version: int, clubs_version: int) -> Optional[FeedEntry]:
+    """Gültiger Cache-Eintrag oder None."""
+    entry = feed_cache.get(user_id)
+    if entry is None or entry.enroll_version != enroll_version:
+        return None
+    if entry.clubs_version != clubs_version:
+        # irgendein Club wurde geändert – betrifft es einen Club aus diesem Feed?
+        if _clubs_digest(entry.club_ids) != entry.clubs_digest:
+            return None
+        entry = replace(entry, clubs_version=clubs_version)
+        feed_cache.put(user_id, entry)
+    feed_cache.record(hit=True)
+    return entry
+
+
+def stream_feed(user_id: int, enroll_version: int, clubs_version: int) -> Iterator[bytes]:
+    """Erzeugt den Feed zeilenweise und legt ihn am Ende in den Cache."""
+    feed_cache.record(hit=False)
+    chunks: list[bytes] = []
+    club_rows: dict[int, tuple] = {}
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        chunks.append(data)
+        return data
+
+    yield emit(_header())
+    for row in _rows(user_id):
+        club_rows[row.club_id] = (row.club_id, row.title, row.starts_at, row.duration_min,
+                                  row.meeting_url, row.level_code, row.club_status, row.updated_at)
+        yield emit(_vevent(row))
+    yield emit("END:VCALENDAR\r\n")
+
+    digest = hashlib.blake2b(digest_size=16)
+    for club_id in sorted(club_rows):
+        _digest_row(digest, club_rows[club_id])
+    feed_cache.put(user_id, FeedEntry(
+        enroll_version=enroll_version,
+        clubs_version=clubs_version,
+        club_ids=tuple(sorted(club_rows)),
+        clubs_digest=digest.hexdigest(),
+        body=b"".join(chunks),
+    ))
+
+
+# ---------- Öffentliche API ----------
+
+def feed_versions(user_id: int) -> tuple[int, int, int]:
+    """(Token-Version, Enrollment-Version, Clubs-Version) in einer Abfrage."""
+    found = versions.get_versions([token_key(user_id), enrollments_key(user_id), CLUBS_VERSION_KEY])
+    return found[token_key(user_id)], found[enrollments_key(user_id)], found[CLUBS_VERSION_KEY]
+
+
+def rotate_token(user_id: int) -> None:
+    """Macht alle bisher ausgegebenen Feed-URLs dieses Users ungültig."""
+    versions.bump(token_key(user_id))
+    db.session.commit()
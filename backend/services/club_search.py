@@ -0,0 +1,118 @@
+# services/club_search.py
+from __future__ import annotations
+import base64
+import datetime as dt
+import heapq
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from sqlalchemy import select, or_, and_
+
+from extensions import db
+from models import Club
+from .level_catalog import level_catalog
+from .query_guard import bounded_fanout
+
+MAX_LIMIT = 100
+DEFAULT_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class ClubFilter:
+    status: str = "SCHEDULED"
+    levels: Sequence[str] = ()          # leer = alle Levels
+    starts_from: Optional[dt.datetime] = None   # inklusiv
+    starts_until: Optional[dt.datetime] = None  # exklusiv
+    min_price_cents: Optional[int] = None
+    max_price_cents: Optional[int] = None
+
+
+# ---------- Cursor (Keyset auf starts_at, id) ----------
+
+def encode_cursor(starts_at: dt.datetime, club_id: int) -> str:
+    raw = f"{starts_at.isoformat()}|{club_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    """Wirft ValueError bei manipulierten/kaputten Cursorn."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, id_raw = base64.urlsafe_b64decode(padded).decode("ascii").split("|", 1)
+        return dt.datetime.fromisoformat(ts_raw), int(id_raw)
+    except Exception as exc:
+        raise ValueError("cursor ungültig") from exc
+
+
+# ---------- Suche ----------
+
+def filter_clauses(f: ClubFilter, *, with_levels: bool = True) -> list:
+    """WHERE-Bedingungen eines ClubFilter (auch für die Volltextsuche, services/fulltext.py)."""
+    clauses = [Club.status == f.status]
+    if with_levels and f.levels:
+        clauses.append(Club.level_code.in_(list(f.levels)))
+    if f.starts_from is not None:
+        clauses.append(Club.starts_at >= f.starts_from)
+    if f.starts_until is not None:
+        clauses.append(Club.starts_at < f.starts_until)
+    # Preis ist nicht im Index → Residualfilter auf den ohnehin gelesenen Zeilen.
+    if f.min_price_cents is not None:
+        clauses.append(Club.price_cents >= f.min_price_cents)
+    if f.max_price_cents is not None:
+        clauses.append(Club.price_cents <= f.max_price_cents)
+    return clauses
+
+
+def _level_page(code: str, f: ClubFilter, after: Optional[tuple[dt.datetime, int]], limit: int):
+    """
+    Eine Keyset-Seite für genau ein Level.
+    status = ? AND level_code = ? AND starts_at-Range → reiner Range-Scan über
+    idx_clubs_search (status, level_code, starts_at); InnoDB hängt den PK an jeden
+    Sekundärindex, daher kommt ORDER BY starts_at, id ohne Filesort aus dem Index.
+    """
+    stmt = (
+        select(Club)
+        .with_hint(Club, "USE INDEX (idx_clubs_search)", "mysql")
+        .where(Club.level_code == code, *filter_clauses(f, with_levels=False))
+    )
+    if after is not None:
+        ts, last_id = after
+        # Redundantes starts_at >= ts hält die Bedingung für den Optimizer sargable.
+        stmt = stmt.where(
+            Club.starts_at >= ts,
+            or_(Club.starts_at > ts, and_(Club.starts_at == ts, Club.id > last_id)),
+        )
+
+    stmt = stmt.order_by(Club.starts_at, Club.id).limit(limit)
+    return db.session.execute(stmt).scalars().all()
+
+
+def search_clubs(f: ClubFilter, *, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None):
+    """
+    Liefert (clubs, next_cursor).
+    Ohne Level-Filter wird nicht über status allein gescannt (dann müsste MySQL
+    sortieren), sondern pro Level eine indexgestützte Seite geholt und per
+    heapq.merge zusammengeführt – Kosten: höchstens len(levels) * (limit + 1) Zeilen,
+    unabhängig von der Tabellengröße.
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    after = decode_cursor(cursor) if cursor else None
+    levels = list(f.levels) or level_catalog.codes()
+
+    # eine Seite pro Level – gewollt und durch die Level-Anzahl begrenzt
+    with bounded_fanout():
+        pages = [_level_page(code, f, after, limit + 1) for code in levels]
+    merged = heapq.merge(*pages, key=lambda c: (c.starts_at, c.id))
+
+    clubs = []
+    for club in merged:
+        clubs.append(club)
+        if len(clubs) > limit:
+            break
+
+    next_cursor = None
+    if len(clubs) > limit:
+        clubs = clubs[:limit]
+        last = clubs[-1]
+        next_cursor = encode_cursor(last.starts_at, last.id)
+    return clubs, next_cursor
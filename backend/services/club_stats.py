@@ -0,0 +1,149 @@
+# services/club_stats.py
+"""
+Materialisierte Enrollment-Statistik pro Club (Tabelle club_stats).
+
+- Pflege inkrementell bei jedem Statusübergang von Enrollment: ein Upsert pro
+  betroffenem Club und Flush, keine Aggregation über enrollments.
+- get_stats(): Stats für einen oder viele Clubs in einer PK-Abfrage
+  (clubs LEFT JOIN club_stats über club_id).
+- `flask club-stats rebuild` baut die Tabelle (Backfill/Drift) batchweise neu auf.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from typing import Iterable, Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club, ClubStats, Enrollment
+from .enrollment_events import Transition, on_transitions
+from .sql_util import upsert
+
+club_stats = ClubStats.__table__
+clubs = Club.__table__
+enrollments = Enrollment.__table__
+
+# Enrollment-Status → Spalte in club_stats
+STATUS_COLUMNS = {
+    "PENDING": "pending_count",
+    "CONFIRMED": "confirmed_count",
+    "CANCELLED": "cancelled_count",
+    "ATTENDED": "attended_count",
+    "NO_SHOW": "no_show_count",
+}
+COUNT_COLUMNS = tuple(STATUS_COLUMNS.values())
+
+
+# ---------- Inkrementelle Pflege ----------
+
+def apply_deltas(conn, club_id: int, deltas: dict[str, int]) -> None:
+    deltas = {col: d for col, d in deltas.items() if d}
+    if not deltas:
+        return
+    now = func.current_timestamp()
+    upsert(
+        conn,
+        club_stats,
+        {"club_id": club_id, **{col: max(d, 0) for col, d in deltas.items()}, "last_change_at": now},
+        {**{col: club_stats.c[col] + d for col, d in deltas.items()}, "last_change_at": now},
+    )
+
+
+@on_transitions
+def _sync_stats(_session: Session, conn, transitions: list[Transition]) -> None:
+    per_club: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for t in transitions:
+        if t.old_status is not None:
+            per_club[t.club_id][STATUS_COLUMNS[t.old_status]] -= 1
+        if t.new_status is not None:
+            per_club[t.club_id][STATUS_COLUMNS[t.new_status]] += 1
+    # feste Reihenfolge → gleiche Sperrreihenfolge über parallele Transaktionen
+    for club_id in sorted(per_club):
+        apply_deltas(conn, club_id, per_club[club_id])
+
+
+# ---------- Lesen ----------
+
+def _payload(row) -> dict:
+    counts = {col: (row[col] or 0) for col in COUNT_COLUMNS}
+    capacity = row["capacity"] or 0
+    return {
+        "club_id": row["id"],
+        "capacity": capacity,
+        **counts,
+        # wie früher v_club_fillrate: nur CONFIRMED / capacity
+        "fill_rate": round(counts["confirmed_count"] / capacity, 2) if capacity else None,
+        "last_change_at": row["last_change_at"].isoformat() if row["last_change_at"] else None,
+    }
+
+
+def get_stats(club_ids: Iterable[int]) -> dict[int, dict]:
+    ids = sorted(set(club_ids))
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        select(clubs.c.id, clubs.c.capacity, *[club_stats.c[c] for c in COUNT_COLUMNS],
+               club_stats.c.last_change_at)
+        .select_from(clubs.outerjoin(club_stats, club_stats.c.club_id == clubs.c.id))
+        .where(clubs.c.id.in_(ids))
+    ).mappings().all()
+    return {row["id"]: _payload(row) for row in rows}
+
+
+# ---------- Rebuild ----------
+
+def rebuild_stats(conn, *, club_ids: Optional[Iterable[int]] = None, batch_size: int = 1000,
+                  commit_each_batch: bool = False) -> int:
+    """
+    Zählt pro Batch von Clubs neu (GROUP BY club_id, status über
+    idx_enrollments_club_status_queue) und ersetzt deren club_stats-Zeilen.
+    commit_each_batch: kurze Transaktionen für große Backfills (eigene Connection nötig).
+    Rückgabe: Anzahl verarbeiteter Clubs.
+    """
+    def batches():
+        if club_ids is not None:
+            ids = sorted(set(club_ids))
+            for i in range(0, len(ids), batch_size):
+                yield ids[i:i + batch_size]
+            return
+        last_id = 0
+        while True:
+            ids = list(conn.execute(
+                select(clubs.c.id).where(clubs.c.id > last_id).order_by(clubs.c.id).limit(batch_size)
+            ).scalars())
+            if not ids:
+                return
+            last_id = ids[-1]
+            yield ids
+
+    done = 0
+    for ids in batches():
+        counts: dict[int, dict[str, int]] = {cid: {col: 0 for col in COUNT_COLUMNS} for cid in ids}
+        for club_id, status, n in conn.execute(
+            select(enrollments.c.club_id, enrollments.c.status, func.count())
+            .where(enrollments.c.club_id.in_(ids))
+            .group_by(enrollments.c.club_id, enrollments.c.status)
+        ):
+            counts[club_id][STATUS_COLUMNS[status]] = n
+        conn.execute(delete(club_stats).where(club_stats.c.club_id.in_(ids)))
+        conn.execute(insert(club_stats), [{"club_id": cid, **c} for cid, c in counts.items()])
+        if commit_each_batch:
+            conn.commit()
+        done += len(ids)
+    return done
+
+
+# ---------- CLI ----------
+
+club_stats_cli = AppGroup("club-stats", help="Materialisierte Club-Statistik (club_stats).")
+
+
+@club_stats_cli.command("rebuild")
+@click.option("--batch-size", default=1000, show_default=True)
+def rebuild_command(batch_size: int):
+    with db.engine.connect() as conn:
+        n = rebuild_stats(conn, batch_size=batch_size, commit_each_batch=True)
+    click.echo(f"club_stats für {n} Club(s) neu aufgebaut.")
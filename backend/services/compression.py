@@ -0,0 +1,83 @@
+# services/compression.py
+"""
+Antwortkompression (gzip, Brotli falls installiert) per after_request.
+
+- Nur wenn der Client es per Accept-Encoding anbietet, der Body mindestens
+  COMPRESS_MIN_BYTES groß ist und der Typ sich lohnt (JSON, HTML, CSS, JS, SVG).
+- Brotli wird bevorzugt (kleiner), gzip ist der Fallback.
+- Gestreamte Antworten, 304 und bereits kodierte Antworten bleiben unangetastet.
+- Starke ETags werden schwach gemacht (Body unterscheidet sich je Encoding).
+"""
+from __future__ import annotations
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional, siehe requirements.txt
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/calendar",
+    "application/javascript",
+    "text/javascript",
+    "image/svg+xml",
+}
+
+
+def available_encodings() -> list[str]:
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def choose_encoding(accept_encoding) -> str | None:
+    """Bestes serverseitig verfügbares Encoding, das der Client akzeptiert (q > 0)."""
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = accept_encoding[encoding]
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, *, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def init_compression(app) -> None:
+    min_bytes = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    gzip_level = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    # dynamische Antworten: niedrige Brotli-Stufe, sonst frisst die Kompression den Gewinn
+    brotli_quality = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+    @app.after_request
+    def _compress_response(resp):
+        if (
+            resp.status_code != 200
+            or resp.direct_passthrough
+            or resp.is_streamed
+            or "Content-Encoding" in resp.headers
+            or resp.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return resp
+        resp.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return resp
+        data = resp.get_data()
+        if len(data) < min_bytes:
+            return resp
+
+        resp.set_data(compress(data, encoding, gzip_level=gzip_level, brotli_quality=brotli_quality))
+        resp.headers["Content-Encoding"] = encoding
+        etag, weak = resp.get_etag()
+        if etag and not weak:
+            resp.set_etag(etag, weak=True)
+        return resp
@@ -0,0 +1,351 @@
+# services/datagen.py
+"""
+Synthetische Testdaten in realistischen Mengen (Benchmarks, Query-Pläne).
+
+- `flask datagen run --users 1000000 --clubs 200000` erzeugt User, Hosts, Clubs,
+  Enrollments, Reviews und Merkzettel per mehrzeiligem INSERT (--batch-size
+  Zeilen pro Statement, ein Commit pro Batch). Ids werden ab MAX(id)+1 selbst
+  vergeben, so brauchen Enrollments/Reviews keine Rückfrage nach den Ids.
+- Die Daten halten dieselben Regeln ein wie der Buchungsweg: ENROLL_STATUS,
+  höchstens capacity belegte Plätze (SEAT_STATUSES), Warteliste (PENDING mit
+  queued_at) nur bei vollen, geplanten Clubs, ein Enrollment pro (User, Club),
+  ein Review pro Enrollment und nur für ATTENDED, eindeutige Merkzettel.
+- Abgeleitetes wird direkt mitgeschrieben (seats_taken, search_terms) bzw.
+  danach neu aufgebaut (club_stats, Bewertungs-Aggregate) – die ORM-Hooks
+  laufen bei Core-Inserts nicht.
+- Alle erzeugten User heißen <prefix>_<id> und haben das Passwort
+  DATAGEN_PASSWORD (für scripts/benchmark.py); `flask datagen purge` entfernt sie
+  samt abhängiger Daten wieder.
+- Deterministisch pro --seed (bei gleicher Ausgangs-DB).
+"""
+from __future__ import annotations
+import datetime as dt
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, func, insert, or_, select
+
+from extensions import db
+from models import (
+    Club, ClubRating, ClubRecommendation, ClubStats, Enrollment, Host, HostRating, Level, Review, User, Wishlist,
+)
+from models.club.enrollment_model import SEAT_STATUSES, WAITLIST_STATUS
+from . import versions
+from .club_stats import rebuild_stats
+from .ratings import rebuild_ratings
+from .fulltext import build_search_terms
+from .http_cache import CLUBS_VERSION_KEY
+from .passwords import hash_password
+
+users = User.__table__
+hosts = Host.__table__
+clubs = Club.__table__
+enrollments = Enrollment.__table__
+reviews = Review.__table__
+wishlists = Wishlist.__table__
+
+DATAGEN_PASSWORD = "datagen-pass"
+DEFAULT_PREFIX = "dg"
+PROGRESS_INTERVAL_S = 2.0
+PURGE_CHUNK = 1000
+
+FIRST_NAMES = ("Anna", "Ben", "Clara", "David", "Elif", "Finn", "Greta", "Hamza", "Ida", "Jonas",
+               "Katarzyna", "Luca", "Mia", "Noah", "Olga", "Paul", "Rania", "Sofia", "Tim", "Yuki")
+LAST_NAMES = ("Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker",
+              "Schulz", "Hoffmann", "Kowalski", "Yılmaz", "Nguyen", "Rossi", "García", "Ivanova")
+TOPICS = ("Alltag", "Reisen", "Beruf", "Kochen", "Filme", "Nachrichten", "Wohnen", "Gesundheit",
+          "Sport", "Musik", "Einkaufen", "Behörden", "Familie", "Umwelt", "Technik", "Feste")
+FORMATS = ("Gesprächsrunde", "Stammtisch", "Grammatik-Werkstatt", "Aussprachetraining",
+           "Lesekreis", "Rollenspiel", "Konversation")
+COMMENTS = ("Sehr angenehme Runde, gerne wieder!", "Gute Themen, etwas zu kurz.",
+            "Die Gastgeberin erklärt sehr geduldig.", "Hat mir beim Sprechen geholfen.",
+            "Zu viele Teilnehmende für die Zeit.", "Lockere Atmosphäre, viel gelernt.")
+CAPACITIES = (6, 8, 10, 12, 12, 16)
+DURATIONS = (45, 60, 60, 90)
+RATINGS = (1, 2, 3, 3, 4, 4, 4, 5, 5, 5)
+
+
+@dataclass
+class DatagenConfig:
+    users: int = 10_000
+    clubs: int = 2_000
+    host_ratio: float = 0.02
+    past_ratio: float = 0.5            # Anteil Clubs in der Vergangenheit (COMPLETED)
+    canceled_ratio: float = 0.03       # Anteil abgesagter Clubs
+    fill_mean: float = 0.7             # mittlere Auslastung geplanter/vergangener Clubs
+    cancel_ratio: float = 0.1          # stornierte Enrollments relativ zu den belegten Plätzen
+    attend_ratio: float = 0.85         # vergangene Plätze: ATTENDED statt NO_SHOW
+    max_waitlist: int = 3              # PENDING pro vollem, geplantem Club
+    wishlists_per_user: float = 2.0
+    review_ratio: float = 0.4          # Anteil ATTENDED mit Review
+    batch_size: int = 1000
+    seed: int = 42
+    prefix: str = DEFAULT_PREFIX
+
+
+@dataclass
+class DatagenResult:
+    counts: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class _BulkWriter:
+    """Puffert Zeilen pro Tabelle; flush() schreibt in FK-Reihenfolge, ein Commit pro Batch."""
+
+    def __init__(self, conn, order: list, batch_size: int,
+                 progress: Optional[Callable[[str], None]] = None):
+        self.conn = conn
+        self.order = order
+        self.batch_size = batch_size
+        self.progress = progress
+        self.rows: dict[str, list[dict]] = {t.name: [] for t in order}
+        self.counts: dict[str, int] = {t.name: 0 for t in order}
+        self._reported = time.monotonic()
+
+    def add(self, table, row: dict) -> None:
+        buf = self.rows[table.name]
+        buf.append(row)
+        if len(buf) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table in self.order:
+            buf = self.rows[table.name]
+            # mehrzeiliges INSERT ... VALUES (...), (...) statt executemany
+            for i in range(0, len(buf), self.batch_size):
+                self.conn.execute(insert(table).values(buf[i:i + self.batch_size]))
+            self.counts[table.name] += len(buf)
+            buf.clear()
+        self.conn.commit()
+        if self.progress and time.monotonic() - self._reported >= PROGRESS_INTERVAL_S:
+            self._reported = time.monotonic()
+            self.progress(", ".join(f"{name}={n:,}" for name, n in self.counts.items() if n))
+
+
+def _next_id(conn, table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _hour(ts: dt.datetime) -> dt.datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def generate(conn, cfg: DatagenConfig, *, now: Optional[dt.datetime] = None,
+             progress: Optional[Callable[[str], None]] = None) -> DatagenResult:
+    """Erzeugt die Daten über conn (eigene Connection, wird pro Batch committet)."""
+    t0 = time.perf_counter()
+    rng = random.Random(cfg.seed)
+    now = _hour(now or dt.datetime.utcnow())
+
+    levels = list(conn.execute(select(Level.__table__.c.code).order_by(Level.__table__.c.code)).scalars())
+    if not levels:
+        raise click.ClickException("Keine Levels vorhanden – zuerst db/populate.sql einspielen.")
+    if cfg.users < 2 or cfg.clubs < 1:
+        raise click.ClickException("Mindestens 2 User und 1 Club.")
+
+    password_hash = hash_password(DATAGEN_PASSWORD)
+    first_user = _next_id(conn, users)
+    n_hosts = max(1, int(cfg.users * cfg.host_ratio))
+    host_ids = range(first_user, first_user + n_hosts)
+    user_ids = range(first_user, first_user + cfg.users)
+
+    # ---- User + Hosts ----
+    writer = _BulkWriter(conn, [users, hosts], cfg.batch_size, progress)
+    for uid in user_ids:
+        is_host = uid < first_user + n_hosts
+        writer.add(users, {
+            "id": uid,
+            "username": f"{cfg.prefix}_{uid}",
+            "email": f"{cfg.prefix}_{uid}@example.invalid",
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "birth_date": dt.date(1950, 1, 1) + dt.timedelta(days=rng.randrange(365 * 55)),
+            "password_hash": password_hash,
+            "is_host": int(is_host),
+        })
+        if is_host:
+            writer.add(hosts, {"user_id": uid, "bio": f"Ich leite {rng.choice(FORMATS)}s zum Thema {rng.choice(TOPICS)}."})
+    writer.flush()
+    counts = dict(writer.counts)
+
+    # ---- Clubs + Enrollments + Reviews ----
+    first_club = _next_id(conn, clubs)
+    next_enrollment = _next_id(conn, enrollments)
+    writer = _BulkWriter(conn, [clubs, enrollments, reviews], cfg.batch_size, progress)
+    future_club_ids: list[int] = []
+
+    for club_id in range(first_club, first_club + cfg.clubs):
+        past = rng.random() < cfg.past_ratio
+        offset_h = rng.randrange(1, 24 * (180 if past else 90))
+        starts_at = now - dt.timedelta(hours=offset_h) if past else now + dt.timedelta(hours=offset_h)
+        if rng.random() < cfg.canceled_ratio:
+            status = "CANCELED"
+        else:
+            status = "COMPLETED" if past else "SCHEDULED"
+        if status == "SCHEDULED":
+            future_club_ids.append(club_id)
+
+        capacity = rng.choice(CAPACITIES)
+        host_id = rng.choice(host_ids)
+        fill = min(1.0, max(0.0, rng.gauss(cfg.fill_mean, 0.25)))
+        seats = round(capacity * fill)
+        n_cancelled = round(seats * cfg.cancel_ratio * rng.random() * 2)
+        n_waiting = rng.randint(0, cfg.max_waitlist) if status == "SCHEDULED" and seats == capacity else 0
+
+        participants = [u for u in rng.sample(user_ids, min(cfg.users, seats + n_cancelled + n_waiting + 1))
+                        if u != host_id][:seats + n_cancelled + n_waiting]
+
+        planned: list[tuple[int, str, Optional[dt.datetime], dt.datetime]] = []
+        for i, user_id in enumerate(participants):
+            booked_at = min(starts_at - dt.timedelta(hours=rng.randrange(1, 24 * 30)), now)
+            queued_at = None
+            if status == "CANCELED":
+                enr_status = "CANCELLED"
+            elif i < seats:
+                if past:
+                    enr_status = "ATTENDED" if rng.random() < cfg.attend_ratio else "NO_SHOW"
+                else:
+                    enr_status = "CONFIRMED"
+            elif i < seats + n_cancelled:
+                enr_status = "CANCELLED"
+            else:
+                enr_status, queued_at = WAITLIST_STATUS, booked_at
+            planned.append((user_id, enr_status, queued_at, booked_at))
+
+        title = f"{rng.choice(FORMATS)}: {rng.choice(TOPICS)} & {rng.choice(TOPICS)}"
+        description = (f"Wir sprechen über {rng.choice(TOPICS)} und {rng.choice(TOPICS)}. "
+                       f"Passend für {rng.choice(levels)}, Fragen jederzeit willkommen.")
+        # Club vor seinen Enrollments puffern: flush() schreibt in FK-Reihenfolge
+        writer.add(clubs, {
+            "id": club_id, "title": title, "description": description,
+            "search_terms": build_search_terms(title, description),
+            "level_code": rng.choice(levels), "host_id": host_id,
+            "starts_at": starts_at, "duration_min": rng.choice(DURATIONS),
+            "capacity": capacity,
+            "seats_taken": sum(1 for _, st, _, _ in planned if st in SEAT_STATUSES),
+            "price_cents": rng.choice((0, 0, 500, 1000, 1500, 2000)), "currency": "EUR",
+            "status": status,
+        })
+        for user_id, enr_status, queued_at, booked_at in planned:
+            enrollment_id = next_enrollment
+            next_enrollment += 1
+            writer.add(enrollments, {
+                "id": enrollment_id, "user_id": user_id, "club_id": club_id, "status": enr_status,
+                "queued_at": queued_at, "club_starts_at": starts_at,
+                "created_at": booked_at, "updated_at": booked_at,
+            })
+            if enr_status == "ATTENDED" and rng.random() < cfg.review_ratio:
+                writer.add(reviews, {
+                    "enrollment_id": enrollment_id,
+                    "rating": rng.choice(RATINGS),
+                    "comment": rng.choice(COMMENTS) if rng.random() < 0.5 else None,
+                    "created_at": min(starts_at + dt.timedelta(days=1), now),
+                })
+    writer.flush()
+    counts.update(writer.counts)
+
+    # ---- Merkzettel (nur geplante Clubs) ----
+    writer = _BulkWriter(conn, [wishlists], cfg.batch_size, progress)
+    if future_club_ids:
+        for user_id in user_ids:
+            k = min(len(future_club_ids), int(rng.expovariate(1 / cfg.wishlists_per_user))
+                    if cfg.wishlists_per_user > 0 else 0)
+            for club_id in rng.sample(future_club_ids, k):
+                writer.add(wishlists, {"user_id": user_id, "club_id": club_id})
+    writer.flush()
+    counts.update(writer.counts)
+
+    # ---- Abgeleitetes ----
+    rebuild_stats(conn, club_ids=range(first_club, first_club + cfg.clubs),
+                  batch_size=cfg.batch_size, commit_each_batch=True)
+    rebuild_ratings(conn, batch_size=cfg.batch_size)
+    versions.bump(CLUBS_VERSION_KEY, conn)
+    conn.commit()
+
+    return DatagenResult(counts=counts, seconds=time.perf_counter() - t0)
+
+
+def _chunks(ids: list[int], size: int = PURGE_CHUNK) -> Iterator[list[int]]:
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def purge(conn, prefix: str = DEFAULT_PREFIX) -> dict[str, int]:
+    """
+    Löscht alle <prefix>_*-User samt Clubs, Enrollments, Reviews und Merkzetteln.
+
+    Die IDs werden vorab gelesen und in Blöcken gelöscht: MySQL erlaubt in
+    DELETE keine Subquery auf die Zieltabelle (ERROR 1093).
+    """
+    pattern = f"{prefix}\\_%"
+    user_sel = select(users.c.id).where(users.c.username.like(pattern, escape="\\"))
+    club_sel = select(clubs.c.id).where(clubs.c.host_id.in_(user_sel))
+    user_ids = list(conn.execute(user_sel).scalars())
+    club_ids = list(conn.execute(club_sel).scalars())
+    enrollment_ids = list(conn.execute(
+        select(enrollments.c.id).where(
+            enrollments.c.user_id.in_(user_sel) | enrollments.c.club_id.in_(club_sel)
+        )
+    ).scalars())
+
+    recommendations = ClubRecommendation.__table__
+    # explizit in FK-Reihenfolge (SQLite erzwingt ON DELETE CASCADE nur mit PRAGMA foreign_keys)
+    deleted = {}
+    for name, table, columns, ids in (
+        ("reviews", reviews, (reviews.c.enrollment_id,), enrollment_ids),
+        ("enrollments", enrollments, (enrollments.c.id,), enrollment_ids),
+        ("wishlists", wishlists, (wishlists.c.user_id,), user_ids),
+        ("wishlists", wishlists, (wishlists.c.club_id,), club_ids),
+        ("club_recommendations", recommendations,
+         (recommendations.c.club_id, recommendations.c.neighbour_id), club_ids),
+        ("club_ratings", ClubRating.__table__, (ClubRating.__table__.c.club_id,), club_ids),
+        ("host_ratings", HostRating.__table__, (HostRating.__table__.c.host_id,), user_ids),
+        ("club_stats", ClubStats.__table__, (ClubStats.__table__.c.club_id,), club_ids),
+        ("clubs", clubs, (clubs.c.id,), club_ids),
+        ("hosts", hosts, (hosts.c.user_id,), user_ids),
+        ("users", users, (users.c.id,), user_ids),
+    ):
+        deleted.setdefault(name, 0)
+        for chunk in _chunks(ids):
+            stmt = delete(table).where(or_(*(col.in_(chunk) for col in columns)))
+            deleted[name] += conn.execute(stmt).rowcount
+    versions.bump(CLUBS_VERSION_KEY, conn)
+    return deleted
+
+
+# ---------- CLI ----------
+
+datagen_cli = AppGroup("datagen", help="Synthetische Testdaten (Benchmarks).")
+
+
+@datagen_cli.command("run")
+@click.option("--users", default=DatagenConfig.users, show_default=True)
+@click.option("--clubs", default=DatagenConfig.clubs, show_default=True)
+@click.option("--host-ratio", default=DatagenConfig.host_ratio, show_default=True)
+@click.option("--past-ratio", default=DatagenConfig.past_ratio, show_default=True)
+@click.option("--fill", "fill_mean", default=DatagenConfig.fill_mean, show_default=True,
+              help="Mittlere Auslastung der Clubs (0..1).")
+@click.option("--wishlists-per-user", default=DatagenConfig.wishlists_per_user, show_default=True)
+@click.option("--review-ratio", default=DatagenConfig.review_ratio, show_default=True)
+@click.option("--batch-size", default=DatagenConfig.batch_size, show_default=True)
+@click.option("--seed", default=DatagenConfig.seed, show_default=True)
+@click.option("--prefix", default=DEFAULT_PREFIX, show_default=True)
+def run_command(**options):
+    cfg = DatagenConfig(**options)
+    with db.engine.connect() as conn:
+        result = generate(conn, cfg, progress=lambda line: click.echo(f"  {line}"))
+    click.echo(f"Fertig in {result.seconds:.1f}s: "
+               + ", ".join(f"{name}={n:,}" for name, n in result.counts.items()))
+    click.echo(f"Login: {cfg.prefix}_<id> / {DATAGEN_PASSWORD}")
+
+
+@datagen_cli.command("purge")
+@click.option("--prefix", default=DEFAULT_PREFIX, show_default=True)
+def purge_command(prefix: str):
+    with db.engine.begin() as conn:
+        deleted = purge(conn, prefix)
+    click.echo("Gelöscht: " + ", ".join(f"{name}={n:,}" for name, n in deleted.items()))
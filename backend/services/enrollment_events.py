@@ -0,0 +1,109 @@
+# services/enrollment_events.py
+"""
+Ein before_flush-Listener, der Statusübergänge von Enrollment genau einmal pro
+Flush ermittelt und an registrierte Handler verteilt (Platzzähler, Statistiken, ...).
+
+Handler-Signatur: handler(session, conn, transitions) – sie laufen in der
+Transaktion des Flushs, Exceptions brechen den Flush ab.
+
+Vorbereitende Hooks (@before_transitions, z. B. Nachrücken von der Warteliste)
+dürfen weitere Enrollments in der Session ändern; liefern sie True, werden die
+Übergänge neu ermittelt, damit alle Handler auch diese Änderungen sehen.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import event, select, inspect
+from sqlalchemy.orm import Session
+
+from models import Enrollment
+
+enrollments = Enrollment.__table__
+
+
+@dataclass(frozen=True)
+class Transition:
+    enrollment: Enrollment
+    club_id: int
+    old_status: Optional[str]   # None = Enrollment neu (für diesen Club)
+    new_status: Optional[str]   # None = Enrollment gelöscht (bzw. Club gewechselt)
+
+
+Handler = Callable[[Session, object, list[Transition]], None]
+Preparer = Callable[[Session, list[Transition]], bool]
+_handlers: list[Handler] = []
+_preparers: list[Preparer] = []
+
+
+def on_transitions(handler: Handler) -> Handler:
+    """Decorator: Handler in Registrierungsreihenfolge aufrufen."""
+    _handlers.append(handler)
+    return handler
+
+
+def before_transitions(preparer: Preparer) -> Preparer:
+    """Decorator: Hook vor den Handlern; True = Session geändert, Übergänge neu ermitteln."""
+    _preparers.append(preparer)
+    return preparer
+
+
+def _default_status() -> str:
+    return enrollments.c.status.default.arg
+
+
+def _old_value(session: Session, enr: Enrollment, attr: str):
+    hist = inspect(enr).attrs[attr].history
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    # Wert war nicht geladen → aus der DB holen (selten, z. B. nach expire())
+    return session.connection().execute(
+        select(enrollments.c[attr]).where(enrollments.c.id == enr.id)
+    ).scalar()
+
+
+def collect_transitions(session: Session) -> list[Transition]:
+    result: list[Transition] = []
+
+    for obj in session.new:
+        if isinstance(obj, Enrollment):
+            result.append(Transition(obj, obj.club_id, None, obj.status or _default_status()))
+
+    for obj in session.dirty:
+        if not isinstance(obj, Enrollment) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if not (state.attrs.status.history.has_changes() or state.attrs.club_id.history.has_changes()):
+            continue
+        old_status = _old_value(session, obj, "status")
+        old_club = _old_value(session, obj, "club_id")
+        if old_club != obj.club_id:
+            result.append(Transition(obj, old_club, old_status, None))
+            result.append(Transition(obj, obj.club_id, None, obj.status))
+        elif old_status != obj.status:
+            result.append(Transition(obj, obj.club_id, old_status, obj.status))
+
+    for obj in session.deleted:
+        if isinstance(obj, Enrollment):
+            result.append(Transition(
+                obj, _old_value(session, obj, "club_id"), _old_value(session, obj, "status"), None
+            ))
+
+    return result
+
+
+@event.listens_for(Session, "before_flush")
+def _dispatch(session: Session, _flush_context, _instances) -> None:
+    if not _handlers:
+        return
+    transitions = collect_transitions(session)
+    if not transitions:
+        return
+    for preparer in _preparers:
+        if preparer(session, transitions):
+            transitions = collect_transitions(session)
+    conn = session.connection()
+    for handler in _handlers:
+        handler(session, conn, transitions)
@@ -0,0 +1,248 @@
+# services/fulltext.py
+"""
+Volltextsuche über Club-Titel und -Beschreibung.
+
+- clubs.search_terms enthält die gestemmten Begriffe (services/german_text.py,
+  Titel doppelt gewichtet) und wird bei jedem Flush eines neuen/geänderten
+  Clubs neu berechnet.
+- MySQL: FULLTEXT-Index ft_clubs_search. Treffer per MATCH ... IN BOOLEAN MODE
+  (alle Begriffe Pflicht, letzter als Präfix), Ranking per NATURAL LANGUAGE MODE,
+  Level-/Datums-/Preisfilter in derselben Abfrage, LIMIT k.
+- Sonst (SQLite, Tests): prozessweiter invertierter Index mit BM25-Ranking,
+  der bei Änderung der Version "clubs" neu aufgebaut wird; die Filter laufen
+  als PK-Abfrage nur über die Kandidaten.
+- SEARCH_BACKEND=fulltext|memory erzwingt ein Backend.
+"""
+from __future__ import annotations
+import bisect
+import heapq
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club
+from . import versions
+from .club_search import ClubFilter, MAX_LIMIT, filter_clauses
+from .german_text import analyze
+from .http_cache import CLUBS_VERSION_KEY
+
+clubs = Club.__table__
+
+TITLE_WEIGHT = 2
+# innodb_ft_min_token_size (Default 3): kürzere Begriffe kennt der FULLTEXT-Index nicht
+FULLTEXT_MIN_TOKEN = int(os.getenv("FULLTEXT_MIN_TOKEN", "3"))
+CANDIDATE_CHUNK = 1000
+
+
+def build_search_terms(title: Optional[str], description: Optional[str]) -> str:
+    return " ".join(analyze(title) * TITLE_WEIGHT + analyze(description))
+
+
+# ---------- Pflege von clubs.search_terms ----------
+
+@event.listens_for(Session, "before_flush")
+def _update_search_terms(session: Session, _flush_context, _instances) -> None:
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Club):
+            continue
+        if obj in session.new or _text_changed(obj):
+            obj.search_terms = build_search_terms(obj.title, obj.description)
+
+
+def _text_changed(club: Club) -> bool:
+    state = inspect(club)
+    return state.attrs.title.history.has_changes() or state.attrs.description.history.has_changes()
+
+
+def reindex(conn, *, batch_size: int = 500) -> int:
+    """Berechnet search_terms für alle Clubs neu (Backfill, Änderung der Analyse)."""
+    last_id, done = 0, 0
+    while True:
+        rows = conn.execute(
+            select(clubs.c.id, clubs.c.title, clubs.c.description)
+            .where(clubs.c.id > last_id).order_by(clubs.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return done
+        for club_id, title, description in rows:
+            # updated_at bleibt: die Analyse ist keine inhaltliche Änderung
+            conn.execute(
+                update(clubs).where(clubs.c.id == club_id)
+                .values(search_terms=build_search_terms(title, description), updated_at=clubs.c.updated_at)
+            )
+        last_id = rows[-1][0]
+        done += len(rows)
+
+
+# ---------- Backend: MySQL FULLTEXT ----------
+
+def _fulltext_search(terms: list[str], f: ClubFilter, limit: int) -> list[tuple[Club, float]]:
+    terms = [t for t in terms if len(t) >= FULLTEXT_MIN_TOKEN]
+    if not terms:
+        return []
+    boolean = " ".join(f"+{t}" for t in terms) + "*"
+    score = match(Club.search_terms, against=" ".join(terms)).in_natural_language_mode()
+    stmt = (
+        select(Club, score.label("score"))
+        .where(match(Club.search_terms, against=boolean).in_boolean_mode(), *filter_clauses(f))
+        .order_by(score.desc(), Club.starts_at, Club.id)
+        .limit(limit)
+    )
+    return [(club, float(s)) for club, s in db.session.execute(stmt).all()]
+
+
+# ---------- Backend: invertierter Index im Prozess ----------
+
+class MemoryIndex:
+    """term → {club_id: tf}; BM25 (k1=1.2, b=0.75). Neuaufbau bei neuer Version "clubs"."""
+
+    K1 = 1.2
+    B = 0.75
+    PREFIX_WEIGHT = 0.5
+
+    def __init__(self, check_interval_s: float):
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, int]] = {}
+        self._vocabulary: list[str] = []
+        self._lengths: dict[int, int] = {}
+        self._avg_length = 0.0
+        self.version: Optional[int] = None
+        self._checked_at = 0.0
+
+    def _build(self, version: int) -> None:
+        postings: dict[str, dict[int, int]] = defaultdict(dict)
+        lengths: dict[int, int] = {}
+        for club_id, terms in db.session.execute(select(clubs.c.id, clubs.c.search_terms)):
+            tokens = (terms or "").split()
+            lengths[club_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings[term][club_id] = tf
+        with self._lock:
+            self._postings = dict(postings)
+            self._vocabulary = sorted(postings)
+            self._lengths = lengths
+            self._avg_length = (sum(lengths.values()) / len(lengths)) if lengths else 0.0
+            self.version = version
+            self._checked_at = time.monotonic()
+
+    def _maybe_refresh(self) -> None:
+        if self.version is not None and time.monotonic() - self._checked_at < self.check_interval_s:
+            return
+        current = versions.get_version(CLUBS_VERSION_KEY)
+        if current != self.version:
+            self._build(current)
+        else:
+            self._checked_at = time.monotonic()
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        i = bisect.bisect_left(self._vocabulary, prefix)
+        found = []
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(prefix):
+            found.append(self._vocabulary[i])
+            i += 1
+        return found
+
+    def score(self, terms: list[str]) -> dict[int, float]:
+        """Alle Begriffe Pflicht, der letzte als Präfix; Rückgabe club_id → BM25."""
+        self._maybe_refresh()
+        n_docs = len(self._lengths)
+        if not terms or not n_docs:
+            return {}
+        groups = [[t] for t in terms[:-1]] + [self._expand_prefix(terms[-1])]
+        scores: Optional[dict[int, float]] = None
+        for i, group in enumerate(groups):
+            exact = terms[i]
+            group_scores: dict[int, float] = defaultdict(float)
+            for term in group:
+                postings = self._postings.get(term, {})
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                # reine Präfixtreffer zählen halb, exakte Stämme gehen vor
+                weight = 1.0 if term == exact else self.PREFIX_WEIGHT
+                for club_id, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[club_id] / (self._avg_length or 1))
+                    s = weight * idf * tf * (self.K1 + 1) / (tf + norm)
+                    if s > group_scores[club_id]:
+                        group_scores[club_id] = s
+            if scores is None:
+                scores = dict(group_scores)
+            else:
+                scores = {cid: s + group_scores[cid] for cid, s in scores.items() if cid in group_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+
+memory_index = MemoryIndex(float(os.getenv("SEARCH_INDEX_CHECK_S", "5")))
+
+
+def _memory_search(terms: list[str], f: ClubFilter, limit: int) -> list[tuple[Club, float]]:
+    scores = memory_index.score(terms)
+    if not scores:
+        return []
+    # Filter als PK-Abfrage nur über die Kandidaten, Ranking danach im Speicher
+    matching: dict[int, Club] = {}
+    candidates = sorted(scores)
+    for i in range(0, len(candidates), CANDIDATE_CHUNK):
+        chunk = candidates[i:i + CANDIDATE_CHUNK]
+        for club in db.session.execute(
+            select(Club).where(Club.id.in_(chunk), *filter_clauses(f))
+        ).scalars():
+            matching[club.id] = club
+    top = heapq.nsmallest(
+        limit, matching.values(), key=lambda c: (-scores[c.id], c.starts_at, c.id)
+    )
+    return [(club, round(scores[club.id], 4)) for club in top]
+
+
+# ---------- Öffentliche API ----------
+
+def backend_name() -> str:
+    forced = os.getenv("SEARCH_BACKEND")
+    if forced in ("fulltext", "memory"):
+        return forced
+    return "fulltext" if db.engine.dialect.name == "mysql" else "memory"
+
+
+def search_text(q: str, f: ClubFilter, *, limit: int) -> list[tuple[Club, float]]:
+    """Top-k Clubs zur Suchanfrage q (nach Relevanz, dann Beginn), gefiltert wie /eventdata."""
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    terms = analyze(q)
+    if not terms:
+        return []
+    if backend_name() == "fulltext":
+        return _fulltext_search(terms, f, limit)
+    return _memory_search(terms, f, limit)
+
+
+# ---------- CLI ----------
+
+search_cli = AppGroup("search", help="Volltextsuche über Clubs.")
+
+
+@search_cli.command("reindex")
+@click.option("--batch-size", default=500, show_default=True)
+def reindex_command(batch_size: int):
+    with db.engine.begin() as conn:
+        n = reindex(conn, batch_size=batch_size)
+        versions.bump(CLUBS_VERSION_KEY, conn)
+    click.echo(f"search_terms für {n} Club(s) neu berechnet.")
+
+
+@search_cli.command("query")
+@click.argument("q")
+@click.option("--limit", default=10, show_default=True)
+def query_command(q: str, limit: int):
+    click.echo(f"Backend: {backend_name()}, Begriffe: {' '.join(analyze(q)) or '-'}")
+    for club, score in search_text(q, ClubFilter(), limit=limit):
+        click.echo(f"{score:8.3f}  #{club.id}  {club.starts_at:%Y-%m-%d %H:%M}  {club.title}")
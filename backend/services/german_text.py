@@ -0,0 +1,63 @@
+# services/german_text.py
+"""
+Textanalyse für die Volltextsuche: Tokenisierung, Umlaut-Faltung, Stoppwörter
+und Stemming nach CISTEM (Weissweiler & Fraser 2017, ein kompakter deutscher
+Stemmer). Dieselbe Analyse läuft beim Indexieren und bei der Suchanfrage,
+dadurch finden "Grüße", "Gruesse" und "grussen" denselben Stamm.
+"""
+from __future__ import annotations
+import re
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# ae/oe/ue als Umschrift (nicht nach q: "Quelle")
+_TRANSCRIPTION_RE = re.compile(r"(?<!q)(a|o|u)e")
+_UMLAUTS = str.maketrans({"ä": "a", "ö": "o", "ü": "u", "ß": "ss"})
+
+STOPWORDS = frozenset("""
+aber alle allem allen aller alles als also am an ander andere anderem anderen anderer
+anderes auch auf aus bei bin bis bist da damit dann das dass dasselbe dazu dein deine
+dem den denn der des dessen die dies diese diesem diesen dieser dieses doch dort du
+durch ein eine einem einen einer eines er es etwas euer eure für hat hatte hier hin
+ich ihr ihre im in ist ja jede jedem jeden jeder jedes kann kein keine mein meine mit
+muss nach nicht nichts noch nun nur ob oder ohne sehr sein seine sich sie sind so
+solche über um und uns unser unter viel vom von vor war waren was weil welche wenn
+wer wie wir wird wo zu zum zur zwar zwischen
+a an and are as at be by for from in is it of on or the to with
+""".split())
+
+MIN_TOKEN_LEN = 2
+
+
+def fold(text: str) -> str:
+    """Kleinschreibung + Umlaut-Faltung (ä/ae → a, ö/oe → o, ü/ue → u, ß → ss)."""
+    return _TRANSCRIPTION_RE.sub(r"\1", text.lower().translate(_UMLAUTS))
+
+
+def stem(word: str) -> str:
+    """CISTEM (case-insensitive Variante) auf einem bereits gefalteten Wort."""
+    if re.match(r"ge.{4,}", word):
+        word = word[2:]
+    word = word.replace("sch", "$").replace("ei", "%").replace("ie", "&")
+    word = re.sub(r"(.)\1", r"\1*", word)
+    while len(word) > 3:
+        if len(word) > 5 and word[-2:] in ("em", "er", "nd"):
+            word = word[:-2]
+        elif word[-1] in "tesn":
+            word = word[:-1]
+        else:
+            break
+    word = re.sub(r"(.)\*", r"\1\1", word)
+    return word.replace("$", "sch").replace("%", "ei").replace("&", "ie")
+
+
+def analyze(text: str | None) -> list[str]:
+    """Text → Liste von Stämmen (Reihenfolge und Wiederholungen bleiben erhalten)."""
+    if not text:
+        return []
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) < MIN_TOKEN_LEN or token in STOPWORDS:
+            continue
+        terms.append(stem(fold(token)))
+    return terms
@@ -0,0 +1,187 @@
+# services/host_analytics.py
+"""
+Host-Statistik pro Club aus enrollment_audit (GET /statistic/<club_id>).
+
+- Genau ein Bulk-Fetch: alle Audit-Zeilen des Clubs (idx_audit_club, ohne JOIN
+  auf enrollments – auch gelöschte Enrollments zählen mit) direkt in einen DataFrame.
+- Alle Kennzahlen vektorisiert mit pandas/NumPy, keine Python-Schleife pro Zeile.
+- Ergebnis wird pro Club gecacht, bis ein neuer Audit-Eintrag hinzukommt
+  (Schlüssel: MAX(audit.id), COUNT(*) und clubs.updated_at).
+"""
+from __future__ import annotations
+import datetime as dt
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+
+from extensions import db
+from models import Club, EnrollmentAudit
+from models.club.enrollment_model import SEAT_STATUSES
+
+audit = EnrollmentAudit.__table__
+
+AUDIT_COLUMNS = ("id", "enrollment_id", "action", "old_status", "new_status", "changed_at")
+
+# Vorlaufzeit (Buchung → Clubbeginn) in Stunden
+LEAD_TIME_BUCKETS = (
+    ("<24h", 0, 24),
+    ("1-3d", 24, 72),
+    ("3-7d", 72, 168),
+    ("7-14d", 168, 336),
+    ("14-30d", 336, 720),
+    (">30d", 720, np.inf),
+)
+
+
+# ---------- Cache ----------
+
+class AnalyticsCache:
+    """Kleiner LRU: club_id → (Schlüssel, Payload). Veraltet, sobald sich der Schlüssel ändert."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict[int, tuple[tuple, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, club_id: int, key: tuple) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(club_id)
+            if entry is None or entry[0] != key:
+                return None
+            self._data.move_to_end(club_id)
+            return entry[1]
+
+    def put(self, club_id: int, key: tuple, payload: dict) -> None:
+        with self._lock:
+            self._data[club_id] = (key, payload)
+            self._data.move_to_end(club_id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+analytics_cache = AnalyticsCache(int(os.getenv("ANALYTICS_CACHE_SIZE", "1024")))
+
+
+# ---------- Laden ----------
+
+def _club_audit_filter(stmt, club_id: int):
+    return stmt.select_from(audit).where(audit.c.club_id == club_id)
+
+
+def _cache_key(club: Club) -> tuple:
+    max_id, n = db.session.execute(
+        _club_audit_filter(select(func.max(audit.c.id), func.count()), club.id)
+    ).one()
+    return (max_id or 0, n, club.updated_at, club.starts_at)
+
+
+def load_audit_frame(club_id: int) -> pd.DataFrame:
+    rows = db.session.execute(
+        _club_audit_filter(select(*[audit.c[c] for c in AUDIT_COLUMNS]), club_id)
+        .order_by(audit.c.id)
+    ).all()
+    df = pd.DataFrame.from_records(rows, columns=list(AUDIT_COLUMNS))
+    df["changed_at"] = pd.to_datetime(df["changed_at"])
+    return df
+
+
+# ---------- Kennzahlen ----------
+
+def _round(value, digits: int = 2) -> Optional[float]:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return round(float(value), digits)
+
+
+def booking_curve(df: pd.DataFrame, starts_at: dt.datetime) -> list[dict]:
+    """Netto-Zu-/Abgänge belegter Plätze pro Tag und der kumulierte Stand."""
+    if df.empty:
+        return []
+    seat = np.asarray(SEAT_STATUSES, dtype=object)
+    was = np.isin(df["old_status"].to_numpy(dtype=object), seat)
+    now = np.isin(df["new_status"].to_numpy(dtype=object), seat)
+    delta = now.astype(np.int64) - was.astype(np.int64)
+    per_day = (
+        pd.Series(delta, index=df["changed_at"].dt.floor("D"))
+        .groupby(level=0).sum()
+    )
+    active = per_day.cumsum()
+    days_before = (pd.Timestamp(starts_at).floor("D") - per_day.index).days
+    return [
+        {"date": d.date().isoformat(), "days_before_start": int(b), "net": int(n), "active": int(a)}
+        for d, b, n, a in zip(per_day.index, days_before, per_day.to_numpy(), active.to_numpy())
+    ]
+
+
+def lead_time_stats(df: pd.DataFrame, starts_at: dt.datetime) -> dict:
+    """Vorlaufzeit der Buchungen (INSERT-Zeilen) in Stunden."""
+    inserts = df.loc[df["action"] == "INSERT", "changed_at"]
+    hours = ((pd.Timestamp(starts_at) - inserts) / pd.Timedelta(hours=1)).to_numpy(dtype=float)
+    hours = np.clip(hours, 0, None)
+    edges = np.array([lo for _, lo, _ in LEAD_TIME_BUCKETS] + [np.inf])
+    counts, _ = np.histogram(hours, bins=edges)
+    if hours.size:
+        p50, p90 = np.percentile(hours, [50, 90])
+        mean = hours.mean()
+    else:
+        p50 = p90 = mean = None
+    return {
+        "hours_p50": _round(p50),
+        "hours_p90": _round(p90),
+        "hours_mean": _round(mean),
+        "histogram": [
+            {"bucket": label, "count": int(c)} for (label, _, _), c in zip(LEAD_TIME_BUCKETS, counts)
+        ],
+    }
+
+
+def final_statuses(df: pd.DataFrame) -> pd.Series:
+    """Letzter Status je Enrollment (None = gelöscht)."""
+    last = df.drop_duplicates("enrollment_id", keep="last")
+    return last["new_status"].where(last["action"] != "DELETE")
+
+
+def compute_stats(club: Club, df: pd.DataFrame) -> dict:
+    booked = df.loc[df["action"] == "INSERT", "enrollment_id"].nunique()
+    cancelled = df.loc[df["new_status"] == "CANCELLED", "enrollment_id"].nunique()
+
+    final = final_statuses(df)
+    final_counts = final.value_counts()
+    attended = int(final_counts.get("ATTENDED", 0))
+    no_show = int(final_counts.get("NO_SHOW", 0))
+
+    return {
+        "club_id": club.id,
+        "title": club.title,
+        "starts_at": club.starts_at.isoformat() if club.starts_at else None,
+        "capacity": club.capacity,
+        "generated_at": dt.datetime.now().replace(microsecond=0).isoformat(),
+        "audit_entries": int(len(df)),
+        "bookings_total": int(booked),
+        "cancellations": int(cancelled),
+        "cancellation_rate": _round(cancelled / booked, 4) if booked else None,
+        "attendance_ratio": _round(attended / (attended + no_show), 4) if attended + no_show else None,
+        "final_status": {str(k): int(v) for k, v in final_counts.items()},
+        "lead_time": lead_time_stats(df, club.starts_at),
+        "booking_curve": booking_curve(df, club.starts_at),
+    }
+
+
+def club_statistics(club: Club) -> dict:
+    """Cache-Hit: eine Aggregat-Abfrage. Miss: zusätzlich ein Bulk-Fetch + Berechnung."""
+    key = _cache_key(club)
+    cached = analytics_cache.get(club.id, key)
+    if cached is not None:
+        return cached
+    payload = compute_stats(club, load_audit_frame(club.id))
+    analytics_cache.put(club.id, key, payload)
+    return payload
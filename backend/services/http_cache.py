@@ -0,0 +1,113 @@
+# services/http_cache.py
+"""
+Bedingte GETs (ETag / Last-Modified) für Katalog-Endpunkte.
+
+@conditional(validator) ruft vor der View einen billigen Validator auf
+(z. B. MAX(clubs.updated_at) über idx_clubs_updated_at + Versionszähler) und
+bildet daraus, dem Endpunkt und den Query-Parametern den ETag. Passt
+If-None-Match (bzw. If-Modified-Since), kommt 304 zurück, ohne dass die
+eigentliche Abfrage oder die Serialisierung läuft.
+
+Validator: fn(**view_args) -> (parts, last_modified) oder None (= ohne Caching,
+z. B. damit die View selbst 404 liefern kann).
+"""
+from __future__ import annotations
+import datetime as dt
+import hashlib
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import request, make_response
+from sqlalchemy import event, select, func
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club, CacheVersion
+from .versions import bump
+
+clubs = Club.__table__
+cache_versions = CacheVersion.__table__
+
+# Wird bei jeder ORM-Änderung an Clubs erhöht: deckt Löschungen und mehrere
+# Änderungen innerhalb derselben Sekunde ab, die MAX(updated_at) nicht sieht.
+CLUBS_VERSION_KEY = "clubs"
+
+Validator = Callable[..., Optional[tuple[tuple, Optional[dt.datetime]]]]
+
+
+# ---------- Validatoren ----------
+
+def clubs_state() -> tuple[Optional[dt.datetime], int]:
+    """(MAX(clubs.updated_at), Version "clubs") in einer Abfrage."""
+    version = (
+        select(cache_versions.c.version)
+        .where(cache_versions.c.name == CLUBS_VERSION_KEY)
+        .scalar_subquery()
+    )
+    last_modified, v = db.session.execute(select(func.max(clubs.c.updated_at), version)).one()
+    return last_modified, v or 0
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_clubs_version(session: Session, _flush_context, _instances) -> None:
+    changed = any(isinstance(o, Club) for o in session.new) or any(
+        isinstance(o, Club) for o in session.deleted
+    ) or any(isinstance(o, Club) and session.is_modified(o) for o in session.dirty)
+    if changed:
+        bump(CLUBS_VERSION_KEY, session.connection())
+
+
+# ---------- Decorator ----------
+
+def make_etag(*parts) -> str:
+    raw = "|".join(map(str, parts))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _as_utc(value: dt.datetime) -> dt.datetime:
+    value = value.replace(microsecond=0)
+    return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
+
+
+def _not_modified(etag: str, last_modified: Optional[dt.datetime]) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return bool(since and last_modified and _as_utc(last_modified) <= since)
+
+
+def conditional(validator: Validator, *, max_age: int = 0, personalized: bool = False,
+                include_query: bool = True):
+    """
+    max_age: Sekunden, die Clients ohne Revalidierung verwenden dürfen.
+    personalized: Antwort hängt vom User ab → Cache-Control private + Vary: Cookie.
+    include_query: Query-Parameter (sortiert) fließen in den ETag ein.
+    """
+    scope = "private" if personalized else "public"
+    cache_control = f"{scope}, max-age={max_age}, must-revalidate"
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validated = validator(**kwargs)
+            if validated is None:
+                return view(*args, **kwargs)
+            parts, last_modified = validated
+            query = sorted(request.args.items(multi=True)) if include_query else ()
+            etag = make_etag(request.endpoint, *parts, *query)
+
+            if _not_modified(etag, last_modified):
+                resp = make_response("", 304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag, weak=True)
+            if last_modified is not None:
+                resp.last_modified = _as_utc(last_modified)
+            resp.headers["Cache-Control"] = cache_control
+            if personalized:
+                resp.vary.add("Cookie")
+            return resp
+        return wrapper
+    return decorator
@@ -0,0 +1,59 @@
+# services/json_provider.py
+"""
+JSON-Provider für alle Blueprints (app.json, damit auch jsonify()).
+
+- orjson, falls installiert: serialisiert direkt nach UTF-8-Bytes, deutlich
+  schneller und ohne \\uXXXX-Escapes für Umlaute.
+- Ohne orjson (oder für Werte, die orjson ablehnt, z. B. Ints > 64 Bit):
+  unveränderter Flask-DefaultJSONProvider.
+- Sonderfälle (date, Decimal, UUID, dataclasses) laufen weiterhin über
+  DefaultJSONProvider.default, die Ausgabe bleibt also dieselbe wie bisher.
+"""
+from __future__ import annotations
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, siehe requirements.txt
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    backend = "orjson" if orjson is not None else "json"
+
+    def _fast_dumps(self, obj: Any) -> bytes | None:
+        try:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        except TypeError:  # orjson.JSONEncodeError
+            return None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            data = self._fast_dumps(obj)
+            if data is not None:
+                return data.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        data = self._fast_dumps(self._prepare_response_obj(args, kwargs))
+        if data is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,114 @@
+# services/level_catalog.py
+"""
+Prozessweiter Level-Katalog (code → label, Reihenfolge).
+
+- preload() beim App-Start: eine Abfrage auf levels + die Version "levels".
+- Danach bedienen codes()/label()/is_valid() alles aus dem Speicher; höchstens alle
+  LEVEL_CATALOG_CHECK_S Sekunden wird nur die Versionszeile in cache_versions gelesen
+  und bei Änderung neu geladen.
+- Wer levels ändert, ruft im selben Commit services.versions.bump("levels") auf
+  (oder `flask levels bump` nach manuellen SQL-Änderungen).
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select
+
+from extensions import db
+from models import Level
+from . import versions
+
+VERSION_KEY = "levels"
+
+
+class LevelCatalog:
+    def __init__(self, check_interval_s: float):
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._labels: dict[str, str] = {}
+        self._codes: tuple[str, ...] = ()
+        self._positions: dict[str, int] = {}
+        self.version: Optional[int] = None
+        self._checked_at = 0.0
+
+    # ---------- Laden ----------
+
+    def _load(self, version: int) -> None:
+        rows = db.session.execute(select(Level.code, Level.label)).all()
+        # Codes sortieren sich lexikographisch in Niveau-Reihenfolge (A2.1 < A2.2 < A2/B1 < B2/C1)
+        rows.sort(key=lambda r: r[0])
+        with self._lock:
+            self._labels = {code: label for code, label in rows}
+            self._codes = tuple(code for code, _ in rows)
+            self._positions = {code: i for i, code in enumerate(self._codes)}
+            self.version = version
+            self._checked_at = time.monotonic()
+
+    def preload(self) -> None:
+        self._load(versions.get_version(VERSION_KEY))
+
+    def _maybe_refresh(self) -> None:
+        if self.version is not None and time.monotonic() - self._checked_at < self.check_interval_s:
+            return
+        current = versions.get_version(VERSION_KEY)
+        if current != self.version:
+            self._load(current)
+        else:
+            self._checked_at = time.monotonic()
+
+    # ---------- Lesen (Hot Path) ----------
+
+    def current_version(self) -> Optional[int]:
+        """Version für ETags: prüft wie alle Leser zuerst auf Änderungen, sonst
+        bliebe ein alter Validator nach `bump("levels")` an neuen Bodies hängen."""
+        self._maybe_refresh()
+        return self.version
+
+    def codes(self) -> tuple[str, ...]:
+        self._maybe_refresh()
+        return self._codes
+
+    def is_valid(self, code: str) -> bool:
+        self._maybe_refresh()
+        return code in self._labels
+
+    def label(self, code: str) -> Optional[str]:
+        self._maybe_refresh()
+        return self._labels.get(code)
+
+    def position(self, code: str) -> Optional[int]:
+        self._maybe_refresh()
+        return self._positions.get(code)
+
+    def as_list(self) -> list[dict]:
+        self._maybe_refresh()
+        return [{"code": c, "label": self._labels[c], "position": i} for i, c in enumerate(self._codes)]
+
+
+level_catalog = LevelCatalog(check_interval_s=float(os.getenv("LEVEL_CATALOG_CHECK_S", "30")))
+
+
+# ---------- CLI ----------
+
+levels_cli = AppGroup("levels", help="Level-Katalog.")
+
+
+@levels_cli.command("list")
+def list_command():
+    level_catalog.preload()
+    for item in level_catalog.as_list():
+        click.echo(f"{item['position']}: {item['code']:<6} {item['label']}")
+    click.echo(f"Version: {level_catalog.version}")
+
+
+@levels_cli.command("bump")
+def bump_command():
+    """Nach manuellen Änderungen an levels: alle Prozesse laden den Katalog neu."""
+    versions.bump(VERSION_KEY)
+    db.session.commit()
+    click.echo(f"levels-Version: {versions.get_version(VERSION_KEY)}")
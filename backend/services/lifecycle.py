@@ -0,0 +1,395 @@
+# services/lifecycle.py
+"""
+Lebenszyklus der Clubs im Hintergrund.
+
+Sobald starts_at + duration_min vorbei ist:
+  - Club SCHEDULED → COMPLETED (hält den SCHEDULED-Teil von idx_clubs_search klein),
+  - Enrollments CONFIRMED → NO_SHOW (wer teilgenommen hat, ist bereits ATTENDED),
+  - Warteliste (PENDING) → CANCELLED.
+
+Ablauf eines Laufs (run_once):
+  - Leader-Lease in scheduler_leases: nur ein Worker (Prozess/Host) arbeitet,
+    der Lease wird zwischen den Batches verlängert; läuft er ab, übernimmt ein anderer.
+  - Keyset-Scan über idx_clubs_starts_at im Bereich [watermark, now) in Batches;
+    pro Batch eine kurze Transaktion mit Bulk-UPDATEs (erst Club-Zeilen, dann
+    Enrollments – dieselbe Sperrreihenfolge wie beim Buchen).
+  - Die Bulk-UPDATEs laufen am ORM vorbei, daher werden die Folgepflichten der
+    Enrollment-Handler hier explizit erledigt: seats_taken, club_stats
+    (Rebuild der betroffenen Clubs), Audit-Zeilen, Version "clubs".
+  - watermark = Beginn des frühesten noch laufenden Clubs (sonst now): der
+    nächste Lauf liest nur noch Clubs ab dort.
+
+Betrieb: in-process (LIFECYCLE_SCHEDULER=1, Thread pro Worker-Prozess) oder per
+CLI (`flask lifecycle run|loop|status`, z. B. als Cron oder eigener Prozess).
+"""
+from __future__ import annotations
+import atexit
+import datetime as dt
+import logging
+import os
+import random
+import socket
+import threading
+import uuid
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, update, case, func, and_, or_
+from sqlalchemy.engine import Connection, Engine
+
+from extensions import db
+from models import Club, Enrollment, SchedulerLease
+from models.club.enrollment_model import WAITLIST_STATUS
+from . import versions
+from .audit import audit_writer, write_or_defer
+from .club_stats import rebuild_stats
+from .http_cache import CLUBS_VERSION_KEY
+from .sql_util import insert_ignore
+
+log = logging.getLogger(__name__)
+
+clubs = Club.__table__
+enrollments = Enrollment.__table__
+leases = SchedulerLease.__table__
+
+LEASE_NAME = "club-lifecycle"
+INTERVAL_S = float(os.getenv("LIFECYCLE_INTERVAL_S", "60"))
+LEASE_TTL_S = float(os.getenv("LIFECYCLE_LEASE_S", "180"))
+BATCH_SIZE = int(os.getenv("LIFECYCLE_BATCH", "500"))
+
+# Enrollment-Status beim Abschluss eines Clubs
+FINAL_STATUS = {"CONFIRMED": "NO_SHOW", WAITLIST_STATUS: "CANCELLED"}
+
+
+def utcnow() -> dt.datetime:
+    # clubs.starts_at wird als UTC gespeichert (db/create.sql)
+    return dt.datetime.utcnow().replace(microsecond=0)
+
+
+# ---------- Leader-Lease ----------
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def acquire_lease(conn: Connection, name: str, owner: str, ttl_s: float,
+                  now: Optional[dt.datetime] = None) -> bool:
+    """Holt oder verlängert den Lease (bedingter UPDATE auf eine PK-Zeile)."""
+    now = now or utcnow()
+    insert_ignore(conn, leases, [{"name": name, "owner": None, "expires_at": now}])
+    res = conn.execute(
+        update(leases)
+        .where(leases.c.name == name,
+               or_(leases.c.owner == owner, leases.c.owner.is_(None), leases.c.expires_at <= now))
+        .values(owner=owner, expires_at=now + dt.timedelta(seconds=ttl_s))
+    )
+    return res.rowcount == 1
+
+
+def release_lease(conn: Connection, name: str, owner: str) -> None:
+    conn.execute(
+        update(leases).where(leases.c.name == name, leases.c.owner == owner)
+        .values(owner=None, expires_at=utcnow())
+    )
+
+
+def get_lease(conn: Connection, name: str):
+    return conn.execute(select(leases).where(leases.c.name == name)).first()
+
+
+# ---------- Abschluss eines Batches ----------
+
+@dataclass
+class LifecycleResult:
+    clubs_completed: int = 0
+    no_shows: int = 0
+    waitlist_cancelled: int = 0
+    batches: int = 0
+    watermark: Optional[dt.datetime] = None
+    lost_lease: bool = False
+
+
+def _scan(conn: Connection, lower: Optional[dt.datetime], now: dt.datetime,
+          after: Optional[tuple[dt.datetime, int]], limit: int):
+    stmt = (
+        select(clubs.c.id, clubs.c.starts_at, clubs.c.duration_min)
+        .where(clubs.c.status == "SCHEDULED", clubs.c.starts_at < now)
+        .order_by(clubs.c.starts_at, clubs.c.id)
+        .limit(limit)
+        # Range-Scan ab watermark; idx_clubs_search würde alle künftigen SCHEDULED-Clubs lesen
+        .with_hint(clubs, "USE INDEX (idx_clubs_starts_at)", "mysql")
+    )
+    if lower is not None:
+        stmt = stmt.where(clubs.c.starts_at >= lower)
+    if after is not None:
+        ts, last_id = after
+        stmt = stmt.where(clubs.c.starts_at >= ts,
+                          or_(clubs.c.starts_at > ts, and_(clubs.c.starts_at == ts, clubs.c.id > last_id)))
+    return conn.execute(stmt).all()
+
+
+def complete_clubs(conn: Connection, club_ids: list[int]) -> tuple[list[int], Counter, list[dict]]:
+    """
+    Schließt die Clubs ab (nur solche, die noch SCHEDULED sind).
+    Rückgabe: (abgeschlossene IDs, Anzahl Übergänge je neuem Status, Audit-Zeilen).
+    """
+    # Club-Zeilen zuerst sperren (wie reserve_seat beim Buchen)
+    ids = list(conn.execute(
+        select(clubs.c.id).where(clubs.c.id.in_(club_ids), clubs.c.status == "SCHEDULED")
+        .order_by(clubs.c.id).with_for_update()
+    ).scalars())
+    if not ids:
+        return [], Counter(), []
+    changed = conn.execute(
+        select(enrollments.c.id, enrollments.c.club_id, enrollments.c.status)
+        .where(enrollments.c.club_id.in_(ids), enrollments.c.status.in_(FINAL_STATUS))
+        .order_by(enrollments.c.id).with_for_update()
+    ).all()
+
+    now = func.current_timestamp()
+    conn.execute(update(clubs).where(clubs.c.id.in_(ids)).values(status="COMPLETED", updated_at=now))
+    for old, new in FINAL_STATUS.items():
+        values = {"status": new, "updated_at": now}
+        if old == WAITLIST_STATUS:
+            values["queued_at"] = None
+        conn.execute(
+            update(enrollments)
+            .where(enrollments.c.club_id.in_(ids), enrollments.c.status == old)
+            .values(**values)
+        )
+
+    # CONFIRMED belegte einen Platz, NO_SHOW nicht mehr (services/seats.py)
+    freed = Counter(row.club_id for row in changed if row.status == "CONFIRMED")
+    if freed:
+        conn.execute(
+            update(clubs).where(clubs.c.id.in_(freed))
+            .values(seats_taken=clubs.c.seats_taken - case(dict(freed), value=clubs.c.id, else_=0),
+                    updated_at=clubs.c.updated_at)
+        )
+    rebuild_stats(conn, club_ids=ids)
+    versions.bump(CLUBS_VERSION_KEY, conn)
+
+    changed_at = utcnow()
+    audit_rows = [
+        {"enrollment_id": row.id, "club_id": row.club_id, "action": "UPDATE", "old_status": row.status,
+         "new_status": FINAL_STATUS[row.status], "changed_by": None, "changed_at": changed_at}
+        for row in changed
+    ]
+    return ids, Counter(FINAL_STATUS[row.status] for row in changed), write_or_defer(conn, audit_rows)
+
+
+# ---------- Ein Lauf ----------
+
+def run_once(engine: Engine, *, owner: str, now: Optional[dt.datetime] = None,
+             batch_size: int = BATCH_SIZE, full: bool = False,
+             lease_ttl_s: float = LEASE_TTL_S) -> Optional[LifecycleResult]:
+    """Ein Durchlauf; None, wenn ein anderer Worker den Lease hält."""
+    now = now or utcnow()
+    with engine.begin() as conn:
+        if not acquire_lease(conn, LEASE_NAME, owner, lease_ttl_s):
+            return None
+        lower = None if full else get_lease(conn, LEASE_NAME).watermark
+
+    result = LifecycleResult()
+    after: Optional[tuple[dt.datetime, int]] = None
+    earliest_running: Optional[dt.datetime] = None
+    while True:
+        with engine.begin() as conn:
+            rows = _scan(conn, lower, now, after, batch_size)
+        if not rows:
+            break
+        after = (rows[-1].starts_at, rows[-1].id)
+
+        ended = []
+        for row in rows:
+            if row.starts_at + dt.timedelta(minutes=row.duration_min) <= now:
+                ended.append(row.id)
+            elif earliest_running is None or row.starts_at < earliest_running:
+                earliest_running = row.starts_at
+
+        audit_rows: list[dict] = []
+        with engine.begin() as conn:
+            # Lease im selben Commit verlängern: ohne Lease keine Änderungen
+            if not acquire_lease(conn, LEASE_NAME, owner, lease_ttl_s):
+                result.lost_lease = True
+                return result
+            if ended:
+                done, counts, audit_rows = complete_clubs(conn, ended)
+                result.clubs_completed += len(done)
+                result.no_shows += counts["NO_SHOW"]
+                result.waitlist_cancelled += counts["CANCELLED"]
+        audit_writer.enqueue(audit_rows)
+        result.batches += 1
+
+    result.watermark = earliest_running or now
+    with engine.begin() as conn:
+        conn.execute(
+            update(leases).where(leases.c.name == LEASE_NAME, leases.c.owner == owner)
+            .values(watermark=result.watermark, last_run_at=now)
+        )
+    return result
+
+
+# ---------- Scheduler-Thread ----------
+
+class LifecycleScheduler:
+    """Periodischer run_once() in einem Daemon-Thread pro Prozess (lazy, fork-sicher)."""
+
+    def __init__(self) -> None:
+        self.app = None
+        self.enabled = False
+        self.interval_s = INTERVAL_S
+        self.owner = default_owner()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.runs = 0
+        self.leader_runs = 0
+        self.errors = 0
+        self.last_result: Optional[LifecycleResult] = None
+
+    def init_app(self, app) -> None:
+        self.app = app
+        self.enabled = os.getenv("LIFECYCLE_SCHEDULER", "0") == "1"
+        if self.enabled:
+            # erst beim ersten Request starten: Threads überleben kein fork() (gunicorn --preload)
+            app.before_request(self._ensure)
+
+    def _ensure(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.owner = default_owner()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="club-lifecycle", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def tick(self) -> Optional[LifecycleResult]:
+        with self.app.app_context():
+            try:
+                result = run_once(db.engine, owner=self.owner)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                log.exception("Club-Lifecycle-Lauf fehlgeschlagen")
+                return None
+        with self._lock:
+            self.runs += 1
+            if result is not None:
+                self.leader_runs += 1
+                self.last_result = result
+        if result is not None and result.clubs_completed:
+            log.info("Club-Lifecycle: %s", asdict(result))
+        return result
+
+    def _run(self) -> None:
+        # Jitter, damit nicht alle Worker gleichzeitig um den Lease konkurrieren
+        while not self._stop.wait(self.interval_s * random.uniform(0.9, 1.1)):
+            self.tick()
+
+    def close(self) -> None:
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as conn:
+                    release_lease(conn, LEASE_NAME, self.owner)
+        except Exception:
+            log.exception("Lease %s nicht freigegeben", LEASE_NAME)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "running": self._pid == os.getpid(),
+                "runs": self.runs,
+                "leader_runs": self.leader_runs,
+                "errors": self.errors,
+                "last_result": asdict(self.last_result) if self.last_result else None,
+            }
+
+
+lifecycle_scheduler = LifecycleScheduler()
+atexit.register(lifecycle_scheduler.close)
+
+
+# ---------- CLI ----------
+
+lifecycle_cli = AppGroup("lifecycle", help="Vergangene Clubs abschließen (COMPLETED/NO_SHOW).")
+
+
+def _echo_result(result: Optional[LifecycleResult]) -> None:
+    if result is None:
+        click.echo("Lease wird von einem anderen Worker gehalten – nichts zu tun.")
+        return
+    click.echo(
+        f"{result.clubs_completed} Club(s) abgeschlossen, {result.no_shows} NO_SHOW, "
+        f"{result.waitlist_cancelled} Wartelisten-Einträge storniert "
+        f"({result.batches} Batch(es), watermark={result.watermark:%Y-%m-%d %H:%M})"
+        + (" – Lease verloren, abgebrochen." if result.lost_lease else "")
+    )
+
+
+@lifecycle_cli.command("run")
+@click.option("--full", is_flag=True, help="Watermark ignorieren und alle vergangenen Clubs prüfen.")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def run_command(full: bool, batch_size: int):
+    owner = default_owner()
+    try:
+        _echo_result(run_once(db.engine, owner=owner, batch_size=batch_size, full=full))
+    finally:
+        with db.engine.begin() as conn:
+            release_lease(conn, LEASE_NAME, owner)
+        audit_writer.flush()
+
+
+@lifecycle_cli.command("loop")
+@click.option("--interval", default=INTERVAL_S, show_default=True, help="Sekunden zwischen zwei Läufen.")
+def loop_command(interval: float):
+    """Scheduler im Vordergrund (eigener Prozess statt Thread im Webserver)."""
+    from flask import current_app
+
+    scheduler = LifecycleScheduler()
+    scheduler.app = current_app._get_current_object()
+    scheduler.enabled = True
+    scheduler.interval_s = interval
+    scheduler._pid = os.getpid()
+    click.echo(f"Lifecycle-Scheduler läuft als {scheduler.owner}, alle {interval:g}s (Strg+C beendet).")
+    try:
+        while True:
+            result = scheduler.tick()
+            if result is not None and (result.clubs_completed or result.lost_lease):
+                _echo_result(result)
+            if scheduler._stop.wait(interval):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.close()
+        audit_writer.flush()
+
+
+@lifecycle_cli.command("status")
+def status_command():
+    with db.engine.connect() as conn:
+        lease = get_lease(conn, LEASE_NAME)
+        pending = conn.execute(
+            select(func.count()).select_from(clubs)
+            .where(clubs.c.status == "SCHEDULED", clubs.c.starts_at < utcnow())
+        ).scalar()
+    if lease is None:
+        click.echo("Noch kein Lauf.")
+    else:
+        click.echo(f"Lease: owner={lease.owner or '-'}, gültig bis {lease.expires_at:%Y-%m-%d %H:%M:%S} UTC")
+        click.echo(f"Watermark: {lease.watermark or '-'}, letzter Lauf: {lease.last_run_at or '-'}")
+    click.echo(f"Begonnene Clubs mit Status SCHEDULED: {pending}")
@@ -0,0 +1,338 @@
+# services/metrics.py
+"""
+Request- und SQL-Metriken pro Prozess, Ausgabe im Prometheus-Textformat (/metrics).
+
+- Middleware (before/after_request): Latenz pro Endpoint (URL-Regel, nicht der
+  konkrete Pfad → begrenzte Kardinalität), Methode und Status.
+- SQLAlchemy-Events auf allen Engines (before/after_cursor_execute): Anzahl
+  Queries und DB-Zeit pro Request sowie Dauer jeder einzelnen Query.
+- Pool-Checkout-Wartezeit: die Pool-Klasse des Dialekts wird um eine Zeitmessung
+  in _do_get() erweitert (SQLAlchemy hat dafür kein Event).
+- bcrypt-Zeit: services/passwords.py meldet jede Hash-/Prüfoperation.
+- Langsame Requests (SLOW_REQUEST_MS, 0 = aus) werden mit Query-Anzahl, DB-Zeit
+  und den langsamsten Statements geloggt; METRICS_LOG_SQL=0 lässt den SQL-Text weg.
+- /metrics nur mit METRICS_TOKEN und "Authorization: Bearer <token>"; ohne Token
+  ist der Endpunkt aus (404). Dasselbe Token schaltet die internen Zähler in
+  /health frei (authorized()).
+
+Jeder Worker-Prozess hat seine eigene Registry (gunicorn: pro Worker scrapen
+oder Labels über die Instanz unterscheiden).
+"""
+from __future__ import annotations
+import bisect
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import Counter as TallyCounter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from flask import Response, abort, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+BCRYPT_BUCKETS = (0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+MAX_TRACED_STATEMENTS = 200
+
+
+# ---------- Registry ----------
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    def __init__(self, name: str, doc: str, buckets: tuple[float, ...], labels: tuple[str, ...] = ()):
+        self.name, self.doc, self.labels = name, doc, labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label-Werte → [Zähler je Bucket (nicht kumuliert) + +Inf, Summe, Anzahl]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+        for values, (counts, total, n) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {n}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()):
+        self.name, self.doc, self.labels = name, doc, labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for values, v in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(self.labels, values)} {_fmt(v)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list = []
+        # Name → Callable, liefert zusätzliche Zeilen (Gauges zum Scrape-Zeitpunkt)
+        self.collectors: dict[str, Callable[[], list[str]]] = {}
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors.values():
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_duration = registry.add(Histogram(
+    "http_request_duration_seconds", "Dauer der HTTP-Requests.",
+    LATENCY_BUCKETS, ("endpoint", "method", "status")))
+request_queries = registry.add(Histogram(
+    "http_request_db_queries", "SQL-Statements pro HTTP-Request.",
+    QUERY_COUNT_BUCKETS, ("endpoint",)))
+request_db_time = registry.add(Histogram(
+    "http_request_db_seconds", "Summierte SQL-Zeit pro HTTP-Request.",
+    LATENCY_BUCKETS, ("endpoint",)))
+slow_requests = registry.add(Counter(
+    "http_slow_requests_total", "Requests über SLOW_REQUEST_MS.", ("endpoint",)))
+query_duration = registry.add(Histogram(
+    "db_query_duration_seconds", "Dauer einzelner SQL-Statements (alle Engines, auch Hintergrund-Threads).",
+    DB_BUCKETS))
+pool_wait = registry.add(Histogram(
+    "db_pool_checkout_wait_seconds", "Wartezeit auf eine Connection aus dem Pool.",
+    POOL_WAIT_BUCKETS))
+bcrypt_duration = registry.add(Histogram(
+    "bcrypt_duration_seconds", "Dauer von bcrypt-Operationen inkl. Wartezeit im Passwort-Pool.",
+    BCRYPT_BUCKETS, ("op",)))
+
+
+# ---------- Request-Kontext ----------
+
+@dataclass
+class RequestStats:
+    started: float
+    queries: int = 0
+    db_time: float = 0.0
+    bcrypt_time: float = 0.0
+    pool_wait: float = 0.0
+    statements: list[tuple[float, str]] = field(default_factory=list)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_metrics", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def _slow_threshold_s() -> float:
+    return float(os.getenv("SLOW_REQUEST_MS", "500")) / 1000
+
+
+def _log_sql() -> bool:
+    return os.getenv("METRICS_LOG_SQL", "1") == "1"
+
+
+# ---------- SQLAlchemy-Hooks ----------
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    context._metrics_t0 = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany):
+    t0 = getattr(context, "_metrics_t0", None)
+    if t0 is None:
+        return
+    elapsed = time.perf_counter() - t0
+    query_duration.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+        if len(stats.statements) < MAX_TRACED_STATEMENTS:
+            stats.statements.append((elapsed, statement))
+
+
+def observe_pool_wait(seconds: float) -> None:
+    pool_wait.observe(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+
+def observe_bcrypt(op: str, seconds: float) -> None:
+    bcrypt_duration.observe(seconds, op)
+    stats = _current.get()
+    if stats is not None:
+        stats.bcrypt_time += seconds
+
+
+_timed_pools: dict[type, type] = {}
+
+
+def timed_pool_class(pool_cls: type) -> type:
+    """Unterklasse der Pool-Klasse, die die Wartezeit in _do_get() misst."""
+    timed = _timed_pools.get(pool_cls)
+    if timed is None:
+        def _do_get(self):
+            t0 = time.perf_counter()
+            try:
+                return pool_cls._do_get(self)
+            finally:
+                observe_pool_wait(time.perf_counter() - t0)
+        timed = _timed_pools[pool_cls] = type(f"Timed{pool_cls.__name__}", (pool_cls,), {"_do_get": _do_get})
+    return timed
+
+
+# ---------- Flask ----------
+
+def _endpoint() -> str:
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _before_request() -> None:
+    g._metrics_token = _current.set(RequestStats(started=time.perf_counter()))
+
+
+def _after_request(response):
+    stats = _current.get()
+    if stats is None:
+        return response
+    elapsed = time.perf_counter() - stats.started
+    endpoint = _endpoint()
+    request_duration.observe(elapsed, endpoint, request.method, str(response.status_code))
+    request_queries.observe(stats.queries, endpoint)
+    request_db_time.observe(stats.db_time, endpoint)
+
+    threshold = _slow_threshold_s()
+    if threshold and elapsed >= threshold:
+        slow_requests.inc(endpoint)
+        _log_slow(endpoint, elapsed, response.status_code, stats)
+    return response
+
+
+def _teardown_request(_exc) -> None:
+    token = g.pop("_metrics_token", None)
+    if token is not None:
+        _current.reset(token)
+
+
+def _log_slow(endpoint: str, elapsed: float, status: int, stats: RequestStats) -> None:
+    lines = [
+        f"Langsamer Request {request.method} {endpoint} → {status}: {elapsed * 1000:.0f} ms, "
+        f"{stats.queries} Queries / {stats.db_time * 1000:.0f} ms DB, "
+        f"bcrypt {stats.bcrypt_time * 1000:.0f} ms, Pool-Wartezeit {stats.pool_wait * 1000:.0f} ms"
+    ]
+    if _log_sql() and stats.statements:
+        # gleiche Statements mehrfach → Hinweis auf N+1
+        repeated = TallyCounter(stmt for _, stmt in stats.statements).most_common(1)[0]
+        if repeated[1] > 1:
+            lines.append(f"  {repeated[1]}× dasselbe Statement: {' '.join(repeated[0].split())[:300]}")
+        for seconds, stmt in sorted(stats.statements, key=lambda s: s[0], reverse=True)[:5]:
+            lines.append(f"  {seconds * 1000:7.1f} ms  {' '.join(stmt.split())[:300]}")
+    log.warning("\n".join(lines))
+
+
+def _pool_gauges(app) -> list[str]:
+    from extensions import db
+
+    lines = []
+    with app.app_context():
+        pool = db.engine.pool
+    checked_out = getattr(pool, "checkedout", None)
+    size = getattr(pool, "size", None)
+    if callable(checked_out):
+        lines += ["# HELP db_pool_checked_out Aktuell ausgeliehene Connections.",
+                  "# TYPE db_pool_checked_out gauge", f"db_pool_checked_out {checked_out()}"]
+    if callable(size):
+        lines += ["# HELP db_pool_size Konfigurierte Pool-Größe.",
+                  "# TYPE db_pool_size gauge", f"db_pool_size {size()}"]
+    return lines
+
+
+def authorized() -> bool:
+    """Request trägt das METRICS_TOKEN (ohne konfiguriertes Token: nie)."""
+    token = os.getenv("METRICS_TOKEN")
+    if not token:
+        return False
+    given = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    return hmac.compare_digest(given, token)
+
+
+def _metrics_view():
+    if not os.getenv("METRICS_TOKEN"):
+        abort(404)
+    if not authorized():
+        abort(401)
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8",
+                    headers={"Cache-Control": "no-store"})
+
+
+def init_app(app) -> None:
+    """Vor init_extensions() aufrufen: ergänzt SQLALCHEMY_ENGINE_OPTIONS um die Pool-Messung."""
+    options = app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+    if "poolclass" not in options:
+        url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+        options["poolclass"] = timed_pool_class(url.get_dialect().get_pool_class(url))
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", _metrics_view, methods=["GET"])
+    registry.collectors["db_pool"] = lambda: _pool_gauges(app)
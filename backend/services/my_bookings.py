@@ -0,0 +1,129 @@
+# services/my_bookings.py
+"""
+"Meine Buchungen": anstehende und vergangene Enrollments eines Users samt Club.
+
+- enrollments.club_starts_at ist eine Kopie von clubs.starts_at; damit liefert
+  idx_enrollments_user_status_start (user_id, status, club_starts_at) pro Status
+  einen Range-Scan schon in Startreihenfolge – auch bei Tausenden historischer
+  Buchungen werden nur limit + 1 Zeilen pro Status gelesen.
+- list_bookings(): ein Statement – UNION ALL aus einem Keyset-Zweig pro
+  (Bereich, Status), gejoint auf Enrollment + Club (Enrollment.club lädt joined);
+  zusammengeführt wird in Python wie in services/club_search.py.
+- Pflege: beim INSERT übernimmt ein Subselect clubs.starts_at (keine Extra-Query),
+  bei Terminänderung eines Clubs werden seine Enrollments nachgezogen.
+"""
+from __future__ import annotations
+import datetime as dt
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import and_, event, inspect, literal, or_, select, union_all, update
+
+from extensions import db
+from models import Club, Enrollment
+from models.club.enrollment_model import WAITLIST_STATUS
+from .club_search import decode_cursor, encode_cursor
+
+enrollments = Enrollment.__table__
+clubs = Club.__table__
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+@dataclass(frozen=True)
+class Section:
+    statuses: tuple[str, ...]
+    ascending: bool  # anstehend: nächster Termin zuerst; vergangen: jüngster zuerst
+
+
+SECTIONS = {
+    "upcoming": Section(("CONFIRMED", WAITLIST_STATUS), ascending=True),
+    # CONFIRMED in der Vergangenheit: Club wurde vom Scheduler noch nicht abgeschlossen
+    "past": Section(("ATTENDED", "NO_SHOW", "CONFIRMED"), ascending=False),
+}
+
+
+# ---------- Pflege von enrollments.club_starts_at ----------
+
+@event.listens_for(Enrollment, "before_insert")
+def _copy_starts_at(_mapper, _conn, target: Enrollment) -> None:
+    if target.club_starts_at is None:
+        target.club_starts_at = (
+            select(clubs.c.starts_at).where(clubs.c.id == target.club_id).scalar_subquery()
+        )
+
+
+@event.listens_for(Club, "after_update")
+def _sync_starts_at(_mapper, conn, target: Club) -> None:
+    if not inspect(target).attrs.starts_at.history.has_changes():
+        return
+    conn.execute(
+        update(enrollments)
+        .where(enrollments.c.club_id == target.id)
+        .values(club_starts_at=target.starts_at, updated_at=enrollments.c.updated_at)
+    )
+
+
+# ---------- Abfrage ----------
+
+def _branch(user_id: int, scope: str, status: str, section: Section, now: dt.datetime,
+            after: Optional[tuple[dt.datetime, int]], limit: int):
+    start, eid = enrollments.c.club_starts_at, enrollments.c.id
+    if section.ascending:
+        clauses = [start >= now]
+        if after is not None:
+            ts, last_id = after
+            clauses += [start >= ts, or_(start > ts, and_(start == ts, eid > last_id))]
+        order = (start.asc(), eid.asc())
+    else:
+        clauses = [start < now]
+        if after is not None:
+            ts, last_id = after
+            clauses += [start <= ts, or_(start < ts, and_(start == ts, eid < last_id))]
+        order = (start.desc(), eid.desc())
+    # als abgeleitete Tabelle: ORDER BY/LIMIT pro Zweig (SQLite erlaubt es sonst nicht)
+    sub = (
+        select(eid.label("id"), literal(scope).label("scope"))
+        .where(enrollments.c.user_id == user_id, enrollments.c.status == status, *clauses)
+        .order_by(*order)
+        .limit(limit)
+        .subquery()
+    )
+    return select(sub.c.id, sub.c.scope)
+
+
+def list_bookings(user_id: int, scopes: tuple[str, ...], *, limit: int = DEFAULT_LIMIT,
+                  cursors: Optional[dict[str, str]] = None,
+                  now: Optional[dt.datetime] = None) -> dict[str, tuple[list[Enrollment], Optional[str]]]:
+    """
+    {scope: (enrollments, next_cursor)} für die gewünschten Bereiche.
+    Wirft ValueError bei kaputtem Cursor.
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    now = now or dt.datetime.utcnow()
+    cursors = cursors or {}
+    afters = {scope: decode_cursor(cursors[scope]) if cursors.get(scope) else None for scope in scopes}
+
+    branches = [
+        _branch(user_id, scope, status, SECTIONS[scope], now, afters[scope], limit + 1)
+        for scope in scopes
+        for status in SECTIONS[scope].statuses
+    ]
+    mine = union_all(*branches).subquery("mine")
+    rows = db.session.execute(
+        select(Enrollment, mine.c.scope).join(mine, mine.c.id == Enrollment.id)
+    ).all()
+
+    by_scope: dict[str, list[Enrollment]] = {scope: [] for scope in scopes}
+    for enr, scope in rows:
+        by_scope[scope].append(enr)
+
+    result = {}
+    for scope, items in by_scope.items():
+        section = SECTIONS[scope]
+        items.sort(key=lambda e: (e.club_starts_at, e.id), reverse=not section.ascending)
+        page, more = items[:limit], len(items) > limit
+        next_cursor = encode_cursor(page[-1].club_starts_at, page[-1].id) if more else None
+        result[scope] = (page, next_cursor)
+    return result
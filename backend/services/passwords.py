@@ -0,0 +1,111 @@
+# services/passwords.py
+"""
+bcrypt in einem eigenen, begrenzten Worker-Pool.
+
+- Höchstens PASSWORD_POOL_WORKERS Hashes laufen gleichzeitig (bcrypt gibt die
+  GIL frei, Threads reichen daher), der Rest des Prozesses bleibt für billige
+  Endpunkte wie /health oder /api/auth/me frei.
+- Höchstens PASSWORD_POOL_QUEUE Jobs warten zusätzlich; ist die Warteschlange
+  voll, wird sofort PasswordPoolBusy geworfen (→ 503 statt Request-Stau).
+- needs_rehash(): erkennt Hashes mit veraltetem Cost-Faktor (BCRYPT_ROUNDS).
+- Jede Operation meldet ihre Dauer (inkl. Wartezeit im Pool) an services/metrics.py.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Optional, TypeVar
+
+import bcrypt
+
+from .metrics import observe_bcrypt
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusy(Exception):
+    """Passwort-Pool ausgelastet – Client soll es später erneut versuchen."""
+
+
+def configured_rounds() -> int:
+    return int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+class _PasswordPool:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+
+    def _ensure(self) -> None:
+        # Lazy + pro Prozess: Threads überleben kein fork() (gunicorn --preload)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            workers = int(os.getenv("PASSWORD_POOL_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+            queue = int(os.getenv("PASSWORD_POOL_QUEUE", "16"))
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+            self._slots = threading.BoundedSemaphore(workers + queue)
+            self._pid = os.getpid()
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        self._ensure()
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            fut = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _f: self._slots.release())
+        try:
+            return fut.result(timeout=float(os.getenv("PASSWORD_POOL_TIMEOUT_S", "5")))
+        except FutureTimeout:
+            fut.cancel()
+            raise PasswordPoolBusy()
+
+
+_pool = _PasswordPool()
+
+
+# ---------- bcrypt-Jobs (laufen im Pool) ----------
+
+def _hash(pw: str, rounds: int) -> bytes:
+    return bcrypt.hashpw(pw.encode("utf-8"), bcrypt.gensalt(rounds=rounds))
+
+
+def _check(pw: str, hashed: bytes) -> bool:
+    try:
+        return bcrypt.checkpw(pw.encode("utf-8"), hashed)
+    except Exception:
+        return False
+
+
+# ---------- Öffentliche API ----------
+
+def _timed(op: str, fn: Callable[..., T], *args) -> T:
+    t0 = time.perf_counter()
+    try:
+        return _pool.run(fn, *args)
+    finally:
+        observe_bcrypt(op, time.perf_counter() - t0)
+
+
+def hash_password(pw: str) -> bytes:
+    return _timed("hash", _hash, pw, configured_rounds())
+
+
+def verify_password(pw: str, hashed: bytes) -> bool:
+    return _timed("check", _check, pw, hashed)
+
+
+def needs_rehash(hashed: bytes) -> bool:
+    """$2b$12$... → True, wenn der Cost-Faktor nicht BCRYPT_ROUNDS entspricht."""
+    try:
+        return int(bytes(hashed).split(b"$")[2]) != configured_rounds()
+    except (IndexError, ValueError):
+        return True
@@ -0,0 +1,211 @@
+# services/query_guard.py
+"""
+Schutz vor N+1-Abfragen.
+
+- Ladestrategien stehen in den Modellen: Beziehungen, die fast immer mitgebraucht
+  werden, laden eager (joined); alle anderen sind lazy="raise_on_sql" – ein
+  versehentliches Nachladen pro Zeile wirft sofort, statt still N Queries zu
+  erzeugen. Wer eine Beziehung braucht, lädt sie explizit (selectinload/joinedload).
+- query_budget(n): Decorator für Routen. Nach jedem Request wird die Query-Anzahl
+  mit dem Budget verglichen; Überschreitungen werden geloggt, mit
+  QUERY_BUDGET_STRICT=1 (Tests/CI) als TooManyQueries geworfen. Abfragen in
+  bounded_fanout() zählen nicht mit. Gestreamte Antworten werden nur bis zum
+  Ende der View erfasst.
+- assert_max_queries(n): Kontextmanager für Tests und Skripte
+  (scripts/query_budget_check.py).
+- QUERY_DEBUG=1: pro Request werden alle Statements mit Aufrufstelle erfasst;
+  dasselbe Statement ≥ N_PLUS_ONE_THRESHOLD mal von derselben Stelle wird als
+  N+1-Verdacht geloggt. Bewusste, begrenzte Auffächerung (z. B. eine Seite pro
+  Level in services/club_search.py) wird mit bounded_fanout() markiert.
+"""
+from __future__ import annotations
+import logging
+import os
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, TypeVar
+
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+log = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def _debug_enabled() -> bool:
+    return os.getenv("QUERY_DEBUG", "0") == "1"
+
+
+def _strict() -> bool:
+    return os.getenv("QUERY_BUDGET_STRICT", "0") == "1"
+
+
+def n_plus_one_threshold() -> int:
+    return int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class TooManyQueries(AssertionError):
+    pass
+
+
+# ---------- Erfassung ----------
+
+@dataclass
+class QueryLog:
+    capture_sites: bool = True
+    # (Statement, Aufrufstelle, innerhalb bounded_fanout())
+    statements: list[tuple[str, Optional[str], bool]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def counted(self) -> int:
+        """Queries fürs Budget – bounded_fanout() zählt nicht, sie ist per Konstruktion begrenzt."""
+        return sum(1 for _, _, fanout in self.statements if not fanout)
+
+
+_active: ContextVar[tuple[QueryLog, ...]] = ContextVar("query_logs", default=())
+_fanout: ContextVar[int] = ContextVar("query_fanout", default=0)
+
+
+def _call_site() -> Optional[str]:
+    """Erster Frame im App-Code (außerhalb dieses Moduls und der Bibliotheken)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if (filename.startswith(APP_ROOT) and filename != _THIS_FILE
+                and "site-packages" not in filename):
+            return f"{os.path.relpath(filename, APP_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+    logs = _active.get()
+    if not logs:
+        return
+    site = _call_site() if any(entry.capture_sites for entry in logs) else None
+    fanout = _fanout.get() > 0
+    for entry in logs:
+        entry.statements.append((statement, site, fanout))
+
+
+@contextmanager
+def bounded_fanout() -> Iterator[None]:
+    """Markiert gewollte, begrenzte Wiederholungen (kein N+1-Verdacht)."""
+    token = _fanout.set(_fanout.get() + 1)
+    try:
+        yield
+    finally:
+        _fanout.reset(token)
+
+
+def find_n_plus_one(query_log: QueryLog, threshold: Optional[int] = None) -> list[tuple[str, Optional[str], int]]:
+    """[(Statement, Aufrufstelle, Anzahl)] für Wiederholungen ≥ threshold."""
+    threshold = threshold or n_plus_one_threshold()
+    counts: dict[tuple[str, Optional[str]], int] = defaultdict(int)
+    for statement, site, fanout in query_log.statements:
+        if not fanout:
+            counts[(statement, site)] += 1
+    return sorted(
+        ((stmt, site, n) for (stmt, site), n in counts.items() if n >= threshold),
+        key=lambda x: -x[2],
+    )
+
+
+def _short(statement: str, width: int = 200) -> str:
+    return " ".join(statement.split())[:width]
+
+
+def describe(query_log: QueryLog, limit: int = 20) -> str:
+    lines = [f"  {site or '?'}: {_short(stmt)}" for stmt, site, _ in query_log.statements[:limit]]
+    if len(query_log) > limit:
+        lines.append(f"  ... {len(query_log) - limit} weitere")
+    return "\n".join(lines)
+
+
+# ---------- Test-/Skript-Helfer ----------
+
+@contextmanager
+def assert_max_queries(max_queries: int, *, label: str = "Block",
+                       capture_sites: bool = True) -> Iterator[QueryLog]:
+    """
+    with assert_max_queries(3, label="GET /eventdata"):
+        client.get("/eventdata")
+    Wirft TooManyQueries mit allen Statements und Aufrufstellen.
+    """
+    query_log = QueryLog(capture_sites=capture_sites)
+    token = _active.set(_active.get() + (query_log,))
+    try:
+        yield query_log
+    finally:
+        _active.reset(token)
+    if query_log.counted() > max_queries:
+        raise TooManyQueries(
+            f"{label}: {query_log.counted()} Queries, erlaubt {max_queries}\n{describe(query_log)}"
+        )
+
+
+# ---------- Routen-Budgets ----------
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Direkt unter @bp.get(...) setzen, damit das Attribut an der registrierten View hängt."""
+    def decorator(view: F) -> F:
+        view._query_budget = max_queries
+        return view
+    return decorator
+
+
+def budget_for(endpoint: Optional[str]) -> Optional[int]:
+    view = current_app.view_functions.get(endpoint) if endpoint else None
+    return getattr(view, "_query_budget", None)
+
+
+def _before_request() -> None:
+    debug = _debug_enabled()
+    if debug or budget_for(request.endpoint) is not None:
+        query_log = QueryLog(capture_sites=debug)
+        g._query_log = query_log
+        g._query_log_token = _active.set(_active.get() + (query_log,))
+
+
+def _after_request(response):
+    query_log: Optional[QueryLog] = g.get("_query_log")
+    if query_log is None:
+        return response
+    endpoint = request.url_rule.rule if request.url_rule is not None else request.path
+
+    if query_log.capture_sites:
+        for statement, site, n in find_n_plus_one(query_log):
+            log.warning("N+1-Verdacht in %s %s: %d× von %s\n  %s",
+                        request.method, endpoint, n, site or "?", _short(statement, 400))
+
+    budget = budget_for(request.endpoint)
+    count = query_log.counted()
+    if budget is not None and count > budget:
+        message = f"{request.method} {endpoint}: {count} Queries, Budget {budget}\n{describe(query_log)}"
+        if _strict():
+            raise TooManyQueries(message)
+        log.warning("Query-Budget überschritten – %s", message)
+    return response
+
+
+def _teardown_request(_exc) -> None:
+    token = g.pop("_query_log_token", None)
+    if token is not None:
+        _active.reset(token)
+
+
+def init_app(app) -> None:
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
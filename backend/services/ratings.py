@@ -0,0 +1,319 @@
+# services/ratings.py
+"""
+Bewertungs-Aggregate pro Club (club_ratings) und pro Host (host_ratings).
+
+- Pflege inkrementell im Flush, der ein Review anlegt, ändert oder löscht:
+  Anzahl, Summe und Histogramm (rating_1..rating_5) per Upsert, in derselben
+  Transaktion wie das Review. Eine Abfrage pro Flush ermittelt Club und Host
+  der betroffenen Enrollments; kein AVG über reviews → enrollments → clubs.
+- Lesen: get_club_ratings()/get_host_rating() per PK, top_hosts() sortiert nur
+  host_ratings (Mindestanzahl über idx_host_ratings_count) und holt danach die
+  Namen der Top-N per PK.
+- `flask ratings rebuild` baut beide Tabellen aus reviews neu auf (Backfill,
+  Drift z. B. nach DB-seitigem ON DELETE CASCADE).
+"""
+from __future__ import annotations
+import datetime as dt
+from collections import defaultdict
+from typing import Iterable, Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club, ClubRating, Enrollment, HostRating, Review, User
+from models.club.club_rating_model import RATING_COLUMNS
+from .sql_util import upsert
+
+club_ratings = ClubRating.__table__
+host_ratings = HostRating.__table__
+reviews = Review.__table__
+enrollments = Enrollment.__table__
+clubs = Club.__table__
+users = User.__table__
+
+RATINGS = tuple(RATING_COLUMNS)
+COUNT_COLUMNS = ("review_count", "rating_sum", *RATING_COLUMNS.values())
+DEFAULT_MIN_REVIEWS = 5
+MAX_TOP = 100
+
+Deltas = dict[str, int]
+
+
+# ---------- Inkrementelle Pflege ----------
+
+def _add(deltas: Deltas, rating: int, sign: int) -> None:
+    deltas["review_count"] += sign
+    deltas["rating_sum"] += sign * rating
+    deltas[RATING_COLUMNS[rating]] += sign
+
+
+def apply_deltas(conn, table, key: str, subject_id: int, deltas: Deltas) -> None:
+    deltas = {col: d for col, d in deltas.items() if d}
+    if not deltas:
+        return
+    now = func.current_timestamp()
+    upsert(
+        conn,
+        table,
+        {key: subject_id, **{col: max(d, 0) for col, d in deltas.items()}, "last_change_at": now},
+        {**{col: table.c[col] + d for col, d in deltas.items()}, "last_change_at": now},
+    )
+
+
+def _old_rating(review: Review) -> Optional[int]:
+    hist = inspect(review).attrs.rating.history
+    if hist.deleted:
+        return hist.deleted[0]
+    if hist.unchanged:
+        return hist.unchanged[0]
+    return None
+
+
+def _changes(session: Session) -> list[tuple[Review, Optional[int], Optional[int]]]:
+    """[(Review, alte Bewertung, neue Bewertung)]; None = nicht vorhanden."""
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Review):
+            changes.append((obj, None, obj.rating))
+    for obj in session.deleted:
+        if isinstance(obj, Review):
+            changes.append((obj, _old_rating(obj), None))
+    for obj in session.dirty:
+        if isinstance(obj, Review) and inspect(obj).attrs.rating.history.has_changes():
+            old = _old_rating(obj)
+            if old != obj.rating:
+                changes.append((obj, old, obj.rating))
+    return changes
+
+
+def _enrollment_id(review: Review) -> Optional[int]:
+    if review.enrollment_id is not None:
+        return review.enrollment_id
+    # per Beziehung zugewiesen, FK noch nicht synchronisiert
+    enr = inspect(review).dict.get("enrollment")
+    return enr.id if enr is not None else None
+
+
+@event.listens_for(Session, "before_flush")
+def _sync_ratings(session: Session, _flush_context, _instances) -> None:
+    changes = [(r, old, new) for r, old, new in _changes(session) if old is not None or new is not None]
+    if not changes:
+        return
+    conn = session.connection()
+    ids = {_enrollment_id(r) for r, _, _ in changes} - {None}
+    owners = {
+        eid: (club_id, host_id)
+        for eid, club_id, host_id in conn.execute(
+            select(enrollments.c.id, clubs.c.id, clubs.c.host_id)
+            .join(clubs, clubs.c.id == enrollments.c.club_id)
+            .where(enrollments.c.id.in_(ids))
+        )
+    }
+
+    per_club: dict[int, Deltas] = defaultdict(lambda: defaultdict(int))
+    per_host: dict[int, Deltas] = defaultdict(lambda: defaultdict(int))
+    for review, old, new in changes:
+        owner = owners.get(_enrollment_id(review))
+        if owner is None:
+            continue  # Enrollment existiert nicht (mehr) – FK-Fehler bzw. Cascade
+        club_id, host_id = owner
+        for target in (per_club[club_id], per_host[host_id]):
+            if old is not None:
+                _add(target, old, -1)
+            if new is not None:
+                _add(target, new, +1)
+
+    # feste Reihenfolge → gleiche Sperrreihenfolge über parallele Transaktionen
+    for club_id in sorted(per_club):
+        apply_deltas(conn, club_ratings, "club_id", club_id, per_club[club_id])
+    for host_id in sorted(per_host):
+        apply_deltas(conn, host_ratings, "host_id", host_id, per_host[host_id])
+
+
+# ---------- Lesen ----------
+
+def _payload(row) -> dict:
+    count = (row["review_count"] or 0) if row is not None else 0
+    total = (row["rating_sum"] or 0) if row is not None else 0
+    return {
+        "count": count,
+        "average": round(total / count, 2) if count > 0 else None,
+        "histogram": {str(r): ((row[col] or 0) if row is not None else 0) for r, col in RATING_COLUMNS.items()},
+    }
+
+
+def get_club_ratings(club_ids: Iterable[int]) -> dict[int, dict]:
+    """{club_id: payload} für existierende Clubs (ohne Bewertung: count 0)."""
+    ids = sorted(set(club_ids))
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        select(clubs.c.id, *[club_ratings.c[c] for c in COUNT_COLUMNS])
+        .select_from(clubs.outerjoin(club_ratings, club_ratings.c.club_id == clubs.c.id))
+        .where(clubs.c.id.in_(ids))
+    ).mappings().all()
+    return {row["id"]: _payload(row) for row in rows}
+
+
+def get_host_rating(host_id: int) -> dict:
+    row = db.session.execute(
+        select(*[host_ratings.c[c] for c in COUNT_COLUMNS]).where(host_ratings.c.host_id == host_id)
+    ).mappings().first()
+    return _payload(row)
+
+
+def top_hosts(limit: int = 10, min_reviews: int = DEFAULT_MIN_REVIEWS) -> list[dict]:
+    limit = max(1, min(int(limit), MAX_TOP))
+    average = (host_ratings.c.rating_sum * 1.0 / host_ratings.c.review_count).label("average")
+    top = (
+        select(host_ratings, average)
+        .where(host_ratings.c.review_count >= max(1, min_reviews))
+        .order_by(average.desc(), host_ratings.c.review_count.desc(), host_ratings.c.host_id)
+        .limit(limit)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(top, users.c.first_name, users.c.last_name)
+        .join(users, users.c.id == top.c.host_id)
+        .order_by(top.c.average.desc(), top.c.review_count.desc(), top.c.host_id)
+    ).mappings().all()
+    return [
+        {
+            "host_id": row["host_id"],
+            # wie öffentlich üblich: Vorname + Initiale
+            "name": f"{row['first_name']} {row['last_name'][:1]}.".strip(),
+            **_payload(row),
+        }
+        for row in rows
+    ]
+
+
+def club_reviews(club_id: int, *, limit: int = 50) -> list[dict]:
+    """Reviews eines Clubs (über idx_enrollments_club + uq_reviews_enrollment), neueste zuerst."""
+    rows = db.session.execute(
+        select(reviews.c.id, reviews.c.rating, reviews.c.comment, reviews.c.created_at,
+               users.c.first_name)
+        .join(enrollments, enrollments.c.id == reviews.c.enrollment_id)
+        .join(users, users.c.id == enrollments.c.user_id)
+        .where(enrollments.c.club_id == club_id)
+        .order_by(reviews.c.id.desc())
+        .limit(limit)
+    ).mappings().all()
+    return [
+        {
+            "id": row["id"],
+            "rating": row["rating"],
+            "comment": row["comment"],
+            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+            "author": row["first_name"],
+        }
+        for row in rows
+    ]
+
+
+# ---------- Reviews schreiben (Aggregate zieht der Flush-Hook nach) ----------
+
+MAX_COMMENT = 2000
+DUPLICATE_MESSAGE = "Dieser Club wurde bereits bewertet."
+
+
+class ReviewError(Exception):
+    def __init__(self, msg: str, code: int = 400):
+        super().__init__(msg)
+        self.msg = msg
+        self.code = code
+
+
+def create_review(user_id: int, club_id: int, rating: int, comment: Optional[str]) -> Review:
+    enr = Enrollment.query.filter_by(user_id=user_id, club_id=club_id).first()
+    if enr is None or enr.status != "ATTENDED":
+        raise ReviewError("Nur Teilnehmende eines vergangenen Clubs können bewerten.", 403)
+    if db.session.execute(select(reviews.c.id).where(reviews.c.enrollment_id == enr.id)).first():
+        raise ReviewError(DUPLICATE_MESSAGE, 409)
+    review = Review(enrollment_id=enr.id, rating=rating, comment=comment)
+    db.session.add(review)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # paralleler Doppelklick: uq_reviews_enrollment hat zwischen Prüfung und INSERT gegriffen
+        db.session.rollback()
+        raise ReviewError(DUPLICATE_MESSAGE, 409)
+    return review
+
+
+def _own_review(user_id: int, review_id: int) -> Review:
+    # Review.enrollment lädt joined → Besitzprüfung ohne weitere Query
+    review = db.session.get(Review, review_id)
+    if review is None or review.enrollment.user_id != user_id:
+        raise ReviewError("Bewertung nicht gefunden.", 404)
+    return review
+
+
+def update_review(user_id: int, review_id: int, *, rating: Optional[int] = None,
+                  comment: Optional[str] = None, clear_comment: bool = False) -> Review:
+    review = _own_review(user_id, review_id)
+    if rating is not None:
+        review.rating = rating
+    if comment is not None or clear_comment:
+        review.comment = comment
+    db.session.commit()
+    return review
+
+
+def delete_review(user_id: int, review_id: int) -> None:
+    db.session.delete(_own_review(user_id, review_id))
+    db.session.commit()
+
+
+# ---------- Rebuild ----------
+
+def rebuild_ratings(conn, *, batch_size: int = 1000) -> tuple[int, int]:
+    """Ersetzt club_ratings und host_ratings komplett. Rückgabe: (Clubs, Hosts)."""
+    per_club: dict[int, Deltas] = defaultdict(lambda: defaultdict(int))
+    per_host: dict[int, Deltas] = defaultdict(lambda: defaultdict(int))
+    rows = conn.execute(
+        select(clubs.c.id, clubs.c.host_id, reviews.c.rating, func.count())
+        .select_from(reviews.join(enrollments, enrollments.c.id == reviews.c.enrollment_id)
+                     .join(clubs, clubs.c.id == enrollments.c.club_id))
+        .group_by(clubs.c.id, clubs.c.host_id, reviews.c.rating)
+    )
+    for club_id, host_id, rating, n in rows:
+        if rating not in RATING_COLUMNS:
+            continue
+        for target in (per_club[club_id], per_host[host_id]):
+            target["review_count"] += n
+            target["rating_sum"] += n * rating
+            target[RATING_COLUMNS[rating]] += n
+
+    now = dt.datetime.utcnow()
+    for table, key, data in ((club_ratings, "club_id", per_club), (host_ratings, "host_id", per_host)):
+        conn.execute(delete(table))
+        items = [{key: k, **{c: d.get(c, 0) for c in COUNT_COLUMNS}, "last_change_at": now}
+                 for k, d in sorted(data.items())]
+        for i in range(0, len(items), batch_size):
+            conn.execute(insert(table), items[i:i + batch_size])
+    return len(per_club), len(per_host)
+
+
+# ---------- CLI ----------
+
+ratings_cli = AppGroup("ratings", help="Bewertungs-Aggregate (club_ratings, host_ratings).")
+
+
+@ratings_cli.command("rebuild")
+def rebuild_command():
+    with db.engine.begin() as conn:
+        n_clubs, n_hosts = rebuild_ratings(conn)
+    click.echo(f"Bewertungen neu aggregiert: {n_clubs} Club(s), {n_hosts} Host(s).")
+
+
+@ratings_cli.command("top-hosts")
+@click.option("--limit", default=10, show_default=True)
+@click.option("--min-reviews", default=DEFAULT_MIN_REVIEWS, show_default=True)
+def top_hosts_command(limit: int, min_reviews: int):
+    for row in top_hosts(limit, min_reviews):
+        click.echo(f"{row['average']:.2f}  ({row['count']:>5})  #{row['host_id']}  {row['name']}")
@@ -0,0 +1,268 @@
+# services/recommendations.py
+"""
+"Wer das gebucht hat, buchte auch …" – Club-Empfehlungen aus Co-Occurrence.
+
+Offline (`flask recommendations build`, z. B. stündlich per Cron):
+- Kandidaten: geplante Clubs (SCHEDULED, starts_at >= jetzt).
+- Interaktionsmatrix User × Kandidat als CSR-Arrays (NumPy): aktive/besuchte
+  Buchungen (Gewicht 1.0) und Merkzettel (WISHLIST_WEIGHT), je Paar das Maximum.
+- Item-Item-Kosinus X^T X / (|x_i| |x_j|) nur über Paare, die ein User
+  tatsächlich gemeinsam hat (dünn besetzt, in Blöcken von höchstens
+  PAIR_CHUNK Paaren) und nur zwischen kompatiblen Levels (Abstand in der
+  Katalog-Reihenfolge <= LEVEL_DISTANCE).
+- Pro Club die Top-k Nachbarn in club_recommendations; Neuaufbau in einer
+  Transaktion, Leser sehen die alte oder die neue Tabelle.
+
+Online: recommendations_for() liest den PK-Bereich (club_id, rank) und joint die
+Nachbar-Clubs per PK – eine Abfrage, ohne Aggregation über enrollments/wishlists.
+NumPy braucht nur der Batch-Job; die App läuft auch ohne.
+"""
+from __future__ import annotations
+import datetime as dt
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, insert, literal, select
+
+from extensions import db
+from models import Club, ClubRecommendation, Enrollment, Level, Wishlist
+from models.club.enrollment_model import WAITLIST_STATUS
+
+try:
+    import numpy as np
+except ImportError:  # optional, siehe requirements.txt
+    np = None
+
+recommendations = ClubRecommendation.__table__
+clubs = Club.__table__
+enrollments = Enrollment.__table__
+wishlists = Wishlist.__table__
+levels = Level.__table__
+
+# Buchungen, die als Interesse zählen (CANCELLED/NO_SHOW nicht)
+SIGNAL_STATUSES = ("CONFIRMED", WAITLIST_STATUS, "ATTENDED")
+WISHLIST_WEIGHT = 0.5
+LEVEL_DISTANCE = 1
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_COMMON = 2
+# User mit mehr Interaktionen (Hosts, Testkonten) tragen kaum Signal, kosten aber n² Paare
+MAX_ITEMS_PER_USER = 200
+PAIR_CHUNK = 4_000_000
+MAX_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    clubs: int
+    users: int
+    interactions: int
+    pairs: int
+    rows: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class InteractionMatrix:
+    """User × Club im CSR-Format: Zeile u belegt indices/data[indptr[u]:indptr[u+1]]."""
+    indptr: "np.ndarray"
+    indices: "np.ndarray"
+    data: "np.ndarray"
+    n_clubs: int
+
+    @property
+    def n_users(self) -> int:
+        return len(self.indptr) - 1
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("NumPy ist nicht installiert (pip install numpy).")
+
+
+# ---------- Matrix ----------
+
+def build_matrix(user_ids, cols, weights, n_clubs: int, *,
+                 max_items: int = MAX_ITEMS_PER_USER) -> InteractionMatrix:
+    """COO (user_id, Spalte, Gewicht) → CSR; doppelte Paare behalten das höchste Gewicht."""
+    _require_numpy()
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float32)
+    if not len(user_ids):
+        return InteractionMatrix(np.zeros(1, np.int64), cols[:0], weights[:0], n_clubs)
+
+    _, rows = np.unique(user_ids, return_inverse=True)
+    keys = rows * n_clubs + cols
+    order = np.lexsort((-weights, keys))
+    keys, weights = keys[order], weights[order]
+    first = np.r_[True, keys[1:] != keys[:-1]]
+    keys, weights = keys[first], weights[first]
+    rows, cols = keys // n_clubs, keys % n_clubs
+
+    counts = np.bincount(rows)
+    keep = counts[rows] <= max_items
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+    # Zeilen ohne Einträge (gekappte User) fallen durch die Neunummerierung weg
+    _, rows = np.unique(rows, return_inverse=True)
+    indptr = np.zeros(rows.max() + 2 if len(rows) else 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows), out=indptr[1:])
+    return InteractionMatrix(indptr, cols.astype(np.int32), weights, n_clubs)
+
+
+def cooccurrence(m: InteractionMatrix, positions, *, level_distance: int = LEVEL_DISTANCE,
+                 pair_chunk: int = PAIR_CHUNK):
+    """
+    Dünnes X^T X ohne Diagonale: (a, b, Skalarprodukt, gemeinsame User) je
+    Club-Paar mit kompatiblem Level. Erzeugt pro User alle Paare seiner
+    Einträge, blockweise über die User.
+    """
+    _require_numpy()
+    n = m.n_clubs
+    counts = np.diff(m.indptr)
+    pairs_per_user = counts.astype(np.int64) ** 2
+    cum = np.cumsum(pairs_per_user)
+    # User-Grenzen der Blöcke (ein User passt dank MAX_ITEMS_PER_USER immer in einen Block)
+    cuts = np.searchsorted(cum, np.arange(pair_chunk, cum[-1] if len(cum) else 0, pair_chunk), side="right")
+    bounds = np.unique(np.r_[0, cuts, m.n_users])
+
+    parts_k, parts_w, parts_c = [], [], []
+    for u0, u1 in zip(bounds[:-1], bounds[1:]):
+        c = counts[u0:u1]
+        lo, hi = m.indptr[u0], m.indptr[u1]
+        if hi == lo:
+            continue
+        user_of = np.repeat(np.arange(u1 - u0), c)      # je Eintrag: User im Block
+        reps = c[user_of]                                # je Eintrag: Partner inkl. sich selbst
+        left = np.repeat(np.arange(lo, hi), reps)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(reps) - reps, reps)
+        right = np.repeat(m.indptr[u0:u1][user_of], reps) + offsets
+
+        a, b = m.indices[left], m.indices[right]
+        keep = (a != b) & (np.abs(positions[a] - positions[b]) <= level_distance)
+        keys = a[keep].astype(np.int64) * n + b[keep]
+        w = (m.data[left] * m.data[right])[keep]
+        uk, inv = np.unique(keys, return_inverse=True)
+        parts_k.append(uk)
+        parts_w.append(np.bincount(inv, weights=w))
+        parts_c.append(np.bincount(inv))
+
+    if not parts_k:
+        empty = np.zeros(0, np.int64)
+        return empty, empty, np.zeros(0), empty
+    keys = np.concatenate(parts_k)
+    uk, inv = np.unique(keys, return_inverse=True)
+    dots = np.bincount(inv, weights=np.concatenate(parts_w))
+    common = np.bincount(inv, weights=np.concatenate(parts_c)).astype(np.int64)
+    return uk // n, uk % n, dots, common
+
+
+def top_neighbours(m: InteractionMatrix, a, b, dots, common, *, top_k: int, min_common: int):
+    """Kosinus je Paar, pro Quell-Club die top_k besten: (a, b, score, rank ab 1)."""
+    norms = np.sqrt(np.bincount(m.indices, weights=m.data.astype(np.float64) ** 2, minlength=m.n_clubs))
+    keep = common >= min_common
+    a, b, dots = a[keep], b[keep], dots[keep]
+    score = dots / (norms[a] * norms[b])
+
+    # je Quelle absteigend nach Score, bei Gleichstand stabil nach Spalte
+    order = np.lexsort((b, -score, a))
+    a, b, score = a[order], b[order], score[order]
+    if not len(a):
+        return a, b, score, a
+    starts = np.flatnonzero(np.r_[True, a[1:] != a[:-1]])
+    rank = np.arange(len(a)) - np.repeat(starts, np.diff(np.r_[starts, len(a)]))
+    keep = rank < top_k
+    return a[keep], b[keep], score[keep], rank[keep] + 1
+
+
+# ---------- Batch-Job ----------
+
+def _level_positions(conn, codes) -> "np.ndarray":
+    # Reihenfolge wie services/level_catalog.py (Codes sortieren in Niveau-Reihenfolge)
+    known = sorted(conn.execute(select(levels.c.code)).scalars())
+    pos = {code: i for i, code in enumerate(known)}
+    # unbekannte Codes: weit weg von allen anderen, nur mit sich selbst kompatibel
+    spacing = LEVEL_DISTANCE + 1
+    for code in sorted(set(codes) - pos.keys()):
+        pos[code] = len(known) + spacing * (len(pos) - len(known) + 1)
+    return np.fromiter((pos[c] for c in codes), dtype=np.int64, count=len(codes))
+
+
+def build_recommendations(conn, *, top_k: int = DEFAULT_TOP_K, min_common: int = DEFAULT_MIN_COMMON,
+                          now: Optional[dt.datetime] = None, batch_size: int = 5000) -> BuildResult:
+    """Berechnet club_recommendations komplett neu; Commit macht der Aufrufer."""
+    _require_numpy()
+    t0 = time.perf_counter()
+    now = now or dt.datetime.utcnow()
+    upcoming = (clubs.c.status == "SCHEDULED") & (clubs.c.starts_at >= now)
+
+    candidates = conn.execute(select(clubs.c.id, clubs.c.level_code).where(upcoming).order_by(clubs.c.id)).all()
+    club_ids = np.fromiter((r[0] for r in candidates), dtype=np.int64, count=len(candidates))
+    positions = _level_positions(conn, [r[1] for r in candidates])
+
+    signal = conn.execute(
+        select(enrollments.c.user_id, enrollments.c.club_id, literal(1.0))
+        .join(clubs, clubs.c.id == enrollments.c.club_id)
+        .where(upcoming, enrollments.c.status.in_(SIGNAL_STATUSES))
+        .union_all(
+            select(wishlists.c.user_id, wishlists.c.club_id, literal(WISHLIST_WEIGHT))
+            .join(clubs, clubs.c.id == wishlists.c.club_id)
+            .where(upcoming)
+        )
+    ).all()
+    user_ids = np.fromiter((r[0] for r in signal), dtype=np.int64, count=len(signal))
+    cols = np.searchsorted(club_ids, np.fromiter((r[1] for r in signal), dtype=np.int64, count=len(signal)))
+    weights = np.fromiter((r[2] for r in signal), dtype=np.float32, count=len(signal))
+
+    m = build_matrix(user_ids, cols, weights, len(club_ids))
+    a, b, dots, common = cooccurrence(m, positions)
+    a, b, score, rank = top_neighbours(m, a, b, dots, common, top_k=top_k, min_common=min_common)
+
+    conn.execute(delete(recommendations))
+    rows = [
+        {"club_id": int(club_ids[i]), "rank": int(r), "neighbour_id": int(club_ids[j]),
+         "score": round(float(s), 6), "computed_at": now}
+        for i, j, s, r in zip(a, b, score, rank)
+    ]
+    for start in range(0, len(rows), batch_size):
+        conn.execute(insert(recommendations), rows[start:start + batch_size])
+
+    return BuildResult(clubs=len(club_ids), users=m.n_users, interactions=len(m.indices),
+                       pairs=len(dots), rows=len(rows), seconds=time.perf_counter() - t0)
+
+
+# ---------- Lesen (Hot Path) ----------
+
+def recommendations_for(club_id: int, limit: int = DEFAULT_TOP_K,
+                        now: Optional[dt.datetime] = None) -> list[tuple[Club, float]]:
+    """Nachbarn in Rangfolge; inzwischen abgesagte/vergangene Clubs fallen bis zum nächsten Build weg."""
+    now = now or dt.datetime.utcnow()
+    return db.session.execute(
+        select(Club, recommendations.c.score)
+        .join(recommendations, recommendations.c.neighbour_id == Club.id)
+        .where(recommendations.c.club_id == club_id, Club.status == "SCHEDULED", Club.starts_at >= now)
+        .order_by(recommendations.c.rank)
+        .limit(max(1, min(int(limit), MAX_LIMIT)))
+    ).all()
+
+
+# ---------- CLI ----------
+
+recommendations_cli = AppGroup("recommendations", help="Club-Empfehlungen (club_recommendations).")
+
+
+@recommendations_cli.command("build")
+@click.option("--top-k", default=DEFAULT_TOP_K, show_default=True, help="Nachbarn pro Club.")
+@click.option("--min-common", default=DEFAULT_MIN_COMMON, show_default=True,
+              help="Mindestanzahl gemeinsamer User pro Paar.")
+def build_command(top_k: int, min_common: int):
+    if np is None:
+        raise click.ClickException("NumPy ist nicht installiert (pip install numpy).")
+    with db.engine.begin() as conn:
+        result = build_recommendations(conn, top_k=top_k, min_common=min_common)
+    click.echo(
+        f"{result.rows:,} Empfehlung(en) für {result.clubs:,} Club(s) in {result.seconds:.1f}s "
+        f"({result.users:,} User, {result.interactions:,} Interaktionen, {result.pairs:,} Paare)."
+    )
@@ -0,0 +1,174 @@
+# services/seats.py
+"""
+Platzverwaltung über den Zähler clubs.seats_taken.
+
+- reserve_seat()/release_seat(): atomare, bedingte UPDATEs auf genau eine Club-Zeile
+  (O(1), unabhängig von der Anzahl Enrollments). Die Bedingung
+  seats_taken < capacity wird von der DB unter Zeilensperre geprüft, daher kann
+  auch unter Konkurrenz nicht überbucht werden.
+- Ein Handler in services/enrollment_events.py hält den Zähler bei
+  INSERT/UPDATE/DELETE von Enrollment automatisch synchron (im selben Commit).
+- `flask seats reconcile [--fix]` prüft/repariert Zähler in Batches.
+"""
+from __future__ import annotations
+from typing import Iterable, Optional
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, update, func, and_, case
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club, Enrollment
+from models.club.enrollment_model import SEAT_STATUSES
+from .enrollment_events import Transition, on_transitions
+
+clubs = Club.__table__
+enrollments = Enrollment.__table__
+
+FULL_MESSAGE = "Dieser Sprachclub ist bereits voll."
+
+
+class ClubFullError(Exception):
+    """Kein freier Platz mehr – die laufende Transaktion muss zurückgerollt werden."""
+
+    def __init__(self, club_id: int):
+        super().__init__(FULL_MESSAGE)
+        self.club_id = club_id
+
+
+# ---------- Atomare Zählerupdates ----------
+# updated_at wird explizit beibehalten: ein belegter Platz ist keine inhaltliche
+# Änderung am Club und soll die ETags der Club-Listen nicht entwerten
+# (services/http_cache.py; greift auch gegen ON UPDATE CURRENT_TIMESTAMP).
+
+def reserve_seat(conn, club_id: int) -> bool:
+    """UPDATE clubs SET seats_taken = seats_taken + 1 WHERE id = ? AND seats_taken < capacity"""
+    res = conn.execute(
+        update(clubs)
+        .where(clubs.c.id == club_id, clubs.c.seats_taken < clubs.c.capacity)
+        .values(seats_taken=clubs.c.seats_taken + 1, updated_at=clubs.c.updated_at)
+    )
+    return res.rowcount == 1
+
+
+def lock_club(conn, club_id: int) -> Optional[tuple[int, int]]:
+    """
+    Sperrt die Club-Zeile per No-op-UPDATE (MySQL: Zeilensperre, SQLite:
+    Schreibsperre) und liefert (seats_taken, capacity) oder None.
+    Danach kann bis zum Commit kein paralleles Storno den Zähler ändern.
+    """
+    res = conn.execute(
+        update(clubs)
+        .where(clubs.c.id == club_id)
+        .values(seats_taken=clubs.c.seats_taken, updated_at=clubs.c.updated_at)
+    )
+    if res.rowcount != 1:
+        return None
+    return tuple(conn.execute(
+        select(clubs.c.seats_taken, clubs.c.capacity).where(clubs.c.id == club_id)
+    ).one())
+
+
+def release_seat(conn, club_id: int) -> None:
+    conn.execute(
+        update(clubs)
+        .where(clubs.c.id == club_id, clubs.c.seats_taken > 0)
+        .values(seats_taken=clubs.c.seats_taken - 1, updated_at=clubs.c.updated_at)
+    )
+
+
+# ---------- Synchronisation über den ORM-Flush ----------
+
+@on_transitions
+def _sync_seats(session: Session, conn, transitions: list[Transition]) -> None:
+    deltas: list[tuple[int, int]] = []
+    for t in transitions:
+        was = t.old_status in SEAT_STATUSES
+        now = t.new_status in SEAT_STATUSES
+        if was != now:
+            deltas.append((t.club_id, +1 if now else -1))
+    # Freigaben zuerst, damit ein Wechsel innerhalb eines Clubs nicht an der Kapazität scheitert
+    deltas.sort(key=lambda d: d[1])
+
+    for club_id, delta in deltas:
+        if delta > 0:
+            if not reserve_seat(conn, club_id):
+                raise ClubFullError(club_id)
+        else:
+            release_seat(conn, club_id)
+        # Club im Identity-Map auf den neuen Zählerstand bringen (beim nächsten Zugriff)
+        club = session.identity_map.get(session.identity_key(Club, (club_id,)))
+        if club is not None:
+            session.expire(club, ["seats_taken"])
+
+
+# ---------- Reconciliation ----------
+
+def find_seat_drift(*, batch_size: int = 1000, club_ids: Optional[Iterable[int]] = None):
+    """
+    Liefert Batches von [(club_id, seats_taken, tatsächlich, capacity)] mit Abweichung.
+    Keyset über clubs.id; der COUNT läuft pro Batch über idx_enrollments_club_status_queue.
+    """
+    active = and_(enrollments.c.club_id == clubs.c.id, enrollments.c.status.in_(SEAT_STATUSES))
+    base = (
+        select(clubs.c.id, clubs.c.seats_taken, func.count(enrollments.c.id), clubs.c.capacity)
+        .select_from(clubs.outerjoin(enrollments, active))
+        .group_by(clubs.c.id, clubs.c.seats_taken, clubs.c.capacity)
+        .order_by(clubs.c.id)
+    )
+    if club_ids is not None:
+        ids = sorted(set(club_ids))
+        for i in range(0, len(ids), batch_size):
+            rows = db.session.execute(base.where(clubs.c.id.in_(ids[i:i + batch_size]))).all()
+            yield [tuple(r) for r in rows if r[1] != r[2]]
+        return
+
+    last_id = 0
+    while True:
+        rows = db.session.execute(base.where(clubs.c.id > last_id).limit(batch_size)).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [tuple(r) for r in rows if r[1] != r[2]]
+
+
+def repair_seats(drift: list[tuple[int, int, int, int]]) -> None:
+    """Setzt die Zähler eines Batches in einem einzigen UPDATE ... CASE."""
+    if not drift:
+        return
+    # Überbuchungen aus Altbeständen werden auf capacity gekappt (CHECK chk_clubs_seats)
+    values = {club_id: min(actual, capacity) for club_id, _stored, actual, capacity in drift}
+    db.session.execute(
+        update(clubs)
+        .where(clubs.c.id.in_(values))
+        .values(seats_taken=case(values, value=clubs.c.id), updated_at=clubs.c.updated_at)
+    )
+
+
+def reconcile_seats(*, fix: bool = False, batch_size: int = 1000,
+                    club_ids: Optional[Iterable[int]] = None) -> list[tuple[int, int, int, int]]:
+    found: list[tuple[int, int, int, int]] = []
+    for batch in find_seat_drift(batch_size=batch_size, club_ids=club_ids):
+        found.extend(batch)
+        if fix and batch:
+            repair_seats(batch)
+            db.session.commit()
+    return found
+
+
+# ---------- CLI ----------
+
+seats_cli = AppGroup("seats", help="Platzzähler (clubs.seats_taken) prüfen/reparieren.")
+
+
+@seats_cli.command("reconcile")
+@click.option("--fix", is_flag=True, help="Abweichungen korrigieren statt nur melden.")
+@click.option("--batch-size", default=1000, show_default=True)
+def reconcile_command(fix: bool, batch_size: int):
+    drift = reconcile_seats(fix=fix, batch_size=batch_size)
+    for club_id, stored, actual, capacity in drift:
+        note = " (überbucht!)" if actual > capacity else ""
+        click.echo(f"club {club_id}: seats_taken={stored}, tatsächlich={actual}, capacity={capacity}{note}")
+    verb = "korrigiert" if fix else "gefunden"
+    click.echo(f"{len(drift)} Abweichung(en) {verb}.")
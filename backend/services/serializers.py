@@ -0,0 +1,117 @@
+# services/serializers.py
+"""
+Vorkompilierte Serializer für die häufigsten API-Objekte (User, Club, Enrollment).
+
+Die Feldliste wird einmal beim Import in einen itemgetter/attrgetter übersetzt:
+pro Objekt ein C-Aufruf für alle Attribute, danach nur noch die wenigen
+Konverter (isoformat, Label, ...) und dict(zip(...)).
+Bei geladenen ORM-Objekten wird direkt aus obj.__dict__ gelesen, ohne die
+InstrumentedAttribute-Deskriptoren; fehlt ein Attribut (expired/deferred),
+greift der normale Attributzugriff inkl. Nachladen. UserSnapshot und Core-Rows
+(select(Club.id, ...)) laufen über attrgetter.
+"""
+from __future__ import annotations
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, Optional, Union
+
+from .level_catalog import level_catalog
+
+Field = Union[str, tuple[str, str], tuple[str, str, Optional[Callable[[Any], Any]]]]
+
+
+def iso(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class RowSerializer:
+    """
+    Felder: "attr" | (key, attr) | (key, attr, konverter).
+    Dasselbe Attribut darf mehrfach vorkommen (z. B. für Frontend-Aliase).
+    """
+    __slots__ = ("keys", "_getter", "_dict_getter", "_converters")
+
+    def __init__(self, *fields: Field):
+        keys, attrs, converters = [], [], []
+        for i, field in enumerate(fields):
+            if isinstance(field, str):
+                field = (field, field)
+            key, attr, *rest = field
+            keys.append(key)
+            attrs.append(attr)
+            if rest and rest[0] is not None:
+                converters.append((i, rest[0]))
+        self.keys = tuple(keys)
+        getter, dict_getter = attrgetter(*attrs), itemgetter(*attrs)
+        # attr-/itemgetter mit nur einem Attribut liefern kein Tupel
+        self._getter = getter if len(attrs) > 1 else (lambda obj: (getter(obj),))
+        self._dict_getter = dict_getter if len(attrs) > 1 else (lambda d: (dict_getter(d),))
+        self._converters = tuple(converters)
+
+    def __call__(self, obj) -> dict:
+        state = getattr(obj, "__dict__", None)
+        if state is not None and "_sa_instance_state" in state:
+            try:
+                values = self._dict_getter(state)
+            except KeyError:
+                values = self._getter(obj)
+        else:
+            values = self._getter(obj)
+        if self._converters:
+            values = list(values)
+            for i, convert in self._converters:
+                values[i] = convert(values[i])
+        return dict(zip(self.keys, values))
+
+    def many(self, objs: Iterable) -> list[dict]:
+        return [self(obj) for obj in objs]
+
+
+# ---------- Konverter ----------
+
+def _roles(is_host) -> list[str]:
+    return ["user", "host"] if is_host else ["user"]
+
+
+def _euros(cents) -> float:
+    return cents / 100
+
+
+# ---------- Serializer ----------
+
+user_serializer = RowSerializer(
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    ("birth_date", "birth_date", iso),
+    ("is_host", "is_host", bool),
+    ("roles", "is_host", _roles),  # ["user"] oder ["user","host"]
+)
+
+club_serializer = RowSerializer(
+    "id",
+    "title",
+    "description",
+    "level_code",
+    ("level_label", "level_code", level_catalog.label),
+    "host_id",
+    ("starts_at", "starts_at", iso),
+    "duration_min",
+    "capacity",
+    "price_cents",
+    "currency",
+    "status",
+    # Aliase für das bestehende Frontend (Events.js, category.js, my-event.js)
+    ("categoryName", "level_code"),
+    ("eventDate", "starts_at", iso),
+    ("price", "price_cents", _euros),
+)
+
+enrollment_serializer = RowSerializer(
+    "id",
+    "user_id",
+    "club_id",
+    "status",
+    ("created_at", "created_at", iso),
+)
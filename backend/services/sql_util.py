@@ -0,0 +1,40 @@
+# services/sql_util.py
+"""Dialektabhängige Einzeiler (MySQL/MariaDB produktiv, SQLite für lokale Setups)."""
+from __future__ import annotations
+from typing import Iterable
+
+
+def _insert_for(conn):
+    if conn.dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def upsert(conn, table, values: dict, update: dict):
+    """
+    INSERT ... ON DUPLICATE KEY UPDATE (MySQL) bzw. ON CONFLICT DO UPDATE (SQLite).
+    update darf Ausdrücke auf die bestehende Zeile enthalten, z. B. table.c.n + 1.
+    """
+    stmt = _insert_for(conn)(table).values(**values)
+    if conn.dialect.name == "mysql":
+        stmt = stmt.on_duplicate_key_update(**update)
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key.columns], set_=update
+        )
+    return conn.execute(stmt)
+
+
+def insert_ignore(conn, table, rows: Iterable[dict]):
+    """Mehrzeiliges INSERT IGNORE / ON CONFLICT DO NOTHING in einem Statement."""
+    rows = list(rows)
+    if not rows:
+        return None
+    stmt = _insert_for(conn)(table).values(rows)
+    if conn.dialect.name == "mysql":
+        stmt = stmt.prefix_with("IGNORE")
+    else:
+        stmt = stmt.on_conflict_do_nothing()
+    return conn.execute(stmt)
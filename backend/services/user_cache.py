@@ -0,0 +1,131 @@
+# services/user_cache.py
+"""
+Prozesslokaler LRU-Cache (mit TTL) für den Flask-Login user_loader.
+
+- Gecacht werden losgelöste, unveränderliche Snapshots (kein ORM-Objekt, kein
+  password_hash), damit sie gefahrlos zwischen Requests/Threads geteilt werden.
+- Schreibende Endpunkte laden den echten User per db.session.get() und rufen
+  nach dem Commit user_cache.invalidate(user_id) auf.
+- Andere Worker-Prozesse sehen Änderungen spätestens nach USER_CACHE_TTL_S.
+"""
+from __future__ import annotations
+import datetime as dt
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from flask_login import UserMixin
+from sqlalchemy import select
+
+from extensions import db
+
+
+class UserSnapshot(UserMixin):
+    """Read-only Sicht auf eine users-Zeile; deckt alles ab, was user_payload() braucht."""
+
+    __slots__ = ("id", "username", "email", "first_name", "last_name", "birth_date", "is_host")
+
+    def __init__(self, id: int, username: str, email: str, first_name: str, last_name: str,
+                 birth_date: Optional[dt.date], is_host: int):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "username", username)
+        object.__setattr__(self, "email", email)
+        object.__setattr__(self, "first_name", first_name)
+        object.__setattr__(self, "last_name", last_name)
+        object.__setattr__(self, "birth_date", birth_date)
+        object.__setattr__(self, "is_host", is_host)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UserSnapshot ist read-only – User per db.session.get() laden")
+
+    @property
+    def roles(self) -> list[str]:
+        roles = ["user"]
+        if self.is_host:
+            roles.append("host")
+        return roles
+
+    def has_role(self, role: str) -> bool:
+        return role in self.roles
+
+    def __repr__(self) -> str:
+        return f"<UserSnapshot {self.id} {self.username}>"
+
+
+class UserCache:
+    def __init__(self, max_size: int, ttl_s: float):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._data: OrderedDict[int, tuple[float, UserSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[UserSnapshot]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, snap: UserSnapshot) -> None:
+        with self._lock:
+            self._data[snap.id] = (time.monotonic() + self.ttl_s, snap)
+            self._data.move_to_end(snap.id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if self._data.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def load(self, user_id: int) -> Optional[UserSnapshot]:
+        """Cache-Hit oder genau eine PK-Abfrage auf users."""
+        snap = self.get(user_id)
+        if snap is not None:
+            return snap
+        from models import User  # lazy, models importiert dieses Modul im user_loader
+        row = db.session.execute(
+            select(User.id, User.username, User.email, User.first_name,
+                   User.last_name, User.birth_date, User.is_host)
+            .where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        snap = UserSnapshot(*row)
+        self.put(snap)
+        return snap
+
+
+user_cache = UserCache(
+    max_size=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl_s=float(os.getenv("USER_CACHE_TTL_S", "60")),
+)
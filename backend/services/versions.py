@@ -0,0 +1,41 @@
+# services/versions.py
+"""
+Versionszähler in cache_versions (eine Zeile pro Cache-Schlüssel).
+
+bump() läuft in der Transaktion des Aufrufers, d. h. Daten und Version werden
+gemeinsam committet oder gemeinsam zurückgerollt.
+"""
+from __future__ import annotations
+from typing import Iterable
+
+from sqlalchemy import select, func
+
+from extensions import db
+from models import CacheVersion
+from .sql_util import upsert
+
+cache_versions = CacheVersion.__table__
+
+
+def get_version(name: str) -> int:
+    return db.session.execute(
+        select(cache_versions.c.version).where(cache_versions.c.name == name)
+    ).scalar() or 0
+
+
+def get_versions(names: Iterable[str]) -> dict[str, int]:
+    names = list(names)
+    rows = db.session.execute(
+        select(cache_versions.c.name, cache_versions.c.version).where(cache_versions.c.name.in_(names))
+    ).all()
+    found = dict(rows)
+    return {n: found.get(n, 0) for n in names}
+
+
+def bump(name: str, conn=None) -> None:
+    upsert(
+        conn if conn is not None else db.session.connection(),
+        cache_versions,
+        {"name": name, "version": 1},
+        {"version": cache_versions.c.version + 1, "updated_at": func.current_timestamp()},
+    )
@@ -0,0 +1,117 @@
+# services/waitlist.py
+"""
+Warteliste pro Club: Buchungen über der Kapazität werden als PENDING mit
+queued_at eingereiht (services/booking.py) und belegen keinen Platz.
+
+Nachrücken: wird im selben Flush ein Platz frei (Storno, Löschen, ...), holt
+ein @before_transitions-Hook pro freiem Platz den Kopf der Warteliste
+
+    SELECT ... WHERE club_id = ? AND status = 'PENDING'
+    ORDER BY queued_at, id LIMIT n FOR UPDATE SKIP LOCKED
+
+über idx_enrollments_club_status_queue (ein Index-Lookup, unabhängig von der
+Länge der Warteliste) und setzt ihn auf CONFIRMED. Der Platz wechselt damit in
+derselben Transaktion den Besitzer (services/seats.py gibt erst frei und
+reserviert dann). SKIP LOCKED: parallele Stornos desselben Clubs greifen nie
+denselben Kopf. Zusätzlich wird jeder Kopf per bedingtem UPDATE
+(... WHERE id = ? AND status = 'PENDING') beansprucht; trifft das keine Zeile,
+hat ihn eine andere Transaktion schon vergeben (z. B. SQLite ohne Zeilensperren)
+und der nächste wird genommen. Ein Eintrag kann also nicht doppelt nachrücken.
+"""
+from __future__ import annotations
+import datetime as dt
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import select, update, func, and_, or_
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import Club, Enrollment
+from models.club.enrollment_model import SEAT_STATUSES, WAITLIST_STATUS
+from .enrollment_events import Transition, before_transitions
+
+enrollments = Enrollment.__table__
+
+
+def _released(transitions: list[Transition]) -> Counter:
+    """Freie Plätze pro Club (Saldo) aus den Übergängen dieses Flushs."""
+    delta: Counter = Counter()
+    for t in transitions:
+        was = t.old_status in SEAT_STATUSES
+        now = t.new_status in SEAT_STATUSES
+        if was != now:
+            delta[t.club_id] += -1 if now else 1
+    return Counter({club_id: n for club_id, n in delta.items() if n > 0})
+
+
+def _queue_heads(session: Session, club_id: int, n: int, exclude: set[int]) -> list[Enrollment]:
+    stmt = (
+        select(Enrollment)
+        .join(Club, Club.id == Enrollment.club_id)
+        .where(Enrollment.club_id == club_id, Enrollment.status == WAITLIST_STATUS,
+               Club.status == "SCHEDULED")
+        .order_by(Enrollment.queued_at, Enrollment.id)
+        .limit(n + len(exclude))
+        .with_for_update(skip_locked=True, of=Enrollment)
+    )
+    heads = [e for e in session.execute(stmt).scalars() if e.id not in exclude]
+    return heads[:n]
+
+
+def _claim(conn, enrollment_id: int) -> bool:
+    """Sperrt den Eintrag, sofern er noch wartet (Zeile wird nicht verändert)."""
+    res = conn.execute(
+        update(enrollments)
+        .where(enrollments.c.id == enrollment_id, enrollments.c.status == WAITLIST_STATUS)
+        .values(queued_at=enrollments.c.queued_at, updated_at=enrollments.c.updated_at)
+    )
+    return res.rowcount == 1
+
+
+@before_transitions
+def _promote(session: Session, transitions: list[Transition]) -> bool:
+    released = _released(transitions)
+    if not released:
+        return False
+    # Enrollments, die in diesem Flush selbst schon einen Übergang haben
+    # (z. B. ein Wartender storniert gerade), nicht erneut anfassen
+    skip = {t.enrollment.id for t in transitions if t.enrollment.id is not None}
+    conn = session.connection()
+    promoted = False
+    for club_id in sorted(released):
+        free = released[club_id]
+        while free:
+            heads = _queue_heads(session, club_id, free, skip)
+            if not heads:
+                break
+            for enr in heads:
+                skip.add(enr.id)
+                if _claim(conn, enr.id):
+                    enr.status = "CONFIRMED"
+                    enr.queued_at = None
+                    free -= 1
+                    promoted = True
+    return promoted
+
+
+# ---------- Lesen ----------
+
+def position(enr: Enrollment) -> Optional[int]:
+    """1-basierte Position in der Warteliste (Index-Range-Count) oder None."""
+    if enr.status != WAITLIST_STATUS or enr.queued_at is None:
+        return None
+    ahead = db.session.execute(
+        select(func.count()).select_from(Enrollment).where(
+            Enrollment.club_id == enr.club_id,
+            Enrollment.status == WAITLIST_STATUS,
+            or_(Enrollment.queued_at < enr.queued_at,
+                and_(Enrollment.queued_at == enr.queued_at, Enrollment.id < enr.id)),
+        )
+    ).scalar()
+    return ahead + 1
+
+
+def enqueue(enr: Enrollment) -> None:
+    enr.status = WAITLIST_STATUS
+    enr.queued_at = dt.datetime.utcnow()
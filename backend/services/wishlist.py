@@ -0,0 +1,79 @@
+# services/wishlist.py
+"""
+Merkliste (wishlists) mengenbasiert.
+
+- add()/remove(): beliebig viele Clubs in genau einem schreibenden Statement
+  (INSERT IGNORE bzw. DELETE ... IN), Versionszähler "wishlist:<user_id>" wird
+  in derselben Transaktion erhöht.
+- wishlist_version(): eine PK-Abfrage auf cache_versions; damit beantworten die
+  Routen Wiederholungsabrufe mit 304, ohne wishlists zu lesen.
+"""
+from __future__ import annotations
+from typing import Iterable
+
+from sqlalchemy import select, delete
+
+from extensions import db
+from models import Club, Wishlist
+from .sql_util import insert_ignore
+from .versions import bump, get_version
+
+wishlists = Wishlist.__table__
+clubs = Club.__table__
+
+MAX_BULK = 500
+
+
+def version_key(user_id: int) -> str:
+    return f"wishlist:{user_id}"
+
+
+def wishlist_version(user_id: int) -> int:
+    return get_version(version_key(user_id))
+
+
+def wishlist_ids(user_id: int) -> list[int]:
+    # nur der PK (user_id, club_id) → reiner Index-Scan
+    return list(db.session.execute(
+        select(wishlists.c.club_id).where(wishlists.c.user_id == user_id).order_by(wishlists.c.club_id)
+    ).scalars())
+
+
+def wishlist_clubs(user_id: int) -> list[Club]:
+    return list(db.session.execute(
+        select(Club)
+        .join(Wishlist, Wishlist.club_id == Club.id)
+        .where(Wishlist.user_id == user_id)
+        .order_by(Wishlist.created_at.desc(), Club.id)
+    ).scalars())
+
+
+def add(user_id: int, club_ids: Iterable[int]) -> int:
+    """Fügt vorhandene Clubs hinzu (Duplikate/unbekannte IDs werden ignoriert). Rückgabe: neu gemerkt."""
+    ids = sorted(set(club_ids))
+    if not ids:
+        return 0
+    conn = db.session.connection()
+    existing = list(conn.execute(select(clubs.c.id).where(clubs.c.id.in_(ids))).scalars())
+    added = 0
+    if existing:
+        result = insert_ignore(conn, wishlists, [{"user_id": user_id, "club_id": cid} for cid in existing])
+        added = max(result.rowcount or 0, 0)
+    if added:
+        bump(version_key(user_id), conn)
+    db.session.commit()
+    return added
+
+
+def remove(user_id: int, club_ids: Iterable[int]) -> int:
+    ids = sorted(set(club_ids))
+    if not ids:
+        return 0
+    conn = db.session.connection()
+    removed = conn.execute(
+        delete(wishlists).where(wishlists.c.user_id == user_id, wishlists.c.club_id.in_(ids))
+    ).rowcount or 0
+    if removed:
+        bump(version_key(user_id), conn)
+    db.session.commit()
+    return removed
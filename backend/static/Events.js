@@ -5,11 +5,20 @@ let wishlistIds = new Set();
 let subscriptions = JSON.parse(localStorage.getItem("subscriptions")) || [];
 let myBookings = {};
 try { myBookings = JSON.parse(localStorage.getItem("myBookings") || "{}"); } catch (_) { myBookings = {}; }
+// eventId -> bookingId für Einträge auf der Warteliste (Status PENDING)
+let myWaitlist = {};
+try { myWaitlist = JSON.parse(localStorage.getItem("myWaitlist") || "{}"); } catch (_) { myWaitlist = {}; }
 
 function isBooked(eventId) { return !!myBookings[String(eventId)]; }
-function getBookingId(eventId) { return myBookings[String(eventId)]; }
-function setBookingForEvent(eventId, bookingId) { myBookings[String(eventId)] = Number(bookingId); localStorage.setItem("myBookings", JSON.stringify(myBookings)); }
-function removeBookingForEvent(eventId) { delete myBookings[String(eventId)]; localStorage.setItem("myBookings", JSON.stringify(myBookings)); }
+function isWaiting(eventId) { return !!myWaitlist[String(eventId)]; }
+function getBookingId(eventId) { return myBookings[String(eventId)] || myWaitlist[String(eventId)]; }
+function saveBookingState() { localStorage.setItem("myBookings", JSON.stringify(myBookings)); localStorage.setItem("myWaitlist", JSON.stringify(myWaitlist)); }
+function setBookingForEvent(eventId, bookingId, waiting) {
+  delete myBookings[String(eventId)]; delete myWaitlist[String(eventId)];
+  (waiting ? myWaitlist : myBookings)[String(eventId)] = Number(bookingId);
+  saveBookingState();
+}
+function removeBookingForEvent(eventId) { delete myBookings[String(eventId)]; delete myWaitlist[String(eventId)]; saveBookingState(); }
 
 async function bookEvent(eventId) {
   try {
@@ -17,8 +26,15 @@ async function bookEvent(eventId) {
     if (!res.ok) { let msg = res.statusText; try { const err = await res.json(); msg = err.error || msg; } catch {} alert("Error: " + msg); return; }
     const booking = await res.json();
     const bookingId = Number((booking && (booking.id ?? booking.bookingId)));
-    if (Number.isFinite(bookingId)) { setBookingForEvent(eventId, bookingId); }
-    alert("✅ Event booked successfully!");
+    // 201 mit status PENDING: Club war voll, Buchung steht auf der Warteliste
+    const waiting = booking && booking.status === "PENDING";
+    if (Number.isFinite(bookingId)) { setBookingForEvent(eventId, bookingId, waiting); }
+    if (waiting) {
+      const pos = booking.waitlist_position;
+      alert("⏳ This event is full. You are on the waitlist" + (pos ? " (position " + pos + ")" : "") + ".");
+    } else {
+      alert("✅ Event booked successfully!");
+    }
     renderEvents();
   } catch (err) { console.error("Booking failed", err); alert("Booking failed. Try again later."); }
 }
@@ -29,19 +45,20 @@ async function cancelBooking(eventId) {
   try {
     const res = await fetch("/booking", { method: "DELETE", headers: { "Content-Type": "application/json" }, body: JSON.stringify({ id: bookingId }) });
     if (!res.ok) { let msg = res.statusText; try { const err = await res.json(); msg = err.error || msg; } catch {} alert("Error canceling booking: " + msg); return; }
+    const wasWaiting = isWaiting(eventId);
     removeBookingForEvent(eventId);
-    alert("🗑️ Booking canceled.");
+    alert(wasWaiting ? "🗑️ Removed from waitlist." : "🗑️ Booking canceled.");
     renderEvents();
   } catch (err) { console.error("Cancel failed", err); alert("Cancel failed. Try again later."); }
 }
 
 async function preloadWishlistIds() {
   try {
-    const res = await fetch("/eventdata/wishlist");
+    // nur die IDs (kompakt); volle Events lädt loadWishlistFromServer() für die Merkzettel-Ansicht
+    const res = await fetch("/eventdata/wishlist?fields=ids");
     if (!res.ok) return;
     const data = await res.json();
-    const list = Array.isArray(data && data.events) ? data.events : [];
-    wishlistIds = new Set(list.map(e => e.id));
+    wishlistIds = new Set(Array.isArray(data && data.ids) ? data.ids : []);
   } catch (_) {}
 }
 
@@ -78,10 +95,13 @@ function renderEvents() {
     card.className = "event-card";
     const imgUrl = ev.imageUrl || ev.img || "https://via.placeholder.com/400x200?text=Event";
     const booked = isBooked(ev.id);
+    const waiting = isWaiting(ev.id);
     const inWish = wishlistIds.has(ev.id);
 
     const bookingBtnHtml = booked
       ? `<button class="cancel-btn" onclick="cancelBooking(${ev.id}); event.stopPropagation();">❌ Cancel</button>`
+      : waiting
+      ? `<button class="cancel-btn" onclick="cancelBooking(${ev.id}); event.stopPropagation();">⏳ On waitlist – Leave</button>`
       : `<button class="booking-btn" onclick="bookEvent(${ev.id}); event.stopPropagation();">📅 Book</button>`;
 
     const wishBtnHtml = inWish
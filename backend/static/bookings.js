@@ -1,3 +1,11 @@
+// GET /booking liefert {upcoming: [...], past: [...], next_cursor: {upcoming, past}};
+// jeder Eintrag ist ein Enrollment (id, status, ...) mit dem Club unter "club".
+const BOOKING_SECTIONS = [
+  { scope: "upcoming", label: "Upcoming", cancellable: true },
+  { scope: "past", label: "Past", cancellable: false },
+];
+const nextCursor = {};
+
 async function loadBookings() {
   const container = document.getElementById("bookings-grid");
   if (!container) return;
@@ -8,38 +16,85 @@ async function loadBookings() {
       throw new Error("Failed to load bookings");
     }
     const data = await res.json();
-    renderBookings(data.items || []);
+    container.innerHTML = "";
+    let total = 0;
+    BOOKING_SECTIONS.forEach(section => {
+      const items = data[section.scope] || [];
+      total += items.length;
+      nextCursor[section.scope] = data.next_cursor ? data.next_cursor[section.scope] : null;
+      renderSection(section, items);
+    });
+    if (total === 0) {
+      container.innerHTML = "<p>No bookings yet.</p>";
+    }
   } catch (err) {
     console.error("Error loading bookings:", err);
     container.innerHTML = "<p>Failed to load bookings.</p>";
   }
 }
 
-function renderBookings(bookings) {
+async function loadMore(scope) {
+  const cursor = nextCursor[scope];
+  if (!cursor) return;
+  try {
+    const res = await fetch(`/booking?scope=${scope}&cursor=${encodeURIComponent(cursor)}`);
+    if (!res.ok) throw new Error("Failed to load bookings");
+    const data = await res.json();
+    nextCursor[scope] = data.next_cursor ? data.next_cursor[scope] : null;
+    const section = BOOKING_SECTIONS.find(s => s.scope === scope);
+    appendBookings(section, data[scope] || []);
+  } catch (err) {
+    console.error("Error loading bookings:", err);
+    alert("Failed to load more bookings.");
+  }
+}
+
+function renderSection(section, bookings) {
   const container = document.getElementById("bookings-grid");
-  if (!container) return;
+  if (!bookings.length) return;
 
-  container.innerHTML = "";
-  if (!bookings || bookings.length === 0) {
-    container.innerHTML = "<p>No bookings yet.</p>";
-    return;
-  }
+  const wrapper = document.createElement("section");
+  wrapper.id = "bookings-" + section.scope;
+  wrapper.innerHTML = `<h2>${section.label}</h2><div class="bookings-list"></div>`;
+  container.appendChild(wrapper);
+  appendBookings(section, bookings);
+}
+
+function appendBookings(section, bookings) {
+  const wrapper = document.getElementById("bookings-" + section.scope);
+  if (!wrapper) return;
+  const list = wrapper.querySelector(".bookings-list");
 
   bookings.forEach(b => {
-  const card = document.createElement("div");
-  card.className = "booking-card";
-  card.id = "booking-" + b.id;
-  card.innerHTML = `
-    <div class="booking-info">
-      <div class="event-title">${b.title}</div>
-      <div class="event-date">📅 ${b.eventDate}</div>
-      <div class="event-location">📍 ${b.location}</div>
-      <div class="status">Status: ${b.status}</div>
-      <button class="cancel-btn" onclick="cancelBooking(${b.id})">❌ Cancel</button>
-    </div>
-  `;
-  container.appendChild(card);
-});
+    const club = b.club || {};
+    const status = b.status === "PENDING" ? "Waitlist" : b.status;
+    const card = document.createElement("div");
+    card.className = "booking-card";
+    card.id = "booking-" + b.id;
+    card.innerHTML = `
+      <div class="booking-info">
+        <div class="event-title">${club.title || ""}</div>
+        <div class="event-date">📅 ${club.eventDate ? new Date(club.eventDate).toLocaleString() : ""}</div>
+        <div class="event-level">🎓 ${club.level_label || club.categoryName || ""}</div>
+        <div class="status">Status: ${status}</div>
+        ${section.cancellable ? `<button class="cancel-btn" onclick="cancelBooking(${b.id})">❌ Cancel</button>` : ""}
+      </div>
+    `;
+    list.appendChild(card);
+  });
+
+  let more = wrapper.querySelector(".load-more");
+  if (nextCursor[section.scope]) {
+    if (!more) {
+      more = document.createElement("button");
+      more.className = "load-more";
+      more.textContent = "Show more";
+      more.onclick = () => loadMore(section.scope);
+      wrapper.appendChild(more);
+    }
+  } else if (more) {
+    more.remove();
+  }
 }
 
 
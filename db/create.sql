@@ -84,11 +84,13 @@ CREATE TABLE clubs (
   id            BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
   title         VARCHAR(120)    NOT NULL,
   description   TEXT,
+  search_terms  TEXT,                           -- gestemmte Begriffe für die Volltextsuche, pflegt die App
   level_code    VARCHAR(10)     NOT NULL,       -- FK -> levels
   host_id       BIGINT UNSIGNED NOT NULL,       -- FK -> users (Host)
   starts_at     DATETIME        NOT NULL,       -- UTC empfohlen
   duration_min  SMALLINT UNSIGNED NOT NULL,     -- 30, 45, 60, ...
   capacity      SMALLINT UNSIGNED NOT NULL DEFAULT 12,
+  seats_taken   SMALLINT UNSIGNED NOT NULL DEFAULT 0, -- belegte Plätze (CONFIRMED/ATTENDED), pflegt die App
   meeting_url   VARCHAR(255),                   -- optional
   price_cents   INT UNSIGNED NOT NULL DEFAULT 0,
   currency      CHAR(3) NOT NULL DEFAULT 'EUR',
@@ -99,6 +101,9 @@ CREATE TABLE clubs (
   KEY idx_clubs_starts_at (starts_at),
   KEY idx_clubs_level (level_code),
   KEY idx_clubs_search (status, level_code, starts_at),
+  KEY idx_clubs_updated_at (updated_at),
+  FULLTEXT KEY ft_clubs_search (search_terms),
+  CONSTRAINT chk_clubs_seats CHECK (seats_taken <= capacity),
   CONSTRAINT fk_clubs_level
     FOREIGN KEY (level_code) REFERENCES levels(code)
     ON UPDATE CASCADE ON DELETE RESTRICT,
@@ -118,12 +123,15 @@ CREATE TABLE enrollments (
   user_id     BIGINT UNSIGNED NOT NULL,
   club_id     BIGINT UNSIGNED NOT NULL,
   status ENUM('PENDING','CONFIRMED','CANCELLED','ATTENDED','NO_SHOW') NOT NULL DEFAULT 'CONFIRMED',
+  queued_at   DATETIME NULL,                  -- PENDING = Warteliste, Reihenfolge (queued_at, id)
+  club_starts_at DATETIME NULL,               -- Kopie von clubs.starts_at ("Meine Buchungen")
   created_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (id),
   UNIQUE KEY uq_enrollments_user_club (user_id, club_id),
   KEY idx_enrollments_club (club_id),
-  KEY idx_enrollments_club_status (club_id, status),
+  KEY idx_enrollments_club_status_queue (club_id, status, queued_at),
+  KEY idx_enrollments_user_status_start (user_id, status, club_starts_at),
   CONSTRAINT fk_enr_user
     FOREIGN KEY (user_id) REFERENCES users(id)
     ON DELETE CASCADE ON UPDATE CASCADE,
@@ -138,6 +146,10 @@ CREATE TABLE enrollments (
 -- ENROLLMENT AUDIT
 -- =========================================================
 DROP TABLE IF EXISTS enrollment_audit;
+-- Geschrieben von der App (backend/services/audit.py), nicht mehr per Trigger.
+-- Monatspartitionen: keine FKs möglich, changed_at gehört zum PRIMARY KEY.
+-- Nach dem Anlegen: flask audit ensure-partitions (danach z. B. monatlich per Cron),
+-- Retention: flask audit drop-partitions --keep-months N
 CREATE TABLE enrollment_audit (
   id            BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
   enrollment_id BIGINT UNSIGNED NOT NULL,
@@ -145,18 +157,15 @@ CREATE TABLE enrollment_audit (
   old_status    VARCHAR(16),
   new_status    VARCHAR(16),
   changed_by    BIGINT UNSIGNED,  -- optional: Admin/User
-  changed_at    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  PRIMARY KEY (id),
-  KEY idx_audit_enrollment (enrollment_id),
-  CONSTRAINT fk_audit_enrollment
-    FOREIGN KEY (enrollment_id) REFERENCES enrollments(id)
-    ON DELETE CASCADE ON UPDATE CASCADE,
-  CONSTRAINT fk_audit_changed_by
-    FOREIGN KEY (changed_by) REFERENCES users(id)
-    ON DELETE SET NULL ON UPDATE CASCADE
+  changed_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id, changed_at),
+  KEY idx_audit_enrollment (enrollment_id)
 ) ENGINE=InnoDB
   DEFAULT CHARSET = utf8mb4
-  COLLATE = utf8mb4_unicode_ci;
+  COLLATE = utf8mb4_unicode_ci
+  PARTITION BY RANGE (TO_DAYS(changed_at)) (
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+  );
 
 -- =========================================================
 -- REVIEWS
@@ -196,20 +205,153 @@ CREATE TABLE wishlists (
   COLLATE = utf8mb4_unicode_ci;
 
 -- =========================================================
--- VIEW: Auslastung (nur CONFIRMED)
+-- SCHEMA_VERSION (Stand des Migrations-Runners, backend/migrations)
+--  create.sql entspricht den hier eingetragenen Versionen.
+-- =========================================================
+DROP TABLE IF EXISTS schema_version;
+CREATE TABLE schema_version (
+  version    INT          NOT NULL,
+  name       VARCHAR(100) NOT NULL,
+  applied_at DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (version)
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
+
+INSERT INTO schema_version (version, name) VALUES
+  (1, 'baseline'),
+  (2, 'clubs_seats_taken'),
+  (3, 'cache_versions'),
+  (4, 'club_stats'),
+  (5, 'audit_partitioned'),
+  (6, 'clubs_updated_at_index'),
+  (7, 'clubs_fulltext'),
+  (8, 'enrollments_waitlist'),
+  (9, 'scheduler_leases'),
+  (10, 'enrollments_club_starts_at'),
+  (11, 'rating_aggregates'),
+  (12, 'club_recommendations');
+
+-- =========================================================
+-- CACHE_VERSIONS (Versionszähler für prozesslokale Caches, z. B. Level-Katalog)
+-- =========================================================
+DROP TABLE IF EXISTS cache_versions;
+CREATE TABLE cache_versions (
+  name       VARCHAR(64)     NOT NULL,
+  version    BIGINT UNSIGNED NOT NULL DEFAULT 1,
+  updated_at DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (name)
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
+
+INSERT INTO cache_versions (name, version) VALUES ('levels', 1);
+
+-- =========================================================
+-- CLUB_STATS (ersetzt VIEW v_club_fillrate)
+--  - inkrementell von der App gepflegt (backend/services/club_stats.py)
+--  - fill_rate = confirmed_count / clubs.capacity wird beim Lesen berechnet
+--  - Neuaufbau: flask club-stats rebuild
 -- =========================================================
 DROP VIEW IF EXISTS v_club_fillrate;
-CREATE VIEW v_club_fillrate AS
-SELECT
-  c.id,
-  c.title,
-  c.level_code,
-  c.capacity,
-  SUM(CASE WHEN e.status='CONFIRMED' THEN 1 ELSE 0 END) AS confirmed_count,
-  ROUND(SUM(CASE WHEN e.status='CONFIRMED' THEN 1 ELSE 0 END) / NULLIF(c.capacity,0), 2) AS fill_rate
-FROM clubs c
-LEFT JOIN enrollments e ON e.club_id = c.id
-GROUP BY c.id, c.title, c.level_code, c.capacity;
+DROP TABLE IF EXISTS club_stats;
+CREATE TABLE club_stats (
+  club_id         BIGINT UNSIGNED NOT NULL,
+  pending_count   INT NOT NULL DEFAULT 0,
+  confirmed_count INT NOT NULL DEFAULT 0,
+  cancelled_count INT NOT NULL DEFAULT 0,
+  attended_count  INT NOT NULL DEFAULT 0,
+  no_show_count   INT NOT NULL DEFAULT 0,
+  last_change_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (club_id),
+  CONSTRAINT fk_club_stats_club FOREIGN KEY (club_id) REFERENCES clubs(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
+
+-- =========================================================
+-- CLUB_RATINGS / HOST_RATINGS (laufende Bewertungs-Aggregate)
+--  - im selben Flush wie das Review gepflegt (backend/services/ratings.py)
+--  - Durchschnitt = rating_sum / review_count, beim Lesen berechnet
+--  - Neuaufbau: flask ratings rebuild
+-- =========================================================
+DROP TABLE IF EXISTS club_ratings;
+CREATE TABLE club_ratings (
+  club_id         BIGINT UNSIGNED NOT NULL,
+  review_count    INT NOT NULL DEFAULT 0,
+  rating_sum      INT NOT NULL DEFAULT 0,
+  rating_1        INT NOT NULL DEFAULT 0,
+  rating_2        INT NOT NULL DEFAULT 0,
+  rating_3        INT NOT NULL DEFAULT 0,
+  rating_4        INT NOT NULL DEFAULT 0,
+  rating_5        INT NOT NULL DEFAULT 0,
+  last_change_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (club_id),
+  CONSTRAINT fk_club_ratings_club FOREIGN KEY (club_id) REFERENCES clubs(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
+
+DROP TABLE IF EXISTS host_ratings;
+CREATE TABLE host_ratings (
+  host_id         BIGINT UNSIGNED NOT NULL,
+  review_count    INT NOT NULL DEFAULT 0,
+  rating_sum      INT NOT NULL DEFAULT 0,
+  rating_1        INT NOT NULL DEFAULT 0,
+  rating_2        INT NOT NULL DEFAULT 0,
+  rating_3        INT NOT NULL DEFAULT 0,
+  rating_4        INT NOT NULL DEFAULT 0,
+  rating_5        INT NOT NULL DEFAULT 0,
+  last_change_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (host_id),
+  KEY idx_host_ratings_count (review_count),
+  CONSTRAINT fk_host_ratings_user FOREIGN KEY (host_id) REFERENCES users(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
+
+-- =========================================================
+-- CLUB_RECOMMENDATIONS ("Wer das gebucht hat, buchte auch …")
+--  - Top-k ähnliche geplante Clubs pro Club, offline aus enrollments/wishlists
+--    berechnet (backend/services/recommendations.py)
+--  - Neuaufbau: flask recommendations build (z. B. stündlich per Cron)
+-- =========================================================
+DROP TABLE IF EXISTS club_recommendations;
+CREATE TABLE club_recommendations (
+  club_id         BIGINT UNSIGNED NOT NULL,
+  `rank`          SMALLINT        NOT NULL,
+  neighbour_id    BIGINT UNSIGNED NOT NULL,
+  score           FLOAT           NOT NULL,
+  computed_at     DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (club_id, `rank`),
+  KEY idx_club_recommendations_neighbour (neighbour_id),
+  CONSTRAINT fk_club_recommendations_club FOREIGN KEY (club_id) REFERENCES clubs(id)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_club_recommendations_neighbour FOREIGN KEY (neighbour_id) REFERENCES clubs(id)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
+
+-- =========================================================
+-- SCHEDULER_LEASES (Leader-Lease für Hintergrundjobs)
+--  - club-lifecycle: SCHEDULED → COMPLETED nach Ende, CONFIRMED → NO_SHOW
+--    (backend/services/lifecycle.py, flask lifecycle run)
+-- =========================================================
+DROP TABLE IF EXISTS scheduler_leases;
+CREATE TABLE scheduler_leases (
+  name        VARCHAR(64)  NOT NULL,
+  owner       VARCHAR(128) NULL,
+  expires_at  DATETIME     NOT NULL,
+  watermark   DATETIME     NULL,            -- bis hierhin (clubs.starts_at) vollständig abgearbeitet
+  last_run_at DATETIME     NULL,
+  PRIMARY KEY (name)
+) ENGINE=InnoDB
+  DEFAULT CHARSET = utf8mb4
+  COLLATE = utf8mb4_unicode_ci;
 
 -- =========================================================
 -- STORED PROCEDURE
@@ -267,87 +409,17 @@ END $$
 -- TRIGGER: Enrollments (Audit & Kapazität)
 -- =========================================================
 
--- Audit: INSERT
+-- Audit: kein Trigger mehr, die App schreibt gebündelt (backend/services/audit.py).
 DROP TRIGGER IF EXISTS trg_enrollment_insert_audit $$
-CREATE TRIGGER trg_enrollment_insert_audit
-AFTER INSERT ON enrollments
-FOR EACH ROW
-BEGIN
-  INSERT INTO enrollment_audit (enrollment_id, action, new_status, changed_by)
-  VALUES (NEW.id, 'INSERT', NEW.status, NEW.user_id);
-END $$
-
--- Audit: UPDATE (Statuswechsel)
 DROP TRIGGER IF EXISTS trg_enrollment_update_audit $$
-CREATE TRIGGER trg_enrollment_update_audit
-AFTER UPDATE ON enrollments
-FOR EACH ROW
-BEGIN
-  IF (OLD.status <> NEW.status) THEN
-    INSERT INTO enrollment_audit (enrollment_id, action, old_status, new_status, changed_by)
-    VALUES (NEW.id, 'UPDATE', OLD.status, NEW.status, NEW.user_id);
-  END IF;
-END $$
-
--- Audit: DELETE
 DROP TRIGGER IF EXISTS trg_enrollment_delete_audit $$
-CREATE TRIGGER trg_enrollment_delete_audit
-AFTER DELETE ON enrollments
-FOR EACH ROW
-BEGIN
-  INSERT INTO enrollment_audit (enrollment_id, action, old_status, changed_by)
-  VALUES (OLD.id, 'DELETE', OLD.status, OLD.user_id);
-END $$
 
--- Kapazität prüfen bei INSERT (belegte Plätze: PENDING/CONFIRMED/ATTENDED)
+-- Kapazität: kein COUNT(*)-Trigger mehr.
+-- Die App bucht über einen bedingten Zähler-Update
+--   UPDATE clubs SET seats_taken = seats_taken + 1 WHERE id = ? AND seats_taken < capacity
+-- (siehe backend/services/seats.py); chk_clubs_seats sichert zusätzlich ab.
 DROP TRIGGER IF EXISTS trg_enrollment_capacity_check_ins $$
-CREATE TRIGGER trg_enrollment_capacity_check_ins
-BEFORE INSERT ON enrollments
-FOR EACH ROW
-BEGIN
-  DECLARE v_capacity INT UNSIGNED;
-  DECLARE v_taken INT UNSIGNED;
-
-  IF NEW.status IN ('PENDING','CONFIRMED','ATTENDED') THEN
-    SELECT capacity INTO v_capacity FROM clubs WHERE id = NEW.club_id;
-
-    SELECT COUNT(*) INTO v_taken
-    FROM enrollments
-    WHERE club_id = NEW.club_id
-      AND status IN ('PENDING','CONFIRMED','ATTENDED');
-
-    IF v_taken >= v_capacity THEN
-      SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Dieser Sprachclub ist bereits voll.';
-    END IF;
-  END IF;
-END $$
-
--- Kapazität prüfen bei UPDATE (z.B. CANCELLED -> CONFIRMED)
 DROP TRIGGER IF EXISTS trg_enrollment_capacity_check_upd $$
-CREATE TRIGGER trg_enrollment_capacity_check_upd
-BEFORE UPDATE ON enrollments
-FOR EACH ROW
-BEGIN
-  DECLARE v_capacity INT UNSIGNED;
-  DECLARE v_taken INT UNSIGNED;
-
-  IF (OLD.status NOT IN ('PENDING','CONFIRMED','ATTENDED'))
-     AND (NEW.status IN ('PENDING','CONFIRMED','ATTENDED')) THEN
-
-    SELECT capacity INTO v_capacity FROM clubs WHERE id = NEW.club_id;
-
-    SELECT COUNT(*) INTO v_taken
-    FROM enrollments
-    WHERE club_id = NEW.club_id
-      AND status IN ('PENDING','CONFIRMED','ATTENDED');
-
-    IF v_taken >= v_capacity THEN
-      SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Dieser Sprachclub ist bereits voll.';
-    END IF;
-  END IF;
-END $$
 
 DELIMITER ;
 
@@ -0,0 +1,3 @@
+-- Schema-Änderungen laufen über den versionierten Runner:
+--   cd backend && flask --app app schema upgrade
+-- Migrationen: backend/migrations/versions/ (Stand in Tabelle schema_version).
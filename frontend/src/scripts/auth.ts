@@ -42,3 +42,30 @@ export async function checkAuth(): Promise<UserInfo | null> {
     throw new Error("Failed to fetch user info" + res.status);
   }
 }
+
+const BootstrapSchema = z.object({
+  user: UserInfoSchema.nullable(),
+  wishlist: z.array(z.number()),
+  bookings: z.record(z.string(), z.number()),
+  waitlist: z.record(z.string(), z.number()),
+  levels: z.array(z.object({ code: z.string(), label: z.string(), position: z.number() })),
+  levels_version: z.number(),
+});
+
+export type Bootstrap = z.infer<typeof BootstrapSchema>;
+
+// Ein Request pro Seitenaufbau statt /api/auth/me, Merkzettel, Levels und
+// localStorage.myBookings; bookings/waitlist: Club-Id → Enrollment-Id.
+export async function fetchBootstrap(): Promise<Bootstrap> {
+  const res = await fetch("http://localhost:5000/api/bootstrap", {
+    credentials: "include",
+  });
+  if (!res.ok) {
+    throw new Error("Failed to fetch bootstrap data" + res.status);
+  }
+  const parsed = BootstrapSchema.safeParse(await res.json());
+  if (!parsed.success) {
+    throw new Error("Failed to parse bootstrap data" + parsed.error.message);
+  }
+  return parsed.data;
+}